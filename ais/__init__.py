@@ -1 +1,6 @@
-from .basic_ai import BasicAI, AlgorithmAlpha, AlgorithmBeta
\ No newline at end of file
+from .basic_ai import BasicAI, AlgorithmAlpha, AlgorithmBeta
+from .pair_ai import AlgorithmGamma
+from .probability_ai import AlgorithmDelta
+from .linear_ai import AlgorithmEpsilon
+from .guess_policy import GuessPolicy, CornerPolicy, ProbabilityPolicy, OpeningPolicy
+from .pattern_cache import PatternCache
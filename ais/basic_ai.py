@@ -1,9 +1,11 @@
 # import .minesweeper as ms
+import array
 import random
-import itertools
 
 from typing import List, Tuple, Set
 from minesweeper import minesweeper as ms
+from minesweeper.neighbors import neighbor_table
+from .knowledge import Knowledge, UNKNOWN, SAFE, FLAGGED
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,38 +14,110 @@ def tuplelist_to_str(tl : List[Tuple[int, int]]) -> str:
     return ', '.join(['({:d},{:d})'.format(x, y) for x, y in tl])
 
 class AlgorithmAlpha(object):
+    # random number generator, BasicAI.reset passes on its own
+    rng = random
+
     def __init__(self, config: ms.GameConfig):
         super().__init__()
         self.width = config.width
         self.height = config.height
-        self.exposed_squares = dict()
-        self.flags = set()
-    
+        self.knowledge = Knowledge(self.width, self.height)
+
+    @property
+    def exposed_squares(self):
+        return self.knowledge.exposed_squares
+
+    @property
+    def flags(self):
+        return self.knowledge.flags
+
+    @property
+    def safe_choices(self):
+        return self.knowledge.safe_choices
+
+    def reset(self):
+        self.knowledge.reset()
+
     def update(self, new_squares: List[ms.Square]) -> List[Tuple[int,int]]:
+        knowledge = self.knowledge
         for square in new_squares:
-            self.exposed_squares[(square.x, square.y)] = square
+            knowledge.set_state(square.x * self.height + square.y, square.num_mines)
 
-        while True:
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
-            if (x,y) not in self.exposed_squares:
-                break
+        # the random pick is played as if it were safe
+        if not knowledge.candidates:
+            return [], []
+        x, y = divmod(knowledge.candidates.choice(self.rng), self.height)
+        knowledge.safe_choices.add((x, y))
         return [], [(x, y)]
 
 class AlgorithmBeta(object):
-    def __init__(self, config: ms.GameConfig):
+    """Single constraint solver
+
+    Every exposed number is a constraint on its neighbors. If all of its
+    mines are flagged, its other unknown neighbors are safe, and if its
+    unknown neighbors are exactly the missing mines, they are flagged.
+
+    The rules are applied with a worklist. For each exposed number the
+    solver keeps how many neighbors are still unknown and how many are
+    flagged, and only numbers whose counters changed are revisited.
+
+    What is known about the board lives in a Knowledge shared with the AI.
+    exposed_squares, flags and safe_choices are views of it, and assigning
+    them replaces the squares in that state.
+
+    With a PatternCache, when the rules leave no safe choice, the 5x5
+    windows around the numbers that changed are solved as well, and their
+    deductions are memoized across games.
+    """
+    # random number generator, BasicAI.reset passes on its own
+    rng = random
+
+    def __init__(self, config: ms.GameConfig, pattern_cache=None):
         super().__init__()
         self.width = config.width
         self.height = config.height
+        self._neighbors = neighbor_table(self.width, self.height)
         
-        self.exposed_squares = dict()
-        self.flags = set()
-        self.safe_choices = set()
+        self.knowledge = Knowledge(self.width, self.height)
+        # per flat index counters of exposed squares
+        self._unknown = array.array('b', bytes(self.width * self.height))
+        self._flagged = array.array('b', bytes(self.width * self.height))
+        self.pattern_cache = pattern_cache
+        # numbers whose counters changed since their windows were last solved
+        self._pattern_centers = set()
+
+    @property
+    def exposed_squares(self):
+        return self.knowledge.exposed_squares
+
+    @exposed_squares.setter
+    def exposed_squares(self, exposed_squares):
+        self.knowledge.exposed_squares.clear()
+        self.knowledge.exposed_squares.update(exposed_squares)
+
+    @property
+    def flags(self):
+        return self.knowledge.flags
+
+    @flags.setter
+    def flags(self, flags):
+        self.knowledge.flags.clear()
+        self.knowledge.flags.update(flags)
+
+    @property
+    def safe_choices(self):
+        return self.knowledge.safe_choices
+
+    @safe_choices.setter
+    def safe_choices(self, safe_choices):
+        self.knowledge.safe_choices.clear()
+        self.knowledge.safe_choices.update(safe_choices)
 
     def reset(self):
-        self.exposed_squares.clear()
-        self.flags.clear()
-        self.safe_choices.clear()
+        self.knowledge.reset()
+        self._unknown = array.array('b', bytes(self.width * self.height))
+        self._flagged = array.array('b', bytes(self.width * self.height))
+        self._pattern_centers = set()
 
     def _is_outside_board(self, x, y):
         if x < 0 or x >= self.width:
@@ -53,99 +127,216 @@ class AlgorithmBeta(object):
         return False
     
     def neighours(self, x, y):
-        for dx, dy in itertools.product([-1, 0, 1], repeat=2):
-            if dx == 0 and dy == 0:
-                continue
-            if not self._is_outside_board(x + dx, y + dy):
-                yield x+dx, y+dy
+        return self._neighbors.neighbors_xy(x, y)
     
     def check_neighbors(self, x, y):
         """The number of mines and unexposed squares around (x,y)"""
         marked_mines, unexposed_squares = 0, set()
+        state, height = self.knowledge.state, self.height
         for nx, ny in self.neighours(x, y):
-            if (nx ,ny) in self.flags:
+            value = state[nx * height + ny]
+            if value == FLAGGED:
                 marked_mines += 1
-                continue
-            
-            # We should also consider the squares in the safe choice list, as they can
-            # be treated as exposed althrough we don't know its value(num_mines) yet.
-            if (nx ,ny) not in self.exposed_squares and (nx, ny) not in self.safe_choices:
+            # Squares in the safe choice list are treated as exposed although
+            # we don't know their value(num_mines) yet.
+            elif value == UNKNOWN:
                 unexposed_squares.add((nx ,ny))
         return marked_mines, unexposed_squares
 
-    def update_flags(self) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
-        """Returns an set of coordinates of newly found mines."""
-        original_num_of_safe_choices = len(self.safe_choices)
-        original_num_of_flags = len(self.flags)
-        
-        for (x, y), num_mines in self.exposed_squares.items():
-            if num_mines == 0: continue
-            marked_mines, unexposed_squares = self.check_neighbors(x, y)
-            
-            if not unexposed_squares: continue
-            # Best case, all mines are recovered, only need to add the remaining neighbors
-            # to save list.
-            logger.debug('Processing ({:d}, {:d}), mines/total: {:d}/{:d}, unexposed: {:s}'
-                         .format(
-                             x, y,
-                             marked_mines,
-                             num_mines,
-                             tuplelist_to_str(sorted(unexposed_squares))
-                             )
-                         )
+    def _is_unknown(self, position):
+        return self.knowledge.state[position[0] * self.height + position[1]] == UNKNOWN
+
+    def _count_neighbors(self, x, y):
+        """Initialize the counters of the exposed square (x,y)"""
+        marked_mines, unexposed_squares = self.check_neighbors(x, y)
+        index = x * self.height + y
+        self._flagged[index] = marked_mines
+        self._unknown[index] = len(unexposed_squares)
+
+    def _resolve(self, x, y, flag, worklist):
+        """Turn the unknown square (x,y) into a flag or a safe choice
+
+        Updates the counters of the exposed neighbors and queues them.
+        """
+        height = self.height
+        self.knowledge.set_state(x * height + y, FLAGGED if flag else SAFE)
+        state = self.knowledge.state
+        for nx, ny in self.neighours(x, y):
+            index = nx * height + ny
+            if state[index] >= 0:
+                self._unknown[index] -= 1
+                if flag:
+                    self._flagged[index] += 1
+                worklist.append((nx, ny))
+
+    def _propagate(self, worklist):
+        """Apply the rules until no queued square deduces anything new"""
+        height = self.height
+        touched = self._pattern_centers if self.pattern_cache is not None else None
+        while worklist:
+            x, y = worklist.pop()
+            if touched is not None:
+                touched.add((x, y))
+            index = x * height + y
+            num_mines = self.knowledge.state[index]
+            unknown = self._unknown[index]
+            if num_mines <= 0 or unknown == 0:
+                continue
+            marked_mines = self._flagged[index]
             if marked_mines == num_mines:
-                logger.debug("Nice, all mines are found, add remaining squares to safe list")
-                self.safe_choices.update(unexposed_squares)
-            elif marked_mines + len(unexposed_squares) == num_mines:
-                # All unexposed squares are real mines. mark them.
-                logger.debug("Good, these unexposed squares are actually mines, add them to flags")
-                for mx, my in unexposed_squares:
-                    self.flags.add((mx, my))
-                    
-        # If we find some new mines or safe choices, that means some of our 
-        # judgements may be outdated. We run this process recursively to get
-        # the optimal results.
-        if original_num_of_safe_choices != len(self.safe_choices) or original_num_of_flags != len(self.flags):
-            logger.debug("Recursively apply update_flags...")
-            self.update_flags()
+                flag = False
+            elif marked_mines + unknown == num_mines:
+                flag = True
+            else:
+                continue
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Processing (%d, %d), mines/total: %d/%d, %s unknown neighbors',
+                             x, y, marked_mines, num_mines, 'flagging' if flag else 'clearing')
+            for position in list(self.neighours(x, y)):
+                if self._is_unknown(position):
+                    self._resolve(position[0], position[1], flag, worklist)
+
+    def _apply_patterns(self):
+        """Apply window deductions around the changed numbers until there is
+        a safe choice or nothing changes"""
+        state, height = self.knowledge.state, self.height
+        while self._pattern_centers and not self.safe_choices:
+            # a window also depends on the numbers next to its center
+            centers = set(self._pattern_centers)
+            for x, y in self._pattern_centers:
+                centers.update(self.neighours(x, y))
+            self._pattern_centers = set()
+            worklist = []
+            for x, y in centers:
+                index = x * height + y
+                if state[index] <= 0 or self._unknown[index] == 0:
+                    continue
+                safe, mines = self.pattern_cache.deduce(state, self.width, height, x, y)
+                for position in mines:
+                    if self._is_unknown(position):
+                        self._resolve(position[0], position[1], True, worklist)
+                for position in safe:
+                    if self._is_unknown(position):
+                        self._resolve(position[0], position[1], False, worklist)
+            self._propagate(worklist)
+
+    def update_flags(self) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        """Deduce flags and safe choices from all exposed squares
+
+        Recounts the neighbors of every exposed square, so it can be used
+        after exposed_squares, flags or safe_choices were changed directly.
+
+        Returns:
+            tuple: The set of flags and the set of safe choices.
+        """
+        for x, y in self.exposed_squares:
+            self._count_neighbors(x, y)
+        self._propagate(list(self.exposed_squares))
+        if self.pattern_cache is not None:
+            self._apply_patterns()
         return self.flags, self.safe_choices
     
     def update(self, new_squares: List[ms.Square]) -> Tuple[Set[Tuple[int,int]], Set[Tuple[int,int]]]:
+        """Add newly exposed squares and deduce what follows from them
+
+        Only the new squares and the exposed squares next to them are
+        revisited.
+
+        Returns:
+            tuple: The set of flags and the set of safe choices.
+        """
+        height = self.height
+        knowledge, state = self.knowledge, self.knowledge.state
+        new_positions, newly_known = set(), []
         for square in new_squares:
-            self.exposed_squares[(square.x, square.y)] = square.num_mines
-            if (square.x, square.y) in self.safe_choices:
-                self.safe_choices.remove((square.x, square.y))
-
-        ## My awesome AI implementation.
-        # First we will try to find as many MINES as possible.
-        # self.safe_choices.clear()
-        # self.safe_choices = self.safe_choices - set(new_squares.keys())
-        flags, safe_choices = self.update_flags()
-        
-        return flags, safe_choices
+            position = (square.x, square.y)
+            index = square.x * height + square.y
+            if state[index] == UNKNOWN:
+                newly_known.append(position)
+            # exposing a safe choice also removes it from the safe choices
+            knowledge.set_state(index, square.num_mines)
+            new_positions.add(position)
+
+        # squares exposed before this move lose an unknown neighbor
+        affected = set()
+        for x, y in newly_known:
+            for position in self.neighours(x, y):
+                index = position[0] * height + position[1]
+                if state[index] >= 0 and position not in new_positions:
+                    self._unknown[index] -= 1
+                    affected.add(position)
+        for x, y in new_positions:
+            self._count_neighbors(x, y)
+
+        self._propagate(list(new_positions | affected))
+        if self.pattern_cache is not None:
+            self._apply_patterns()
+        return self.flags, self.safe_choices
 
 class BasicAI(ms.AI):
-    def __init__(self, algo = None):
+    """AI playing the safe choices of its algorithm, otherwise guessing
+
+    The board is only rendered on request. pretty_print does nothing unless
+    the logger is enabled for INFO, and snapshots for a debug trace are taken
+    only at the chosen moves or when the game is lost.
+
+    When nothing is safe, the guess policy picks the guess if there is one,
+    then the algorithm if it can rank the squares, otherwise it is random.
+
+    The AI keeps no board of its own. It reads the Knowledge of its
+    algorithm, whose algorithm updates expose, flag and clear the squares.
+
+    Attributes:
+        snapshots (list): (move number, board lines) captured in this game.
+    """
+    def __init__(self, algo = None, trace_moves=(), trace_failure=False, guess_policy=None):
+        """
+        Args:
+            algo: Algorithm deducing flags and safe choices.
+            guess_policy (GuessPolicy, optional): Picks the guesses.
+            trace_moves (iterable): Move numbers after which to capture the board.
+            trace_failure (bool): Capture the board, with the losing square
+                marked '*', when a game is lost.
+        """
         self.width = 0
         self.height = 0
         self.num_mines = 0
-        self.exposed_squares = dict()
+        self.num_moves = 0
         self.algo = algo
-        self.safe_choices = set()
-        # Set[Tuple[int, int]]
-        self._flags = set() 
+        self.trace_moves = frozenset(trace_moves)
+        self.trace_failure = trace_failure
+        self.guess_policy = guess_policy
+        self.snapshots = []
+        self._last_move = None
     
+    @property
+    def knowledge(self):
+        """Knowledge: What the algorithm knows about the board"""
+        return self.algo.knowledge
+
+    @property
+    def exposed_squares(self):
+        return self.algo.knowledge.exposed_squares
+
+    @property
+    def safe_choices(self):
+        return self.algo.knowledge.safe_choices
+
     @property
     def flags(self):
-        return list(self._flags)
+        return list(self.algo.knowledge.flags)
     
     def reset(self, config: ms.GameConfig):
         self.width = config.width
         self.height = config.height
         self.num_mines = config.num_mines
-        self.exposed_squares.clear()
-        self._flags.clear()
+        self.num_moves = 0
+        self.snapshots = []
+        self._last_move = None
+        self.algo.rng = self.rng
         self.algo.reset()
+        if self.guess_policy is not None:
+            self.guess_policy.reset(config, self.knowledge)
         
     def pretty_print(self):
         """
@@ -171,59 +362,97 @@ class BasicAI(ms.AI):
         'x' indicates a mine has been marked.
         '.' indicates an unexposed square.
         numbers indicates mines around it.
+
+        Nothing is rendered unless the logger is enabled for INFO.
+        """
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        self._log_lines(self.board_lines())
+
+    def board_lines(self, mark=None):
+        """Render the board as text, see pretty_print
+
+        Args:
+            mark (tuple, optional): x,y position to show as '*'.
+
+        Returns:
+            list: One string per line.
         """
         output = []
         output.append(" ".join([" *"] + [str(i%10) for i in range(self.width)]))
+        state, height = self.knowledge.state, self.height
         for y in range(self.height):
             line = ['{:2d}'.format(y)] + ["."] * self.width
             for x in range(self.width):
-                if (x, y) in self.exposed_squares:
-                    num_mine =  self.exposed_squares[(x,y)]
+                num_mine = state[x * height + y]
+                if num_mine >= 0:
                     line[x+1] = str(num_mine) if num_mine != 0 else " "
-                if (x,y) in self._flags:
+                elif num_mine == FLAGGED:
                     line[x+1] = "x"
+                if (x, y) == mark:
+                    line[x+1] = "*"
                     
             output.append(" ".join(line))
-                    
+        return output
+
+    def _log_lines(self, lines):
         logger.info("")
-        for line in output:
+        for line in lines:
             logger.info(line)
         logger.info("")
 
+    def _capture(self, mark=None):
+        """Keep a snapshot of the board for the debug trace and log it"""
+        lines = self.board_lines(mark)
+        self.snapshots.append((self.num_moves, lines))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Board after move %d:", self.num_moves)
+            self._log_lines(lines)
+
     def next(self) -> Tuple[int, int]:
-        if self.safe_choices:
-            logger.debug('[AI.next] {:d} safe choices: {:s}'.format(len(self.safe_choices), tuplelist_to_str(sorted(self.safe_choices))))
-            while self.safe_choices:
-                x, y = self.safe_choices.pop()
-                logger.debug("Choosing candidate ({:d}, {:d})".format(x ,y))
-                if (x ,y) not in self._flags and (x ,y) not in self.exposed_squares:
-                    logger.debug("Choosing one from safe list: ({:d}, {:d})".format(x ,y))
-                    return (x ,y)
+        self._last_move = self._choose()
+        return self._last_move
+
+    def _choose(self) -> Tuple[int, int]:
+        # A safe choice stays one until the move exposes it, which is when
+        # the algorithm drops it.
+        position = self.knowledge.peek_safe()
+        if position is not None:
+            if logger.isEnabledFor(logging.DEBUG):
+                safe_choices = self.knowledge.safe_choices
+                logger.debug('[AI.next] %d safe choices: %s', len(safe_choices), tuplelist_to_str(sorted(safe_choices)))
+            x, y = position
+            logger.debug("Choosing one from safe list: (%d, %d)", x, y)
+            return (x ,y)
+
+        if self.guess_policy is not None:
+            position = self.guess_policy.choose(self.rng)
+            if position is not None:
+                return position
+
+        # Algorithms that can rank the unexposed squares pick the guess.
+        guess = getattr(self.algo, 'guess', None)
+        if guess is not None:
+            position = guess()
+            if position is not None:
+                return position
 
         # When AI can't predict the next safe choice, here we just randomly choice
         # one from those unexposed squares.
-        while True:
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
-            if (x,y) not in self.exposed_squares and (x, y) not in self._flags:
-                break
-            logger.warning('Generating a random choice. flags: {:d}/{:d}'.format(len(self._flags), self.num_mines))
-        return x, y
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Generating a random choice. flags: %d/%d', len(self.knowledge.flags), self.num_mines)
+        return divmod(self.knowledge.candidates.choice(self.rng), self.height)
             
     def update(self, result: ms.MoveResult):
+        self.num_moves += 1
         if result.status == ms.GameStatus.DEFEAT:
             logger.info("##### NO NO NO! Game over! #####")
+            if self.trace_failure:
+                self._capture(mark=self._last_move)
             return
 
-        for square in result.new_squares:
-            self.exposed_squares[(square.x, square.y)] = square.num_mines
-            
-        # AI will try its best to make a safe choice.
-        flags, new_choices = self.algo.update(result.new_squares)
-        self._flags.update(flags)
-        self.safe_choices.update(new_choices)
-
-        # Cleans safe choice list.
-        self.safe_choices = self.safe_choices - set(self.exposed_squares.keys())
-        # Logs current board state.
-        self.pretty_print()
\ No newline at end of file
+        # AI will try its best to make a safe choice. The algorithm records
+        # the new squares, flags and safe choices in the shared knowledge.
+        self.algo.update(result.new_squares)
+        if self.num_moves in self.trace_moves:
+            self._capture()
\ No newline at end of file
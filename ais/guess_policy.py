@@ -0,0 +1,190 @@
+"""Policies that pick the square BasicAI guesses when nothing is safe
+
+A GuessPolicy scores every unknown square and guesses one of the best,
+breaking ties at random. Scoring a square looks at the squares around it,
+so each policy caches a value per square and only recomputes the squares
+within its radius of a square whose state changed since the last guess.
+The Knowledge logs those changes in its changed array while a policy is
+attached.
+
+When re-evaluating the invalidated squares takes longer than the budget,
+the remaining ones keep their previous values until the next guess, which
+bounds the time a guess adds to a move.
+"""
+import abc
+import array
+import timeit
+
+from minesweeper.neighbors import neighbor_table
+from .knowledge import FLAGGED, UNKNOWN
+
+# re-evaluated squares between two checks of the budget
+_BUDGET_STRIDE = 32
+
+
+class GuessPolicy(abc.ABC):
+    """Base class of the guess policies of BasicAI
+
+    Attributes:
+        radius (int): Distance within which a changed square invalidates the
+            cached values, None if they never change.
+        budget (float): Seconds allowed to re-evaluate values per guess, or
+            None for no limit.
+    """
+    radius = 2
+
+    def __init__(self, budget=None):
+        self.budget = budget
+        self.width = 0
+        self.height = 0
+        self.num_mines = 0
+        self.knowledge = None
+        self._neighbors = None
+        self._values = []
+        self._dirty = bytearray()
+
+    def reset(self, config, knowledge):
+        """Start a new game
+
+        Args:
+            config (GameConfig): Configuration of the game.
+            knowledge (Knowledge): What the AI knows about the board.
+        """
+        self.width, self.height, self.num_mines = config.width, config.height, config.num_mines
+        self.knowledge = knowledge
+        self._neighbors = neighbor_table(self.width, self.height)
+        knowledge.changed = array.array('i')
+        self._values = [self.initial_value(index) for index in range(self.width * self.height)]
+        self._dirty = bytearray(self.width * self.height)
+
+    def initial_value(self, index):
+        """Value of the square at flat index before anything is exposed"""
+        return self.evaluate(index)
+
+    @abc.abstractmethod
+    def evaluate(self, index):
+        """Cached value of the unknown square at flat index"""
+
+    def score(self, value, density):
+        """Score of a square from its cached value, higher is better
+
+        Args:
+            value: The cached value of the square.
+            density (float): Mines per unknown square left on the board.
+        """
+        return value
+
+    def choose(self, rng):
+        """Pick one of the best scoring unknown squares
+
+        Returns:
+            tuple: x,y position, or None if there is no unknown square.
+        """
+        candidates = self.knowledge.candidates
+        if not candidates:
+            return None
+        self._invalidate()
+        self._refresh()
+        density = (self.num_mines - len(self.knowledge.flags)) / len(candidates)
+        values, score = self._values, self.score
+        scores = [(score(values[index], density), index) for index in candidates]
+        best = max(scores)[0]
+        return divmod(rng.choice([index for value, index in scores if value == best]), self.height)
+
+    def _invalidate(self):
+        """Mark the squares near the changes logged since the last guess"""
+        changed = self.knowledge.changed
+        if self.radius is None or not changed:
+            del changed[:]
+            return
+        width, height, radius = self.width, self.height, self.radius
+        dirty, row = self._dirty, b'\x01' * (2 * radius + 1)
+        for index in set(changed):
+            x, y = divmod(index, height)
+            low, high = max(0, y - radius), min(height, y + radius + 1)
+            for nx in range(max(0, x - radius), min(width, x + radius + 1)):
+                start = nx * height
+                dirty[start + low:start + high] = row[:high - low]
+        del changed[:]
+
+    def _refresh(self):
+        """Re-evaluate the marked unknown squares within the budget"""
+        dirty, values = self._dirty, self._values
+        deadline = None if self.budget is None else timeit.default_timer() + self.budget
+        evaluated = 0
+        for index in self.knowledge.candidates:
+            if not dirty[index]:
+                continue
+            if deadline is not None and evaluated and evaluated % _BUDGET_STRIDE == 0 \
+                    and timeit.default_timer() > deadline:
+                break
+            values[index] = self.evaluate(index)
+            dirty[index] = 0
+            evaluated += 1
+
+    def _local_probability(self, index):
+        """Highest share of missing mines among the unknown neighbors of the
+        exposed neighbors of a square, -1.0 if no exposed square touches it"""
+        state, neighbors = self.knowledge.state, self._neighbors
+        probability = -1.0
+        for neighbor in neighbors.neighbors(index):
+            num_mines = state[neighbor]
+            if num_mines < 0:
+                continue
+            unknown = 0
+            for square in neighbors.neighbors(neighbor):
+                value = state[square]
+                if value == UNKNOWN:
+                    unknown += 1
+                elif value == FLAGGED:
+                    num_mines -= 1
+            probability = max(probability, num_mines / unknown)
+        return probability
+
+
+class CornerPolicy(GuessPolicy):
+    """Prefers corners, then edges, which have the fewest neighbors and so
+    the best chance to be a zero that opens the board"""
+    radius = None
+
+    def evaluate(self, index):
+        return 8 - len(self._neighbors.neighbors(index))
+
+
+class ProbabilityPolicy(GuessPolicy):
+    """Prefers the squares least likely to be a mine
+
+    A square next to exposed numbers gets the highest share of missing mines
+    among their unknown neighbors, any other square the mine density of the
+    board.
+    """
+    def initial_value(self, index):
+        return -1.0
+
+    def evaluate(self, index):
+        return self._local_probability(index)
+
+    def score(self, value, density):
+        return -(density if value < 0 else value)
+
+
+class OpeningPolicy(GuessPolicy):
+    """Prefers the squares most likely to be a zero and open the board
+
+    The chance is the chance of the square being safe times the chance of
+    all of its unknown neighbors being safe at the mine density of the board,
+    so corners and squares next to exposed zeros or safe squares come first.
+    """
+    def initial_value(self, index):
+        return -1.0, len(self._neighbors.neighbors(index))
+
+    def evaluate(self, index):
+        state = self.knowledge.state
+        unknown = sum(1 for neighbor in self._neighbors.neighbors(index) if state[neighbor] == UNKNOWN)
+        return self._local_probability(index), unknown
+
+    def score(self, value, density):
+        probability, unknown = value
+        if probability < 0:
+            probability = density
+        return (1.0 - probability) * (1.0 - density) ** unknown
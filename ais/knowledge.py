@@ -0,0 +1,199 @@
+"""What a player knows about each square of the board
+
+Knowledge keeps one signed byte per square in flat index order
+x * height + y: the number of neighboring mines once the square is exposed,
+or UNKNOWN, SAFE or FLAGGED before that. Every square is in exactly one of
+these states, so exposing a safe square drops it from the safe choices and
+flagging an unknown square drops it from the guess candidates as part of
+the same write.
+
+An algorithm owns a Knowledge and BasicAI reads the same one, so the board
+is stored once per AI. The exposed_squares, flags and safe_choices
+attributes are mapping and set views of it keyed by x,y positions.
+"""
+import array
+import collections.abc
+
+from minesweeper.pool import CandidatePool
+
+UNKNOWN = -1
+SAFE = -2
+FLAGGED = -3
+
+
+class Knowledge:
+    """Per square state of a board shared by an AI and its algorithm
+
+    Attributes:
+        width (int): Width of the board.
+        height (int): Height of the board.
+        state (array): Neighboring mines of exposed squares, UNKNOWN, SAFE or
+            FLAGGED for the others, by flat index.
+        candidates (CandidatePool): Flat indices of the UNKNOWN squares.
+        exposed_squares (ExposedSquares): Mapping of exposed x,y positions to
+            their number of neighboring mines, in the order they were exposed.
+        flags (SquareSet): Positions known to be mines.
+        safe_choices (SquareSet): Positions known to be safe, not exposed yet.
+        changed (array): Flat indices of the squares that changed state, in
+            order, when a guess policy asked for them, otherwise None.
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self._unknown = array.array('b', [UNKNOWN]) * (width * height)
+        self.state = array.array('b', self._unknown)
+        self.candidates = CandidatePool(width * height)
+        # flat indices of the squares in each state but UNKNOWN
+        self._exposed = array.array('i')
+        self._flags = set()
+        self._safe = set()
+        self.exposed_squares = ExposedSquares(self)
+        self.flags = SquareSet(self, FLAGGED, self._flags)
+        self.safe_choices = SquareSet(self, SAFE, self._safe)
+        self.changed = None
+
+    def reset(self):
+        """Forget everything about the board"""
+        self.state[:] = self._unknown
+        self.candidates.reset()
+        del self._exposed[:]
+        self._flags.clear()
+        self._safe.clear()
+        if self.changed is not None:
+            del self.changed[:]
+
+    def set_state(self, index, value):
+        """Move the square at flat index to a new state
+
+        Args:
+            index (int): Flat index of the square.
+            value (int): Number of neighboring mines to expose it, or
+                UNKNOWN, SAFE or FLAGGED.
+        """
+        old = self.state[index]
+        if old == value:
+            return
+        self.state[index] = value
+        if self.changed is not None:
+            self.changed.append(index)
+        if old >= 0:
+            if value >= 0:
+                return
+            self._exposed.remove(index)
+        elif old == UNKNOWN:
+            self.candidates.discard(index)
+        elif old == SAFE:
+            self._safe.discard(index)
+        else:
+            self._flags.discard(index)
+
+        if value >= 0:
+            self._exposed.append(index)
+        elif value == UNKNOWN:
+            self.candidates.add(index)
+        elif value == SAFE:
+            self._safe.add(index)
+        else:
+            self._flags.add(index)
+
+    def peek_safe(self):
+        """Any one safe square, without copying the safe set
+
+        Returns:
+            tuple: x,y position, or None if no square is known to be safe.
+        """
+        for index in self._safe:
+            return divmod(index, self.height)
+        return None
+
+
+class ExposedSquares(collections.abc.MutableMapping):
+    """Mapping view of the exposed squares of a Knowledge"""
+    __slots__ = ('_knowledge',)
+
+    def __init__(self, knowledge):
+        self._knowledge = knowledge
+
+    def __getitem__(self, position):
+        knowledge = self._knowledge
+        num_mines = knowledge.state[position[0] * knowledge.height + position[1]]
+        if num_mines < 0:
+            raise KeyError(position)
+        return num_mines
+
+    def __contains__(self, position):
+        knowledge = self._knowledge
+        return knowledge.state[position[0] * knowledge.height + position[1]] >= 0
+
+    def __setitem__(self, position, num_mines):
+        knowledge = self._knowledge
+        knowledge.set_state(position[0] * knowledge.height + position[1], num_mines)
+
+    def __delitem__(self, position):
+        if position not in self:
+            raise KeyError(position)
+        knowledge = self._knowledge
+        knowledge.set_state(position[0] * knowledge.height + position[1], UNKNOWN)
+
+    def __iter__(self):
+        height = self._knowledge.height
+        for index in self._knowledge._exposed[:]:
+            yield divmod(index, height)
+
+    def __len__(self):
+        return len(self._knowledge._exposed)
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, dict(self.items()))
+
+    def clear(self):
+        for index in self._knowledge._exposed[:]:
+            self._knowledge.set_state(index, UNKNOWN)
+
+
+class SquareSet(collections.abc.MutableSet):
+    """Set view of the squares of a Knowledge in one state"""
+    __slots__ = ('_knowledge', '_value', '_indices')
+
+    def __init__(self, knowledge, value, indices):
+        self._knowledge = knowledge
+        self._value = value
+        self._indices = indices
+
+    @classmethod
+    def _from_iterable(cls, positions):
+        # results of set operations are plain sets
+        return set(positions)
+
+    def __contains__(self, position):
+        knowledge = self._knowledge
+        return knowledge.state[position[0] * knowledge.height + position[1]] == self._value
+
+    def __iter__(self):
+        height = self._knowledge.height
+        for index in tuple(self._indices):
+            yield divmod(index, height)
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, set(self))
+
+    def add(self, position):
+        knowledge = self._knowledge
+        knowledge.set_state(position[0] * knowledge.height + position[1], self._value)
+
+    def discard(self, position):
+        if position in self:
+            knowledge = self._knowledge
+            knowledge.set_state(position[0] * knowledge.height + position[1], UNKNOWN)
+
+    def update(self, positions):
+        """Add every position, like set.update"""
+        for position in positions:
+            self.add(position)
+
+    def clear(self):
+        for index in tuple(self._indices):
+            self._knowledge.set_state(index, UNKNOWN)
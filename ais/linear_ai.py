@@ -0,0 +1,182 @@
+from typing import List, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+from minesweeper import minesweeper as ms
+from .basic_ai import AlgorithmBeta
+import logging
+
+logger = logging.getLogger(__name__)
+
+# tolerance of the floating point row reduction, coefficients stay small
+EPSILON = 1e-9
+
+
+class AlgorithmEpsilon(AlgorithmBeta):
+    """AlgorithmBeta plus deductions from Gaussian elimination
+
+    Every exposed number with unknown neighbors is a row of a linear system
+    over the unknown frontier squares, with the missing mines on the right
+    hand side. After reducing a connected part of the system to row echelon
+    form, a row whose right hand side equals the sum of its positive
+    coefficients forces those squares to be mines and the negative ones to
+    be safe, and the other way around at the sum of the negative ones.
+
+    Rows are appended as squares are exposed and dropped once they have no
+    unknown neighbors. Only the parts of the system with a row that changed
+    since the last elimination are reduced again, and elimination only runs
+    when single constraint propagation leaves no safe choice.
+
+    Requires numpy.
+    """
+    def __init__(self, config: ms.GameConfig):
+        if np is None:
+            raise ImportError('numpy is required for AlgorithmEpsilon')
+        super().__init__(config)
+        # exposed numbers that may still have unknown neighbors, in exposure order
+        self._rows = []
+        # flat index -> (unknown, flagged) counters when it was last reduced
+        self._reduced = dict()
+
+    def reset(self):
+        super().reset()
+        self._rows = []
+        self._reduced.clear()
+
+    def update(self, new_squares: List[ms.Square]) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        super().update(new_squares)
+        for square in new_squares:
+            if square.num_mines > 0:
+                self._rows.append((square.x, square.y))
+        if not self.safe_choices:
+            self._apply_linear_rule()
+        return self.flags, self.safe_choices
+
+    def update_flags(self) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        super().update_flags()
+        self._rows = [position for position, num_mines in self.exposed_squares.items() if num_mines > 0]
+        self._reduced.clear()
+        self._apply_linear_rule()
+        return self.flags, self.safe_choices
+
+    def _linear_system(self):
+        """Collect the rows with unknown neighbors and the rows changed since the last reduction
+
+        Returns:
+            tuple: dict from row position to its unknown neighbors, dict from
+            unknown square to the row positions containing it, and the list
+            of changed rows.
+        """
+        height = self.height
+        unknown, flagged = self._unknown, self._flagged
+        self._rows = [(x, y) for x, y in self._rows if unknown[x * height + y] > 0]
+        columns_of, rows_of, changed = dict(), dict(), []
+        for x, y in self._rows:
+            columns = [position for position in self.neighours(x, y) if self._is_unknown(position)]
+            columns_of[(x, y)] = columns
+            for position in columns:
+                rows_of.setdefault(position, []).append((x, y))
+            index = x * height + y
+            if self._reduced.get(index) != (unknown[index], flagged[index]):
+                changed.append((x, y))
+        return columns_of, rows_of, changed
+
+    def _linear_deductions(self):
+        """Row reduce every part of the system that changed
+
+        Returns:
+            tuple: list of safe squares and list of mines.
+        """
+        height = self.height
+        columns_of, rows_of, changed = self._linear_system()
+        visited = set()
+        safe, mines = [], []
+        for start in changed:
+            if start in visited:
+                continue
+            # rows connected to start through shared unknown squares
+            visited.add(start)
+            component, squares, column_index = [start], [], dict()
+            for row in component:
+                for position in columns_of[row]:
+                    if position in column_index:
+                        continue
+                    column_index[position] = len(squares)
+                    squares.append(position)
+                    for other in rows_of[position]:
+                        if other not in visited:
+                            visited.add(other)
+                            component.append(other)
+
+            matrix = np.zeros((len(component), len(squares) + 1))
+            for r, (x, y) in enumerate(component):
+                index = x * height + y
+                matrix[r, [column_index[position] for position in columns_of[(x, y)]]] = 1.0
+                matrix[r, -1] = self.exposed_squares[(x, y)] - self._flagged[index]
+                self._reduced[index] = (self._unknown[index], self._flagged[index])
+            is_safe, is_mine = _forced(_row_reduce(matrix))
+            safe.extend(squares[c] for c in np.flatnonzero(is_safe))
+            mines.extend(squares[c] for c in np.flatnonzero(is_mine))
+        return safe, mines
+
+    def _apply_linear_rule(self):
+        """Apply linear deductions and single constraint propagation until stable"""
+        while True:
+            safe, mines = self._linear_deductions()
+            if not safe and not mines:
+                return
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Linear rule: %d safe squares, %d mines', len(safe), len(mines))
+            worklist = []
+            for flag, positions in ((True, mines), (False, safe)):
+                for position in positions:
+                    if self._is_unknown(position):
+                        self._resolve(position[0], position[1], flag, worklist)
+            self._propagate(worklist)
+
+
+def _row_reduce(matrix):
+    """Reduce an augmented matrix to reduced row echelon form in place
+
+    Returns:
+        numpy.ndarray: The nonzero rows.
+    """
+    num_rows, num_columns = matrix.shape
+    rank = 0
+    for column in range(num_columns - 1):
+        if rank == num_rows:
+            break
+        pivot = rank + int(np.argmax(np.abs(matrix[rank:, column])))
+        if abs(matrix[pivot, column]) < EPSILON:
+            continue
+        if pivot != rank:
+            matrix[[rank, pivot]] = matrix[[pivot, rank]]
+        matrix[rank] /= matrix[rank, column]
+        # eliminate the column from every other row, above and below
+        others = np.flatnonzero(np.abs(matrix[:, column]) >= EPSILON)
+        others = others[others != rank]
+        if len(others):
+            matrix[others] -= np.outer(matrix[others, column], matrix[rank])
+        rank += 1
+    return matrix[:rank]
+
+
+def _forced(reduced):
+    """Squares forced by rows at the bound of their coefficients
+
+    Returns:
+        tuple: boolean arrays of the safe columns and of the mine columns.
+    """
+    coefficients, values = reduced[:, :-1], reduced[:, -1]
+    positive = coefficients > EPSILON
+    negative = coefficients < -EPSILON
+    upper = np.where(positive, coefficients, 0.0).sum(axis=1)
+    lower = np.where(negative, coefficients, 0.0).sum(axis=1)
+    at_upper = (np.abs(values - upper) < EPSILON)[:, None]
+    at_lower = (np.abs(values - lower) < EPSILON)[:, None]
+    is_mine = ((at_upper & positive) | (at_lower & negative)).any(axis=0)
+    is_safe = ((at_upper & negative) | (at_lower & positive)).any(axis=0)
+    return is_safe, is_mine
@@ -0,0 +1,141 @@
+from typing import List, Set, Tuple
+
+from minesweeper import minesweeper as ms
+from .basic_ai import AlgorithmBeta
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Constraint(object):
+    """Unknown squares around an exposed number and the mines left among them
+
+    Attributes:
+        mask (int): Bitset of the unknown squares using frontier bit ids.
+        mines (int): Number of unflagged mines among them.
+    """
+    __slots__ = ('mask', 'mines')
+
+    def __init__(self, mask, mines):
+        self.mask = mask
+        self.mines = mines
+
+
+class AlgorithmGamma(AlgorithmBeta):
+    """AlgorithmBeta plus deductions from pairs of overlapping constraints
+
+    When the unknown neighbors of one number are a subset of the unknown
+    neighbors of another, the difference holds exactly the difference of
+    their missing mines. If that is zero the difference is safe, and if it
+    equals the size of the difference it is all mines.
+
+    Frontier squares get a bit id per pass and constraints are bitsets, so
+    the subset test is one AND. Each square indexes the constraints that
+    contain it, so a constraint is only compared with the constraints that
+    share its least shared square.
+
+    Constraints are built from the exposed numbers that still have unknown
+    neighbors, which are appended as squares are exposed and dropped once
+    they have none, and the pair rule only runs when single constraint
+    propagation leaves no safe choice.
+    """
+    def __init__(self, config: ms.GameConfig, pattern_cache=None):
+        super().__init__(config, pattern_cache)
+        # exposed numbers that may still have unknown neighbors, in exposure order
+        self._centers = []
+
+    def reset(self):
+        super().reset()
+        self._centers = []
+
+    def update(self, new_squares: List[ms.Square]) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        super().update(new_squares)
+        for square in new_squares:
+            if square.num_mines > 0:
+                self._centers.append((square.x, square.y))
+        if not self.safe_choices:
+            self._apply_pair_rule()
+        return self.flags, self.safe_choices
+
+    def update_flags(self) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        super().update_flags()
+        self._centers = [position for position, num_mines in self.exposed_squares.items() if num_mines > 0]
+        self._apply_pair_rule()
+        return self.flags, self.safe_choices
+
+    def _frontier_constraints(self):
+        """Build the constraints of every exposed number with unknown neighbors
+
+        Returns:
+            tuple: list of Constraint, list of frontier squares by bit id and
+            a list of constraint ids for each bit id.
+        """
+        height, unknown, state = self.height, self._unknown, self.knowledge.state
+        self._centers = [(x, y) for x, y in self._centers if unknown[x * height + y] > 0]
+        constraints, squares, bit_of, containing = [], [], {}, []
+        for x, y in self._centers:
+            index = x * height + y
+            num_mines = state[index]
+            mask = 0
+            for position in self.neighours(x, y):
+                if self._is_unknown(position):
+                    bit = bit_of.get(position)
+                    if bit is None:
+                        bit = bit_of[position] = len(squares)
+                        squares.append(position)
+                        containing.append([])
+                    mask |= 1 << bit
+                    containing[bit].append(len(constraints))
+            constraints.append(Constraint(mask, num_mines - self._flagged[index]))
+        return constraints, squares, containing
+
+    def _pair_deductions(self):
+        """Find squares forced by a subset constraint
+
+        Returns:
+            tuple: bitset of safe squares, bitset of mines and the frontier
+            squares by bit id.
+        """
+        constraints, squares, containing = self._frontier_constraints()
+        safe, mines = 0, 0
+        for small in constraints:
+            # a superset must contain every square of small, so only look at
+            # the constraints around its least shared square
+            mask = small.mask
+            candidates = None
+            while mask:
+                low = mask & -mask
+                ids = containing[low.bit_length() - 1]
+                if candidates is None or len(ids) < len(candidates):
+                    candidates = ids
+                mask ^= low
+            for large_id in candidates:
+                large = constraints[large_id]
+                if large is small or small.mask & ~large.mask or large.mask == small.mask:
+                    continue
+                rest = large.mask & ~small.mask
+                missing = large.mines - small.mines
+                if missing == 0:
+                    safe |= rest
+                elif missing == bin(rest).count('1'):
+                    mines |= rest
+        return safe, mines, squares
+
+    def _apply_pair_rule(self):
+        """Apply pair deductions and single constraint propagation until stable"""
+        while True:
+            safe, mines, squares = self._pair_deductions()
+            if not safe and not mines:
+                return
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Pair rule: %d safe squares, %d mines',
+                             bin(safe).count('1'), bin(mines).count('1'))
+            worklist = []
+            for bit, position in enumerate(squares):
+                if not self._is_unknown(position):
+                    continue
+                if mines >> bit & 1:
+                    self._resolve(position[0], position[1], True, worklist)
+                elif safe >> bit & 1:
+                    self._resolve(position[0], position[1], False, worklist)
+            self._propagate(worklist)
@@ -0,0 +1,246 @@
+"""Memoized deductions of small frontier windows
+
+The window of an exposed number is the 5x5 block of squares centered on
+it. Every number in its inner 3x3 block has all of its neighbors inside the
+window, so enumerating the mines of the unknown squares that satisfy those
+numbers gives squares that are safe or mines in every solution, like the
+1-2-1 and 1-2-2-1 patterns along an edge.
+
+A window is encoded as one byte per square, the number of an exposed
+square or one of the codes below. The 8 rotations and reflections of a
+window describe the same pattern, so the smallest encoding is the key and
+the deductions are stored in the coordinates of that canonical window.
+PatternCache keeps the most recently used keys and can be saved to and
+loaded from a JSON file to carry them over to the next run.
+"""
+import collections
+import json
+
+from .knowledge import FLAGGED, SAFE, UNKNOWN
+
+RADIUS = 2
+SIZE = 2 * RADIUS + 1
+# window codes of the squares that are not exposed numbers
+CODE_UNKNOWN = 9
+CODE_FLAGGED = 10
+CODE_SAFE = 11
+CODE_OFF_BOARD = 12
+# maps the bytes of a Knowledge state to window codes
+_TRANSLATE = bytearray(range(256))
+for _value, _code in ((UNKNOWN, CODE_UNKNOWN), (FLAGGED, CODE_FLAGGED), (SAFE, CODE_SAFE)):
+    _TRANSLATE[_value & 0xff] = _code
+_TRANSLATE = bytes(_TRANSLATE)
+_OFF_BOARD = bytes((CODE_OFF_BOARD,))
+FORMAT_VERSION = 1
+
+
+def _symmetries():
+    """Window index permutations of the 8 rotations and reflections"""
+    offsets = [(dx, dy) for dx in range(-RADIUS, RADIUS + 1) for dy in range(-RADIUS, RADIUS + 1)]
+    transforms = [lambda dx, dy: (dx, dy), lambda dx, dy: (-dx, dy),
+                  lambda dx, dy: (dx, -dy), lambda dx, dy: (-dx, -dy),
+                  lambda dx, dy: (dy, dx), lambda dx, dy: (-dy, dx),
+                  lambda dx, dy: (dy, -dx), lambda dx, dy: (-dy, -dx)]
+    return [tuple((tx + RADIUS) * SIZE + ty + RADIUS for tx, ty in (transform(dx, dy) for dx, dy in offsets))
+            for transform in transforms]
+
+
+SYMMETRIES = _symmetries()
+
+
+def _window_neighbors():
+    """Window indices of the neighbors of each square of the inner 3x3"""
+    table = {}
+    for x in range(1, SIZE - 1):
+        for y in range(1, SIZE - 1):
+            table[x * SIZE + y] = [(x + dx) * SIZE + y + dy for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                                   if dx or dy]
+    return table
+
+
+_INNER_NEIGHBORS = _window_neighbors()
+
+
+def window_codes(state, width, height, x, y):
+    """bytes: Codes of the window centered on (x, y), row by row in x"""
+    low, high = max(0, y - RADIUS), min(height, y + RADIUS + 1)
+    before, after = _OFF_BOARD * (low - y + RADIUS), _OFF_BOARD * (y + RADIUS + 1 - high)
+    rows = []
+    for nx in range(x - RADIUS, x + RADIUS + 1):
+        if nx < 0 or nx >= width:
+            rows.append(_OFF_BOARD * SIZE)
+        else:
+            start = nx * height
+            rows.append(before + state[start + low:start + high].tobytes() + after)
+    return b''.join(rows).translate(_TRANSLATE)
+
+
+def canonical(codes):
+    """The canonical key of a window and the permutation that produces it
+
+    Returns:
+        tuple: bytes key and the tuple of window indices, the i-th of which
+        is the square of the original window at index i of the key.
+    """
+    return min((bytes(map(codes.__getitem__, permutation)), permutation) for permutation in SYMMETRIES)
+
+
+def solve_window(codes):
+    """Squares of a window that are safe or mines in every solution
+
+    Returns:
+        tuple: Sorted window indices of the safe squares and of the mines,
+        two empty tuples if the numbers cannot be satisfied.
+    """
+    constraints = []
+    for center, neighbors in _INNER_NEIGHBORS.items():
+        num_mines = codes[center]
+        if num_mines > 8:
+            continue
+        unknown = [neighbor for neighbor in neighbors if codes[neighbor] == CODE_UNKNOWN]
+        num_mines -= sum(1 for neighbor in neighbors if codes[neighbor] == CODE_FLAGGED)
+        if num_mines < 0 or num_mines > len(unknown):
+            return (), ()
+        if unknown:
+            constraints.append((unknown, num_mines))
+    variables = sorted({square for unknown, _ in constraints for square in unknown})
+    if not variables:
+        return (), ()
+    position = {square: i for i, square in enumerate(variables)}
+    # constraint ids of each variable, and the mines and free squares left per constraint
+    containing = [[] for _ in variables]
+    needed, free = [], []
+    for c, (unknown, num_mines) in enumerate(constraints):
+        for square in unknown:
+            containing[position[square]].append(c)
+        needed.append(num_mines)
+        free.append(len(unknown))
+    assignment = [False] * len(variables)
+    seen_mine = [False] * len(variables)
+    seen_safe = [False] * len(variables)
+
+    def search(i):
+        if i == len(variables):
+            for v, mine in enumerate(assignment):
+                if mine:
+                    seen_mine[v] = True
+                else:
+                    seen_safe[v] = True
+            return
+        for mine in (False, True):
+            feasible = True
+            for c in containing[i]:
+                free[c] -= 1
+                needed[c] -= mine
+                if needed[c] < 0 or needed[c] > free[c]:
+                    feasible = False
+            if feasible:
+                assignment[i] = mine
+                search(i + 1)
+            for c in containing[i]:
+                free[c] += 1
+                needed[c] += mine
+
+    search(0)
+    if not any(seen_mine) and not any(seen_safe):
+        return (), ()
+    safe = tuple(variables[v] for v in range(len(variables)) if not seen_mine[v])
+    mines = tuple(variables[v] for v in range(len(variables)) if not seen_safe[v])
+    return safe, mines
+
+
+class PatternCache:
+    """Bounded LRU of window deductions by canonical key
+
+    Attributes:
+        maxsize (int): Number of patterns kept at most, 0 to keep none.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that solved the window.
+    """
+    def __init__(self, maxsize=65536):
+        if maxsize < 0:
+            raise ValueError('maxsize must not be negative')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def lookup(self, key):
+        """Deductions of a canonical window, solving it on a miss
+
+        Returns:
+            tuple: Window indices of the safe squares and of the mines in
+            the coordinates of the canonical window.
+        """
+        entries = self._entries
+        result = entries.get(key)
+        if result is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+            return result
+        self.misses += 1
+        result = solve_window(key)
+        if self.maxsize:
+            entries[key] = result
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+        return result
+
+    def deduce(self, state, width, height, x, y):
+        """Safe squares and mines around the exposed number at (x, y)
+
+        Args:
+            state (array): Knowledge state of the board.
+            width (int): Width of the board.
+            height (int): Height of the board.
+            x (int): x position of the center.
+            y (int): y position of the center.
+
+        Returns:
+            tuple: Lists of the x,y positions of the safe squares and mines.
+        """
+        key, permutation = canonical(window_codes(state, width, height, x, y))
+        safe, mines = self.lookup(key)
+        if not safe and not mines:
+            return [], []
+        x0, y0 = x - RADIUS, y - RADIUS
+        return ([(x0 + permutation[i] // SIZE, y0 + permutation[i] % SIZE) for i in safe],
+                [(x0 + permutation[i] // SIZE, y0 + permutation[i] % SIZE) for i in mines])
+
+    def clear(self):
+        """Forget every pattern and reset the counters"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def save(self, path):
+        """Write the patterns to a JSON file, least recently used first"""
+        entries = [[key.hex(), list(safe), list(mines)] for key, (safe, mines) in self._entries.items()]
+        with open(path, 'w') as f:
+            json.dump({'version': FORMAT_VERSION, 'radius': RADIUS, 'entries': entries}, f)
+
+    def load(self, path):
+        """Add the patterns of a file written by save
+
+        Raises:
+            ValueError: if the file is not a pattern cache of this format.
+        """
+        with open(path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get('version') != FORMAT_VERSION \
+                or data.get('radius') != RADIUS:
+            raise ValueError('{} is not a version {} pattern cache'.format(path, FORMAT_VERSION))
+        for key, safe, mines in data['entries']:
+            key = bytes.fromhex(key)
+            self._entries[key] = (tuple(safe), tuple(mines))
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
@@ -0,0 +1,295 @@
+import time
+
+from typing import Dict, List, Optional, Tuple
+
+from minesweeper import minesweeper as ms
+from .pair_ai import AlgorithmGamma
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetExceeded(Exception):
+    """Raised when exact enumeration runs out of its time budget"""
+
+
+def _binomial(n, k):
+    """Number of ways to choose k of n items"""
+    if k < 0 or k > n:
+        return 0
+    k = min(k, n - k)
+    ways = 1
+    for i in range(k):
+        ways = ways * (n - i) // (i + 1)
+    return ways
+
+
+class AlgorithmDelta(AlgorithmGamma):
+    """AlgorithmGamma that guesses by exact mine probabilities
+
+    The frontier is split into independent components of squares linked by
+    shared constraints. Each component is enumerated by backtracking over
+    its squares, with the partial results memoized on the remaining mines of
+    the constraints that are still open, which gives the number of
+    solutions and the per-square mine counts for every number of mines in
+    the component. The components and the unconstrained squares are then
+    combined with binomial weights for the mines left on the board.
+
+    When a component is larger than max_component or the enumeration takes
+    longer than time_budget seconds, its solutions are sampled instead: up
+    to num_samples consistent assignments are found by randomized
+    backtracking within one more time_budget, and each stands for one
+    solution. The samples are not uniform over the solutions, so the
+    probabilities of that component are an estimate. guess() returns None,
+    and BasicAI guesses at random, only if no assignment is found.
+    """
+    def __init__(self, config: ms.GameConfig, max_component=64, time_budget=0.25, num_samples=200):
+        super().__init__(config)
+        self.num_mines = config.num_mines
+        self.max_component = max_component
+        self.time_budget = time_budget
+        self.num_samples = num_samples
+
+    def guess(self) -> Optional[Tuple[int, int]]:
+        """Pick the unknown square least likely to be a mine
+
+        Returns:
+            tuple: x,y position, or None if a component could be neither
+            enumerated nor sampled.
+        """
+        estimate = self.probabilities()
+        if estimate is None:
+            return None
+        frontier, unconstrained, outside = estimate
+        best = min(frontier.items(), key=lambda item: (item[1], item[0]), default=(None, 2.0))
+        if outside and unconstrained < best[1]:
+            return self.rng.choice(outside)
+        return best[0]
+
+    def probabilities(self):
+        """Mine probability of every unknown square
+
+        Returns:
+            tuple: dict from frontier position to probability, the probability
+            for each square off the frontier and the list of those squares, or
+            None if a component has no sampled assignment or the knowledge is
+            inconsistent.
+        """
+        deadline = time.perf_counter() + self.time_budget
+        constraints, squares, containing = self._frontier_constraints()
+        components = self._components(constraints, squares, containing)
+        results = []
+        for component in components:
+            try:
+                result = self._enumerate(constraints, containing, component, deadline)
+            except BudgetExceeded:
+                logger.debug('Probability budget exceeded, sampling %d squares', len(component))
+                result = self._sample(constraints, containing, component, deadline + self.time_budget)
+                if not result:
+                    return None
+            results.append(result)
+
+        frontier = set(squares)
+        outside = [(x, y) for x in range(self.width) for y in range(self.height)
+                   if (x, y) not in frontier and self._is_unknown((x, y))]
+        remaining = self.num_mines - len(self.flags)
+        num_outside = len(outside)
+
+        def outside_ways(mines):
+            return _binomial(num_outside, mines)
+
+        distributions = [{k: count for k, (count, _) in result.items()} for result in results]
+        probabilities = {}
+        for index, (component, result) in enumerate(zip(components, results)):
+            others = _convolve_all(distributions[:index] + distributions[index + 1:])
+            weights = {k: sum(ways * outside_ways(remaining - k - j) for j, ways in others.items())
+                       for k in result}
+            total = sum(count * weights[k] for k, (count, _) in result.items())
+            if total == 0:
+                return None
+            for position_index, bit in enumerate(component):
+                mines = sum(sums[position_index] * weights[k] for k, (_, sums) in result.items())
+                probabilities[squares[bit]] = mines / total
+
+        unconstrained = 1.0
+        if num_outside:
+            combined = _convolve_all(distributions)
+            total = sum(ways * outside_ways(remaining - k) for k, ways in combined.items())
+            if total == 0:
+                return None
+            mines = sum(ways * outside_ways(remaining - k) * (remaining - k) for k, ways in combined.items())
+            unconstrained = mines / total / num_outside
+        return probabilities, unconstrained, outside
+
+    def _components(self, constraints, squares, containing) -> List[List[int]]:
+        """Split the frontier bit ids into groups linked by shared constraints
+
+        Squares of a component are listed in breadth first order so that
+        constraints are opened and closed close together.
+        """
+        seen = [False] * len(squares)
+        components = []
+        for start in range(len(squares)):
+            if seen[start]:
+                continue
+            seen[start] = True
+            component = [start]
+            for bit in component:
+                for constraint_id in containing[bit]:
+                    mask = constraints[constraint_id].mask
+                    while mask:
+                        low = mask & -mask
+                        other = low.bit_length() - 1
+                        if not seen[other]:
+                            seen[other] = True
+                            component.append(other)
+                        mask ^= low
+            components.append(component)
+        return components
+
+    def _enumerate(self, constraints, containing, component, deadline) -> Dict[int, Tuple[int, List[int]]]:
+        """Count the solutions of one component
+
+        Returns:
+            dict: number of mines in the component to the number of
+            solutions and, per square of the component, the number of those
+            solutions where it is a mine.
+        """
+        if len(component) > self.max_component:
+            raise BudgetExceeded()
+        size = len(component)
+        ids, constraints_of, unassigned = _component_constraints(constraints, containing, component)
+        remaining = {c: constraints[c].mines for c in ids}
+        first, last = {}, {}
+        for i, constraint_ids in enumerate(constraints_of):
+            for c in constraint_ids:
+                first.setdefault(c, i)
+                last[c] = i
+        # constraints with squares on both sides of step i
+        active = [[c for c in ids if first[c] < i <= last[c]] for i in range(size + 1)]
+        memo = {}
+
+        def solve(i):
+            key = (i, tuple(remaining[c] for c in active[i]))
+            cached = memo.get(key)
+            if cached is not None:
+                return cached
+            if time.perf_counter() > deadline:
+                raise BudgetExceeded()
+            if i == size:
+                result = {0: (1, [])}
+            else:
+                result = {}
+                for value in (0, 1):
+                    feasible = True
+                    for c in constraints_of[i]:
+                        remaining[c] -= value
+                        unassigned[c] -= 1
+                        if remaining[c] < 0 or remaining[c] > unassigned[c]:
+                            feasible = False
+                    if feasible:
+                        for k, (count, sums) in solve(i + 1).items():
+                            k += value
+                            if k in result:
+                                total, previous = result[k]
+                                result[k] = (total + count,
+                                             [total_sum + new for total_sum, new in
+                                              zip(previous, [count * value] + sums)])
+                            else:
+                                result[k] = (count, [count * value] + sums)
+                    for c in constraints_of[i]:
+                        remaining[c] += value
+                        unassigned[c] += 1
+            memo[key] = result
+            return result
+
+        return solve(0)
+
+    def _sample(self, constraints, containing, component, deadline) -> Dict[int, Tuple[int, List[int]]]:
+        """Estimate the solutions of one component from random assignments
+
+        Each sample is the first consistent assignment of a backtracking
+        search that tries a mine first with the share of missing mines of
+        the constraints of the square. A search gives up after a few visits
+        per square.
+
+        Returns:
+            dict: Like _enumerate, with sampled assignments in place of
+            solutions. Empty if no assignment was found.
+        """
+        size = len(component)
+        ids, constraints_of, squares_of = _component_constraints(constraints, containing, component)
+        max_steps = 20 * size
+        rng = self.rng
+        result = {}
+        for _ in range(self.num_samples):
+            if time.perf_counter() > deadline:
+                break
+            remaining = {c: constraints[c].mines for c in ids}
+            unassigned = dict(squares_of)
+            assignment = [0] * size
+            # values left to try at each step, None before the step is entered
+            tries = [None] * size
+            steps = i = 0
+            while 0 <= i < size and steps <= max_steps:
+                if tries[i] is None:
+                    steps += 1
+                    share = sum(remaining[c] / unassigned[c] for c in constraints_of[i]) / len(constraints_of[i])
+                    tries[i] = [0, 1] if rng.random() < share else [1, 0]
+                else:
+                    # undo the value tried last at this step
+                    for c in constraints_of[i]:
+                        remaining[c] += assignment[i]
+                        unassigned[c] += 1
+                if not tries[i]:
+                    tries[i] = None
+                    i -= 1
+                    continue
+                value = assignment[i] = tries[i].pop()
+                feasible = True
+                for c in constraints_of[i]:
+                    remaining[c] -= value
+                    unassigned[c] -= 1
+                    if remaining[c] < 0 or remaining[c] > unassigned[c]:
+                        feasible = False
+                if feasible:
+                    i += 1
+            if i < size:
+                continue
+            k = sum(assignment)
+            count, sums = result.get(k, (0, [0] * size))
+            result[k] = (count + 1, [total + value for total, value in zip(sums, assignment)])
+        return result
+
+
+def _component_constraints(constraints, containing, component):
+    """Constraints of one component by position of its squares
+
+    Returns:
+        tuple: Sorted constraint ids, the constraint ids of each square of
+        the component and the number of squares of each constraint.
+    """
+    position = {bit: i for i, bit in enumerate(component)}
+    ids = sorted({c for bit in component for c in containing[bit]})
+    constraints_of = [[] for _ in component]
+    squares_of = {c: 0 for c in ids}
+    for c in ids:
+        mask = constraints[c].mask
+        while mask:
+            low = mask & -mask
+            constraints_of[position[low.bit_length() - 1]].append(c)
+            squares_of[c] += 1
+            mask ^= low
+    return ids, constraints_of, squares_of
+
+
+def _convolve_all(distributions):
+    """Distribution of the total mines of independent components"""
+    combined = {0: 1}
+    for distribution in distributions:
+        result = {}
+        for k, ways in combined.items():
+            for j, count in distribution.items():
+                result[k + j] = result.get(k + j, 0) + ways * count
+        combined = result
+    return combined
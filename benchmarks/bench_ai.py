@@ -0,0 +1,68 @@
+"""Win rate and per-move latency of the BasicAI algorithms on the demo levels
+
+Usage: python benchmarks/bench_ai.py [num_games]
+"""
+import logging
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+import ais  # noqa: E402
+
+levels = [
+    [8, 8, 10],
+    [16, 16, 40],
+    [30, 16, 99]
+]
+algorithms = [
+    ais.AlgorithmBeta,
+    ais.AlgorithmGamma,
+    ais.AlgorithmDelta,
+]
+
+
+def play(config, ai):
+    """Play one game, returns the result and the time spent in the AI per move"""
+    ai.reset(config)
+    game = ms.Game(config)
+    times = []
+    while not game.game_over:
+        start = timeit.default_timer()
+        x, y = ai.next()
+        seconds = timeit.default_timer() - start
+        result = game.select(x, y)
+        start = timeit.default_timer()
+        ai.update(result)
+        times.append(seconds + timeit.default_timer() - start)
+    return game.result, times
+
+
+def percentile(values, fraction):
+    return sorted(values)[int(fraction * (len(values) - 1))]
+
+
+def main():
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    logging.getLogger('ais').setLevel(logging.ERROR)
+    print('{:>12s} {:>16s} {:>8s} {:>10s} {:>10s} {:>10s}'.format(
+        'level', 'algorithm', 'win %', 'mean us', 'p50 us', 'p99 us'))
+    for level in levels:
+        config = ms.GameConfig(*level)
+        for algo_class in algorithms:
+            random.seed(0)
+            ai = ais.BasicAI(algo_class(config))
+            wins, times = 0, []
+            for _ in range(num_games):
+                result, game_times = play(config, ai)
+                wins += result.victory
+                times.extend(game_times)
+            print('{:>12s} {:>16s} {:8.1f} {:10.1f} {:10.1f} {:10.1f}'.format(
+                '{}x{}/{}'.format(*level), algo_class.__name__, 100 * wins / num_games,
+                sum(times) / len(times) * 1e6, percentile(times, 0.5) * 1e6, percentile(times, 0.99) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
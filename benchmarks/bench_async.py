@@ -0,0 +1,148 @@
+"""Throughput of agents behind a local stub server: run_games vs run_games_async
+
+The stub server plays RandomAI for each connection and waits a fixed delay
+before answering a move, like a model server would. run_games blocks a
+worker process per game on the socket, run_games_async keeps many games in
+flight on one event loop.
+
+Usage: python benchmarks/bench_async.py [num_games] [delay_ms]
+"""
+import asyncio
+import os
+import socket
+import sys
+import threading
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+
+config = ms.GameConfig(16, 16, 40)
+HOST = '127.0.0.1'
+
+
+def start_stub_server(delay):
+    """Serve in a background thread, returns the port
+
+    Protocol, one line per request and response:
+        reset W H -> ok
+        update x y x y ... -> ok
+        next -> x y, after delay seconds
+    """
+    async def handle(reader, writer):
+        ai = ms.RandomAI()
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            command, *args = line.split()
+            if command == b'reset':
+                ai.reset(ms.GameConfig(int(args[0]), int(args[1]), 0))
+                writer.write(b'ok\n')
+            elif command == b'update':
+                values = list(map(int, args))
+                ai.update(ms.MoveResult(ms.GameStatus.PLAYING,
+                                        [ms.Square(x, y, 0) for x, y in zip(values[::2], values[1::2])]))
+                writer.write(b'ok\n')
+            else:
+                await asyncio.sleep(delay)
+                writer.write('{} {}\n'.format(*ai.next()).encode())
+            await writer.drain()
+        writer.close()
+
+    ready = threading.Event()
+    port = []
+
+    def serve():
+        # no asyncio.run or Server.serve_forever before Python 3.7
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        server = loop.run_until_complete(asyncio.start_server(handle, HOST, 0, backlog=1024))
+        port.append(server.sockets[0].getsockname()[1])
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=serve, daemon=True).start()
+    ready.wait()
+    return port[0]
+
+
+def _update_line(result):
+    return 'update {}\n'.format(' '.join('{} {}'.format(s.x, s.y) for s in result.new_squares)).encode()
+
+
+class RemoteAI(ms.AI):
+    """Blocking client of the stub server"""
+    def __init__(self, port):
+        self.port = port
+        self.file = None
+
+    def _call(self, line):
+        if self.file is None:
+            self.file = socket.create_connection((HOST, self.port)).makefile('rwb')
+        self.file.write(line)
+        self.file.flush()
+        return self.file.readline()
+
+    def pretty_print(self):
+        pass
+
+    def reset(self, config):
+        self._call('reset {} {}\n'.format(config.width, config.height).encode())
+
+    def next(self):
+        x, y = self._call(b'next\n').split()
+        return int(x), int(y)
+
+    def update(self, result):
+        self._call(_update_line(result))
+
+    def __getstate__(self):
+        return {'port': self.port, 'file': None}
+
+
+class RemoteAsyncAI(ms.AsyncAI):
+    """Asyncio client of the stub server"""
+    def __init__(self, port):
+        self.port = port
+        self.reader = self.writer = None
+
+    async def _call(self, line):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(HOST, self.port)
+        self.writer.write(line)
+        await self.writer.drain()
+        return await self.reader.readline()
+
+    async def reset(self, config):
+        await self._call('reset {} {}\n'.format(config.width, config.height).encode())
+
+    async def next(self):
+        x, y = (await self._call(b'next\n')).split()
+        return int(x), int(y)
+
+    async def update(self, result):
+        await self._call(_update_line(result))
+
+
+def main():
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    delay = (float(sys.argv[2]) if len(sys.argv) > 2 else 5.0) / 1000
+    port = start_stub_server(delay)
+    print('{} games on 16x16, stub agent answers moves after {:.1f} ms'.format(num_games, delay * 1000))
+    for threads in (1, 4, 16):
+        start = timeit.default_timer()
+        ms.run_games(config, num_games, RemoteAI(port), threads=threads)
+        print('run_games       threads={:<4d} {:8.1f} games/s'.format(
+            threads, num_games / (timeit.default_timer() - start)))
+    loop = asyncio.new_event_loop()
+    for concurrency in (1, 16, 100, 300):
+        start = timeit.default_timer()
+        loop.run_until_complete(ms.run_games_async(config, num_games, lambda: RemoteAsyncAI(port), concurrency))
+        print('run_games_async concurrency={:<4d} {:8.1f} games/s'.format(
+            concurrency, num_games / (timeit.default_timer() - start)))
+    loop.close()
+
+
+if __name__ == '__main__':
+    main()
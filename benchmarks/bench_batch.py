@@ -0,0 +1,51 @@
+"""Games per second of BatchRunner vs the run_game loop
+
+Both play uniformly random unexposed squares: RandomAI one game at a time
+and RandomBatchAI for all games of a batch at once.
+
+Usage: python benchmarks/bench_batch.py [num_games]
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+
+configs = [
+    ms.GameConfig(8, 8, 10),
+    ms.GameConfig(16, 16, 40),
+    ms.GameConfig(30, 16, 99),
+]
+
+
+def serial(config, num_games):
+    ai = ms.RandomAI()
+    return [ms.run_game(config, ai, pid) for pid in range(num_games)]
+
+
+def batched(config, num_games):
+    return ms.run_batch(config, ms.RandomBatchAI(), num_games)
+
+
+def main():
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print('{} games of RandomAI per level'.format(num_games))
+    print('{:>10s} {:>12s} {:>12s} {:>12s} {:>12s}'.format(
+        'level', 'run_game g/s', 'batch g/s', 'moves', 'batch moves'))
+    for config in configs:
+        rates, moves = [], []
+        for function in (serial, batched):
+            random.seed(0)
+            start = timeit.default_timer()
+            results = function(config, num_games)
+            rates.append(num_games / (timeit.default_timer() - start))
+            moves.append(sum(result.num_moves for result in results) / num_games)
+        print('{:>10s} {:12.0f} {:12.0f} {:12.2f} {:12.2f}'.format(
+            '{}x{}/{}'.format(config.width, config.height, config.num_mines),
+            rates[0], rates[1], moves[0], moves[1]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Moves per second of the bitboard engine against the grid engines
+
+Every engine plays the same seeded boards. The first move is the center,
+then the safe squares are selected in a random order until the game is won,
+skipping the ones an opening already exposed. The time covers creating the
+game and all of its moves, best of a few repeats.
+
+Usage: python benchmarks/bench_bitboard.py [num_games]
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+
+levels = [(8, 8, 10), (16, 16, 40), (30, 16, 99)]
+repeats = 5
+
+
+def plans(width, height, num_mines, num_games):
+    """First move and safe squares of every game, from the list engine"""
+    config = ms.GameConfig(width, height, num_mines, safe_zone='opening', seed=3)
+    first = (width // 2, height // 2)
+    result = []
+    for game_id in range(num_games):
+        game = ms.Game(config, game_id=game_id)
+        game.select(*first)
+        safe = [(x, y) for x in range(width) for y in range(height) if not game.mines[x][y]]
+        random.Random(game_id).shuffle(safe)
+        result.append([first] + safe)
+    return result
+
+
+def play(config, moves_by_game):
+    """Returns the number of moves and the seconds to play them"""
+    num_moves = 0
+    start = timeit.default_timer()
+    for game_id, moves in enumerate(moves_by_game):
+        game = ms.Game(config, game_id=game_id)
+        view = game.state_view
+        for x, y in moves:
+            if view[x, y] == ms.UNEXPOSED:
+                game.select(x, y)
+                num_moves += 1
+        assert game.status == ms.GameStatus.VICTORY
+    return num_moves, timeit.default_timer() - start
+
+
+def main():
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    board_types = [board_type for board_type in ms.board.BOARD_TYPES
+                   if board_type != ms.board.BOARD_NUMPY or ms.board.np is not None]
+    print('{:>10s} {:>9s} {:>12s} {:>9s}'.format('board', 'engine', 'moves/s', 'speedup'))
+    for width, height, num_mines in levels:
+        moves_by_game = plans(width, height, num_mines, num_games)
+        configs = [ms.GameConfig(width, height, num_mines, board_type=board_type, safe_zone='opening', seed=3)
+                   for board_type in board_types]
+        # the engines take turns so that each sees the same background load
+        best = [None] * len(configs)
+        for _ in range(repeats):
+            for i, config in enumerate(configs):
+                run = play(config, moves_by_game)
+                if best[i] is None or run[1] < best[i][1]:
+                    best[i] = run
+        baseline = None
+        for board_type, (num_moves, seconds) in zip(board_types, best):
+            rate = num_moves / seconds
+            baseline = baseline or rate
+            print('{:>10s} {:>9s} {:12.0f} {:8.2f}x'.format(
+                '{}x{}/{}'.format(width, height, num_mines), board_type, rate, rate / baseline))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Memory and construction time of the board storage layouts
+
+Usage: python benchmarks/bench_board.py
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+
+sizes = [
+    (30, 16, 99),
+    (1000, 1000, 100000),
+]
+
+
+def peak_memory(config):
+    tracemalloc.start()
+    game = ms.Game(config)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del game
+    return peak
+
+
+def main():
+    print('{:>11s} {:>7s} {:>12s} {:>12s}'.format('board', 'layout', 'peak KiB', 'init ms'))
+    for width, height, num_mines in sizes:
+        for board_type in ms.board.BOARD_TYPES:
+            if board_type == ms.board.BOARD_NUMPY and ms.board.np is None:
+                continue
+            config = ms.GameConfig(width, height, num_mines, board_type=board_type)
+            number = 3 if width * height > 100000 else 200
+            seconds = timeit.timeit(lambda: ms.Game(config), number=number) / number
+            print('{:>11s} {:>7s} {:12.1f} {:12.3f}'.format(
+                '{}x{}'.format(width, height), board_type,
+                peak_memory(config) / 1024, seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Per-game setup cost of generated boards vs boards read from a corpus
+
+Times creating a game and making its first move, with mines placed by
+Game and with mines read from a memory mapped corpus.
+
+Usage: python benchmarks/bench_corpus.py [num_boards]
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+
+configs = [
+    ms.GameConfig(30, 16, 99, seed=0),
+    ms.GameConfig(30, 16, 99, board_type='numpy', seed=0),
+    ms.GameConfig(200, 200, 6000, board_type='numpy', seed=0),
+]
+
+
+def generated(config, num_boards, corpus):
+    for game_id in range(num_boards):
+        game = ms.Game(config, game_id=game_id)
+        game.select(*corpus.first_move(game_id))
+
+
+def from_corpus(config, num_boards, corpus):
+    for game_id in range(num_boards):
+        game = corpus.game(game_id)
+        game.select(*corpus.first_move(game_id))
+
+
+def main():
+    num_boards = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print('{:>14s} {:>6s} {:>10s} {:>14s} {:>14s}'.format(
+        'board', 'type', 'file KiB', 'generated us', 'corpus us'))
+    with tempfile.TemporaryDirectory() as directory:
+        for config in configs:
+            path = os.path.join(directory, 'boards.bin')
+            ms.write_corpus(path, config, num_boards)
+            with ms.Corpus(path) as corpus:
+                times = [min(timeit.repeat(lambda: function(config, num_boards, corpus), number=1, repeat=3))
+                         for function in (generated, from_corpus)]
+            print('{:>14s} {:>6s} {:10.1f} {:14.1f} {:14.1f}'.format(
+                '{}x{}/{}'.format(config.width, config.height, config.num_mines), config.board_type,
+                os.path.getsize(path) / 1024, times[0] / num_boards * 1e6, times[1] / num_boards * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Opening reveal time on large sparse boards: cell stack vs scanline fill
+
+Usage: python benchmarks/bench_flood_fill.py
+"""
+import array
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+
+WIDTH = 2000
+HEIGHT = 2000
+densities = [0.001, 0.01]
+
+
+class CellStackGame(ms.Game):
+    """Game exposing zero regions one square at a time from a stack"""
+    def _update(self, x, y):
+        revealed = ms.Reveal(array.array('i'), array.array('i'), array.array('b'))
+        stack = [x * self.height + y]
+        self._expose(x, y, revealed)
+        if self.mines[x][y]:
+            self._explosion = True
+            stack = []
+        elif self.counts[x][y] != 0:
+            stack = []
+        while stack:
+            for j in self._neighbors.neighbors(stack.pop()):
+                new_x, new_y = divmod(j, self.height)
+                if not self.exposed[new_x][new_y]:
+                    self._expose(new_x, new_y, revealed)
+                    if self.counts[new_x][new_y] == 0:
+                        stack.append(j)
+        return revealed
+
+    def _expose(self, x, y, revealed):
+        self._expose_square(x, y)
+        revealed.xs.append(x)
+        revealed.ys.append(y)
+        revealed.counts.append(self.counts[x][y])
+
+    def _expose_square(self, x, y):
+        self.exposed[x][y] = True
+        self._state[x * self.height + y] = self.counts[x][y]
+        self._num_exposed_squares += 1
+
+
+def opening(game_class, config, mines):
+    game = game_class(config, mines)
+    height = config.height
+    start = next(i for i, count in enumerate(ms.board.neighbor_counts(mines, config.width, height, 'array').flat)
+                 if count == 0)
+    x, y = divmod(start, height)
+    seconds = timeit.timeit(lambda: game._update(x, y), number=1)
+    return seconds, game._num_exposed_squares
+
+
+def main():
+    print('{}x{} board, first zero square opened'.format(WIDTH, HEIGHT))
+    print('{:>8s} {:>10s} {:>9s} {:>15s} {:>13s}'.format('density', 'layout', 'exposed', 'cell stack s', 'scanline s'))
+    for density in densities:
+        for board_type in ('list', 'array', 'numpy'):
+            if board_type == 'numpy' and ms.board.np is None:
+                continue
+            config = ms.GameConfig(WIDTH, HEIGHT, int(WIDTH * HEIGHT * density), board_type=board_type)
+            seed_game = ms.Game(config)
+            seed_game._place_mines()
+            old, old_exposed = opening(CellStackGame, config, seed_game.mines)
+            new, new_exposed = opening(ms.Game, config, seed_game.mines)
+            assert old_exposed == new_exposed
+            print('{:8.3f} {:>10s} {:9d} {:15.2f} {:13.2f}'.format(density, board_type, new_exposed, old, new))
+
+
+if __name__ == '__main__':
+    main()
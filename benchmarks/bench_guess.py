@@ -0,0 +1,52 @@
+"""Latency of AlgorithmDelta guess decisions on expert boards
+
+Usage: python benchmarks/bench_guess.py [num_games]
+"""
+import logging
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+import ais  # noqa: E402
+
+config = ms.GameConfig(30, 16, 99)
+
+
+class TimedDelta(ais.AlgorithmDelta):
+    """AlgorithmDelta recording how long each guess takes"""
+    def __init__(self, config):
+        super().__init__(config)
+        self.times = []
+        self.fallbacks = 0
+
+    def guess(self):
+        start = timeit.default_timer()
+        position = super().guess()
+        self.times.append(timeit.default_timer() - start)
+        self.fallbacks += position is None
+        return position
+
+
+def percentile(values, fraction):
+    return sorted(values)[int(fraction * (len(values) - 1))]
+
+
+def main():
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    logging.getLogger('ais').setLevel(logging.ERROR)
+    random.seed(0)
+    algo = TimedDelta(config)
+    ai = ais.BasicAI(algo)
+    wins = sum(ms.run_game(config, ai, pid).victory for pid in range(num_games))
+    times = algo.times
+    print('{} expert games, win rate {:.1f}%'.format(num_games, 100 * wins / num_games))
+    print('{} guesses, {} over budget'.format(len(times), algo.fallbacks))
+    for fraction in (0.5, 0.9, 0.99, 1.0):
+        print('p{:<4g} {:10.2f} ms'.format(fraction * 100, percentile(times, fraction) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Win rate and move latency of BasicAI guess policies on expert boards
+
+Every policy plays the same seeded boards with AlgorithmBeta. The win rate
+is shown with its 95% interval, and the time per move includes next() and
+update().
+
+Usage: python benchmarks/bench_guess_policy.py [num_games] [budget_ms]
+"""
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+import ais  # noqa: E402
+
+config = ms.GameConfig(30, 16, 99, safe_zone='opening', seed=2024)
+
+
+def play(ai, num_games):
+    """Returns the GameStats of num_games games and the seconds per move"""
+    stats = ms.GameStats()
+    seconds = 0.0
+    for pid in range(num_games):
+        ai.rng = config.rng(pid, 'ai')
+        ai.reset(config)
+        game = ms.Game(config, game_id=pid)
+        start = timeit.default_timer()
+        while not game.game_over:
+            ai.update(game.select(*ai.next()))
+        seconds += timeit.default_timer() - start
+        stats.add(game.result)
+    return stats, seconds / stats.total_moves
+
+
+def main():
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    budget = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else None
+    logging.getLogger('ais').setLevel(logging.ERROR)
+    policies = [('random', None), ('corner', ais.CornerPolicy(budget)),
+                ('probability', ais.ProbabilityPolicy(budget)), ('opening', ais.OpeningPolicy(budget))]
+    print('{} expert games, budget {}'.format(num_games, 'none' if budget is None else '{:g} ms'.format(budget * 1000)))
+    for name, policy in policies:
+        stats, per_move = play(ais.BasicAI(ais.AlgorithmBeta(config), guess_policy=policy), num_games)
+        lower, upper = stats.confidence_interval()
+        print('{:12s} win rate {:6.2%} ({:6.2%} - {:6.2%}) {:8.1f} us/move'.format(
+            name, stats.win_rate, lower, upper, per_move * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Late game random guess latency on a 500x500 board
+
+99% of the squares are exposed. The rejection loop draws random squares
+until it finds an unknown one; the candidate pool picks one directly.
+
+Usage: python benchmarks/bench_guess_pool.py [num_guesses]
+"""
+import logging
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+import ais  # noqa: E402
+
+config = ms.GameConfig(500, 500, 2500)
+
+
+def rejection_guess(ai):
+    """The fallback both AIs used before the candidate pool"""
+    flags = getattr(ai, '_flags', ())
+    while True:
+        x = random.randint(0, ai.width - 1)
+        y = random.randint(0, ai.height - 1)
+        if (x, y) not in ai.exposed_squares and (x, y) not in flags:
+            return x, y
+
+
+def late_game(ai):
+    """Expose all but 1% of the squares, as zeros so nothing is deduced"""
+    ai.reset(config)
+    unknown = set(random.sample(range(config.width * config.height), config.num_mines))
+    squares = [ms.Square(x, y, 0) for x in range(config.width) for y in range(config.height)
+               if x * config.height + y not in unknown]
+    ai.update(ms.MoveResult(ms.GameStatus.PLAYING, squares))
+    return ai
+
+
+def time_guesses(guess, num_guesses):
+    times = []
+    for _ in range(num_guesses):
+        start = timeit.default_timer()
+        guess()
+        times.append(timeit.default_timer() - start)
+    times.sort()
+    return sum(times) / len(times), times[len(times) // 2], times[int(0.99 * (len(times) - 1))]
+
+
+def main():
+    num_guesses = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    logging.getLogger('ais').setLevel(logging.ERROR)
+    random.seed(0)
+    random_ai = late_game(ms.RandomAI())
+    basic_ai = late_game(ais.BasicAI(ais.AlgorithmBeta(config)))
+    basic_ai.safe_choices.clear()
+    print('{} guesses on 500x500 with 1% unknown'.format(num_guesses))
+    print('{:>26s} {:>10s} {:>10s} {:>10s}'.format('', 'mean us', 'p50 us', 'p99 us'))
+    for name, guess in [('RandomAI rejection loop', lambda: rejection_guess(random_ai)),
+                        ('RandomAI candidate pool', random_ai.next),
+                        ('BasicAI rejection loop', lambda: rejection_guess(basic_ai)),
+                        ('BasicAI candidate pool', basic_ai.next)]:
+        print('{:>26s} {:10.2f} {:10.2f} {:10.2f}'.format(
+            name, *(t * 1e6 for t in time_guesses(guess, num_guesses))))
+
+
+if __name__ == '__main__':
+    main()
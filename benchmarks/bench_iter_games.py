@@ -0,0 +1,40 @@
+"""Peak memory of collecting results with run_games vs streaming them into GameStats
+
+Usage: python benchmarks/bench_iter_games.py [num_games]
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+
+config = ms.GameConfig(8, 8, 10)
+
+
+def collect(num_games):
+    results = ms.run_games(config, num_games, ms.RandomAI())
+    return sum(result.victory for _, result in results)
+
+
+def stream(num_games):
+    stats = ms.evaluate(config, ms.RandomAI(), num_games)
+    return stats.num_wins
+
+
+def main():
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print('{} RandomAI games on 8x8'.format(num_games))
+    for name, function in (('run_games', collect), ('iter_games', stream)):
+        tracemalloc.start()
+        start = timeit.default_timer()
+        function(num_games)
+        seconds = timeit.default_timer() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print('{:>10s}: peak {:8.1f} KiB, {:8.0f} games/s'.format(name, peak / 1024, num_games / seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Memory held by a BasicAI and its time per move on large boards
+
+Plays one game per board size with BasicAI(AlgorithmBeta) and reports the
+memory the AI retains when the game is over (traced with tracemalloc) and
+the mean time of next() plus update() per move.
+
+Usage: python benchmarks/bench_knowledge.py
+"""
+import gc
+import logging
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+import ais  # noqa: E402
+
+configs = [
+    ms.GameConfig(30, 16, 99, safe_zone='opening', seed=1),
+    ms.GameConfig(200, 200, 4000, safe_zone='opening', seed=1),
+]
+
+
+def play(config, game_id):
+    """Play one game, returns the AI, the number of moves and the time in the AI"""
+    ai = ais.BasicAI(ais.AlgorithmBeta(config))
+    ai.rng = config.rng(game_id, 'ai')
+    ai.reset(config)
+    game = ms.Game(config, game_id=game_id)
+    seconds = 0.0
+    while not game.game_over:
+        start = timeit.default_timer()
+        x, y = ai.next()
+        seconds += timeit.default_timer() - start
+        result = game.select(x, y)
+        start = timeit.default_timer()
+        ai.update(result)
+        seconds += timeit.default_timer() - start
+    return ai, game, seconds
+
+
+def main():
+    logging.getLogger('ais').setLevel(logging.ERROR)
+    print('{:>14s} {:>8s} {:>10s} {:>12s} {:>12s}'.format('board', 'moves', 'exposed', 'AI KiB', 'us/move'))
+    for config in configs:
+        # the game with the most exposed squares out of a few
+        ai, game, seconds = max((play(config, game_id) for game_id in range(3)),
+                                key=lambda played: len(played[0].exposed_squares))
+        game_id = game.game_id
+        del ai, game
+        gc.collect()
+        tracemalloc.start()
+        ai, game, _ = play(config, game_id)
+        del game
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print('{:>14s} {:8d} {:10d} {:12.1f} {:12.1f}'.format(
+            '{}x{}/{}'.format(config.width, config.height, config.num_mines), ai.num_moves,
+            len(ai.exposed_squares), size / 1024, seconds / ai.num_moves * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""AlgorithmBeta, AlgorithmGamma and AlgorithmEpsilon on 200x200 boards
+
+Reports the per-move update latency, the number of guesses and how much of
+the board was cleared before the first wrong guess.
+
+Usage: python benchmarks/bench_linear.py [num_games]
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+from ais import AlgorithmBeta, AlgorithmGamma, AlgorithmEpsilon  # noqa: E402
+
+config = ms.GameConfig(200, 200, 6000, safe_zone='opening')
+
+
+def play(algo_class, seed):
+    """Play one game picking safe choices first
+
+    Returns:
+        tuple: per-move update times, number of guesses and squares exposed.
+    """
+    rng = random.Random('guesses {}'.format(seed))
+    random.seed(seed)
+    game = ms.Game(config)
+    algo = algo_class(config)
+    times, guesses = [], 0
+    while not game.game_over:
+        candidates = [p for p in algo.safe_choices if not game.exposed[p[0]][p[1]]]
+        if candidates:
+            x, y = candidates[0]
+        else:
+            guesses += 1
+            x, y = rng.choice([(x, y) for x in range(config.width) for y in range(config.height)
+                               if not game.exposed[x][y] and (x, y) not in algo.flags])
+        result = game.select(x, y)
+        if result.status == ms.GameStatus.DEFEAT:
+            break
+        start = timeit.default_timer()
+        algo.update(result.new_squares)
+        times.append(timeit.default_timer() - start)
+    return times, guesses, len(algo.exposed_squares)
+
+
+def percentile(values, fraction):
+    return sorted(values)[int(fraction * (len(values) - 1))]
+
+
+def main():
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    num_safe = config.width * config.height - config.num_mines
+    print('{:>16s} {:>8s} {:>8s} {:>10s} {:>10s} {:>10s} {:>10s}'.format(
+        'solver', 'moves', 'guesses', 'cleared %', 'mean us', 'p99 us', 'total s'))
+    for algo_class in (AlgorithmBeta, AlgorithmGamma, AlgorithmEpsilon):
+        times, guesses, exposed = [], 0, 0
+        for seed in range(num_games):
+            game_times, game_guesses, game_exposed = play(algo_class, seed)
+            times.extend(game_times)
+            guesses += game_guesses
+            exposed += game_exposed
+        print('{:>16s} {:8d} {:8d} {:10.1f} {:10.1f} {:10.1f} {:10.2f}'.format(
+            algo_class.__name__, len(times), guesses, 100 * exposed / num_safe / num_games,
+            sum(times) / len(times) * 1e6, percentile(times, 0.99) * 1e6, sum(times)))
+
+
+if __name__ == '__main__':
+    main()
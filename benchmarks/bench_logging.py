@@ -0,0 +1,87 @@
+"""Per-move overhead of logging and instrumentation while they are disabled
+
+Plays RandomAI games at WARNING level with the guarded instrumentation, with
+a hook registered, and with the original eager log formatting.
+
+Usage: python benchmarks/bench_logging.py
+"""
+import logging
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+from minesweeper.minesweeper import Runner, logger  # noqa: E402
+
+NUM_GAMES = 300
+config = ms.GameConfig(30, 16, 99)
+
+
+class EagerGame(ms.Game):
+    """Game with the original unguarded select logging"""
+    def select(self, x, y):
+        logger.info("Player has picked %d, %d", x, y)
+        result = super().select(x, y)
+        squares = list(result.new_squares)
+        logger.info("%d squares are revealed%s", len(squares),
+                    "" if len(squares) > 1 else " -> " + str(squares[0].num_mines))
+        return result
+
+
+class EagerRunner(Runner):
+    """Runner with the original eager str.format debug calls"""
+    def __next__(self):
+        if self.game.game_over:
+            raise StopIteration()
+        coordinates = self.ai.next()
+        logger.debug("Next is ({:d}, {:d})".format(coordinates[0], coordinates[1]))
+        result = self.game.select(*coordinates)
+        logger.debug("Result: status - {:s}".format(result.status))
+        logger.debug("Result: new_squares", list(result.new_squares)[0])
+        self.ai.update(result)
+        if result.status == ms.GameStatus.PLAYING:
+            self.game.flags = self.ai.flags
+        else:
+            logger.info("Game is over")
+            logger.debug("Status: {:s}".format(result.status))
+            logger.debug("Last move: ({:d},{:d})".format(coordinates[0], coordinates[1]))
+
+
+def play(game_class, runner_class):
+    random.seed(0)
+    ai = ms.RandomAI()
+    moves = 0
+    start = timeit.default_timer()
+    for _ in range(NUM_GAMES):
+        ai.reset(config)
+        game = game_class(config)
+        for _ in runner_class(game, ai):
+            pass
+        moves += game.num_moves
+    return (timeit.default_timer() - start) / moves
+
+
+def count_events(event, **fields):
+    count_events.count += 1
+
+
+count_events.count = 0
+
+
+def main():
+    logging.basicConfig(level=logging.WARNING)
+    guarded = play(ms.Game, Runner)
+    ms.instrument.add_hook(count_events)
+    hooked = play(ms.Game, Runner)
+    ms.instrument.remove_hook(count_events)
+    eager = play(EagerGame, EagerRunner)
+    print('{} RandomAI games on 30x16, logging at WARNING'.format(NUM_GAMES))
+    print('guarded, no hooks: {:6.2f} us/move'.format(guarded * 1e6))
+    print('guarded, 1 hook:   {:6.2f} us/move ({} events)'.format(hooked * 1e6, count_events.count))
+    print('eager formatting:  {:6.2f} us/move'.format(eager * 1e6))
+
+
+if __name__ == '__main__':
+    main()
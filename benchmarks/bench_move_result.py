@@ -0,0 +1,58 @@
+"""Memory held by the result of a large opening
+
+Compares a set of Square objects with a per-instance __dict__ (the
+original layout), a set of slotted Square objects and the columnar result.
+
+Usage: python benchmarks/bench_move_result.py
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+
+WIDTH = 1000
+HEIGHT = 1000
+NUM_MINES = 5000
+
+
+class DictSquare:
+    def __init__(self, x, y, num_mines):
+        self.x = x
+        self.y = y
+        self.num_mines = num_mines
+
+    def __hash__(self):
+        return hash((self.x, self.y, self.num_mines))
+
+
+def build_result(layout, revealed):
+    if layout == 'dict squares':
+        return ms.MoveResult(ms.GameStatus.PLAYING, map(DictSquare, *revealed), revealed)
+    if layout == 'slotted squares':
+        return ms.MoveResult(ms.GameStatus.PLAYING, map(ms.Square, *revealed), revealed)
+    return ms.ColumnarMoveResult(ms.GameStatus.PLAYING, revealed)
+
+
+def main():
+    game = ms.Game(ms.GameConfig(WIDTH, HEIGHT, NUM_MINES, board_type='array'))
+    revealed = game.select(WIDTH // 2, HEIGHT // 2).revealed
+    print('{}x{} board, opening of {} squares'.format(WIDTH, HEIGHT, len(revealed.xs)))
+    print('{:>16s} {:>10s} {:>10s} {:>10s}'.format('layout', 'blocks', 'peak MiB', 'build ms'))
+    for layout in ('dict squares', 'slotted squares', 'columnar'):
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        result = build_result(layout, revealed)
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+        seconds = timeit.timeit(lambda: build_result(layout, revealed), number=1)
+        print('{:>16s} {:10d} {:10.1f} {:10.1f}'.format(layout, blocks, peak / 2 ** 20, seconds * 1000))
+        del result
+
+
+if __name__ == '__main__':
+    main()
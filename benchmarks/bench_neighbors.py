@@ -0,0 +1,99 @@
+"""Per-move cost of neighbor enumeration: bounds checks vs the shared table
+
+Usage: python benchmarks/bench_neighbors.py
+"""
+import itertools
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+from ais import AlgorithmBeta  # noqa: E402
+
+sizes = [
+    (16, 16, 40),
+    (30, 16, 99),
+]
+
+
+def bounds_checked_neighbors(width, height, x, y):
+    for dx, dy in itertools.product([-1, 0, 1], repeat=2):
+        if dx == 0 and dy == 0:
+            continue
+        if 0 <= x + dx < width and 0 <= y + dy < height:
+            yield x + dx, y + dy
+
+
+class BoundsCheckedGame(ms.Game):
+    """Game with the region growing loop doing its own bounds checks"""
+    def _update(self, x, y):
+        self._expose_square(x, y)
+        squares = [ms.Square(x, y, self.counts[x][y])]
+        if self.mines[x][y] or self.counts[x][y] != 0:
+            return squares
+        stack = [(x, y)]
+        while stack:
+            x, y = stack.pop()
+            for new_x, new_y in bounds_checked_neighbors(self.width, self.height, x, y):
+                if not self.exposed[new_x][new_y]:
+                    self._expose_square(new_x, new_y)
+                    squares.append(ms.Square(new_x, new_y, self.counts[new_x][new_y]))
+                    if self.counts[new_x][new_y] == 0:
+                        stack.append((new_x, new_y))
+        return squares
+
+    def _expose_square(self, x, y):
+        self.exposed[x][y] = True
+        self._state[x * self.height + y] = self.counts[x][y]
+        self._num_exposed_squares += 1
+
+
+def play_safe_moves(game_class, config, seed):
+    """Select every safe square of one board in random order
+
+    Returns the time spent in select, excluding the first move that places
+    the mines, and the number of timed moves.
+    """
+    rng = random.Random(seed)
+    random.seed(seed)
+    game = game_class(config)
+    game.select(0, 0)
+    squares = [(x, y) for x in range(config.width) for y in range(config.height)]
+    rng.shuffle(squares)
+    seconds = 0.0
+    for x, y in squares:
+        if game.game_over:
+            break
+        if not game.mines[x][y] and not game.exposed[x][y]:
+            start = timeit.default_timer()
+            game.select(x, y)
+            seconds += timeit.default_timer() - start
+    return seconds, game.num_moves - 1
+
+
+def main():
+    random.seed(0)
+    for width, height, num_mines in sizes:
+        config = ms.GameConfig(width, height, num_mines)
+        cells = [(x, y) for x in range(width) for y in range(height)]
+        algo = AlgorithmBeta(config)
+        old = timeit.timeit(lambda: [list(bounds_checked_neighbors(width, height, x, y)) for x, y in cells],
+                            number=50)
+        new = timeit.timeit(lambda: [list(algo.neighours(x, y)) for x, y in cells], number=50)
+        print('{}x{} neighbor sweep: bounds checks {:.2f} us/cell, table {:.2f} us/cell'.format(
+            width, height, old / 50 / len(cells) * 1e6, new / 50 / len(cells) * 1e6))
+
+        for game_class in (BoundsCheckedGame, ms.Game):
+            seconds, moves = 0.0, 0
+            for seed in range(200):
+                game_seconds, game_moves = play_safe_moves(game_class, config, seed)
+                seconds += game_seconds
+                moves += game_moves
+            print('{}x{} {}.select: {:.2f} us/move'.format(
+                width, height, game_class.__name__, seconds / moves * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Latency of selecting zero squares: flood fill vs precomputed openings
+
+Usage: python benchmarks/bench_openings.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+
+sizes = [
+    (30, 16, 99, 200),
+    (100, 100, 1500, 20),
+    (1000, 1000, 150000, 1),
+]
+
+
+def open_all_regions(game, cells):
+    """Select every unexposed zero square in order, returns (seconds, clicks)"""
+    seconds, clicks = 0.0, 0
+    for x, y in cells:
+        if not game.exposed[x][y]:
+            start = timeit.default_timer()
+            game.select(x, y)
+            seconds += timeit.default_timer() - start
+            clicks += 1
+    return seconds, clicks
+
+
+def main():
+    print('{:>10s} {:>8s} {:>16s} {:>16s} {:>12s}'.format(
+        'board', 'clicks', 'flood fill us', 'indexed us', 'init ms'))
+    rng = random.Random(0)
+    for width, height, num_mines, num_boards in sizes:
+        totals = [0.0, 0.0, 0.0]
+        clicks = 0
+        for _ in range(num_boards):
+            layout = ms.Game(ms.GameConfig(width, height, num_mines))
+            layout._place_mines()
+            counts = ms.board.neighbor_counts(layout.mines, width, height)
+            cells = [(x, y) for x in range(width) for y in range(height) if counts[x][y] == 0]
+            rng.shuffle(cells)
+
+            game = ms.Game(ms.GameConfig(width, height, num_mines), layout.mines)
+            seconds, clicks_on_board = open_all_regions(game, cells)
+            totals[0] += seconds
+
+            start = timeit.default_timer()
+            game = ms.Game(ms.GameConfig(width, height, num_mines, index_openings=True), layout.mines)
+            totals[2] += timeit.default_timer() - start
+            totals[1] += open_all_regions(game, cells)[0]
+            clicks += clicks_on_board
+        print('{:>10s} {:8d} {:16.1f} {:16.1f} {:12.2f}'.format(
+            '{}x{}'.format(width, height), clicks,
+            totals[0] / clicks * 1e6, totals[1] / clicks * 1e6, totals[2] / num_boards * 1000))
+
+
+if __name__ == '__main__':
+    main()
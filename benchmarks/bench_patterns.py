@@ -0,0 +1,58 @@
+"""Hit rate and move latency of the AlgorithmBeta pattern cache
+
+Plays the same seeded expert boards with AlgorithmBeta alone, with window
+deductions solved every time (a cache of size 0), with a cold cache and
+with a cache loaded from the file the cold run saved.
+
+Usage: python benchmarks/bench_patterns.py [num_games]
+"""
+import logging
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+import ais  # noqa: E402
+
+config = ms.GameConfig(30, 16, 99, safe_zone='opening', seed=77)
+
+
+def play(algo, num_games):
+    """Returns the GameStats of num_games games and the seconds per move"""
+    ai = ais.BasicAI(algo)
+    stats = ms.GameStats()
+    start = timeit.default_timer()
+    for pid in range(num_games):
+        stats.add(ms.run_game(config, ai, pid))
+    return stats, (timeit.default_timer() - start) / stats.total_moves
+
+
+def main():
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    logging.getLogger('ais').setLevel(logging.ERROR)
+    logging.getLogger('minesweeper').setLevel(logging.ERROR)
+    path = os.path.join(tempfile.mkdtemp(), 'patterns.json')
+    print('{} expert games'.format(num_games))
+    print('{:12s} {:>9s} {:>9s} {:>9s} {:>9s}'.format('', 'win rate', 'us/move', 'hit rate', 'patterns'))
+
+    def show(name, stats, per_move, cache=None):
+        print('{:12s} {:9.2%} {:9.1f} {:>9s} {:>9s}'.format(
+            name, stats.win_rate, per_move * 1e6,
+            '' if cache is None else '{:.2%}'.format(cache.hit_rate),
+            '' if cache is None else str(len(cache))))
+
+    show('beta', *play(ais.AlgorithmBeta(config), num_games))
+    uncached = ais.PatternCache(maxsize=0)
+    show('uncached', *play(ais.AlgorithmBeta(config, uncached), num_games), uncached)
+    cold = ais.PatternCache()
+    show('cold cache', *play(ais.AlgorithmBeta(config, cold), num_games), cold)
+    cold.save(path)
+    warm = ais.PatternCache()
+    warm.load(path)
+    show('warm cache', *play(ais.AlgorithmBeta(config, warm), num_games), warm)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Mine placement time across densities: rejection sampling vs exact sampling
+
+Usage: python benchmarks/bench_place_mines.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+
+WIDTH = 500
+HEIGHT = 500
+densities = [0.10, 0.25, 0.50, 0.75, 0.90, 0.99]
+
+
+def rejection_sampling(game, excludes):
+    """The original placement loop"""
+    locations = set()
+    while len(locations) < game.num_mines:
+        x = random.randint(0, game.width - 1)
+        y = random.randint(0, game.height - 1)
+        if (x, y) not in excludes:
+            locations.add((x, y))
+    for x, y in locations:
+        game.mines[x][y] = True
+
+
+def main():
+    print('{}x{} board'.format(WIDTH, HEIGHT))
+    print('{:>8s} {:>14s} {:>14s}'.format('density', 'rejection ms', 'sample ms'))
+    for density in densities:
+        config = ms.GameConfig(WIDTH, HEIGHT, int(WIDTH * HEIGHT * density), board_type='array')
+        old = timeit.timeit(lambda: rejection_sampling(ms.Game(config), {(0, 0)}), number=1)
+        new = timeit.timeit(lambda: ms.Game(config)._place_mines([0]), number=1)
+        print('{:8.2f} {:14.1f} {:14.1f}'.format(density, old * 1000, new * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Games per second of run_games from 1 to N worker processes
+
+Compares the chunked run_games with submitting one task per game, which
+pickles the AI into every task.
+
+Usage: python benchmarks/bench_run_games.py [num_games] [max_workers]
+"""
+import concurrent.futures
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+import ais  # noqa: E402
+
+config = ms.GameConfig(30, 16, 99)
+
+
+def run_games_per_task(config, num_games, ai, threads):
+    """The original run_games, one future per game"""
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=threads) as executor:
+        future_to_pid = {executor.submit(ms.run_game, config, ai, pid): pid for pid in range(num_games)}
+        for future in concurrent.futures.as_completed(future_to_pid):
+            results.append((future_to_pid[future], future.result()))
+    return results
+
+
+def main():
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    logging.getLogger('ais').setLevel(logging.ERROR)
+    ai = ais.BasicAI(ais.AlgorithmBeta(config))
+    print('{} expert games with AlgorithmBeta, {} cpus'.format(num_games, os.cpu_count()))
+    print('{:>8s} {:>14s} {:>14s}'.format('workers', 'per task g/s', 'chunked g/s'))
+    counts = sorted({2 ** k for k in range(max_workers.bit_length()) if 2 ** k < max_workers} | {max_workers})
+    for workers in counts:
+        start = timeit.default_timer()
+        run_games_per_task(config, num_games, ai, workers)
+        per_task = num_games / (timeit.default_timer() - start)
+        start = timeit.default_timer()
+        ms.run_games(config, num_games, ai, threads=workers)
+        chunked = num_games / (timeit.default_timer() - start)
+        print('{:8d} {:14.1f} {:14.1f}'.format(workers, per_task, chunked))
+
+
+if __name__ == '__main__':
+    main()
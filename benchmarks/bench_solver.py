@@ -0,0 +1,87 @@
+"""Per-move latency of AlgorithmBeta: full rescans vs the worklist propagator
+
+Usage: python benchmarks/bench_solver.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+from ais import AlgorithmBeta  # noqa: E402
+
+# width, height, mines, games, moves timed per game
+sizes = [
+    (30, 16, 99, 100, None),
+    (100, 100, 1500, 3, 300),
+]
+
+
+class RescanAlgorithm(AlgorithmBeta):
+    """The original solver rescanning every exposed square until nothing changes"""
+    def update(self, new_squares):
+        for square in new_squares:
+            self.exposed_squares[(square.x, square.y)] = square.num_mines
+            self.safe_choices.discard((square.x, square.y))
+        changed = True
+        while changed:
+            changed = False
+            for (x, y), num_mines in self.exposed_squares.items():
+                if num_mines == 0:
+                    continue
+                marked_mines, unexposed_squares = self.check_neighbors(x, y)
+                if not unexposed_squares:
+                    continue
+                if marked_mines == num_mines:
+                    self.safe_choices.update(unexposed_squares)
+                    changed = True
+                elif marked_mines + len(unexposed_squares) == num_mines:
+                    self.flags.update(unexposed_squares)
+                    changed = True
+        return self.flags, self.safe_choices
+
+
+def play(algo_class, config, seed, max_moves=None):
+    """Play one game picking safe choices first, returns per-move update times"""
+    rng = random.Random('guesses {}'.format(seed))
+    random.seed(seed)
+    game = ms.Game(config)
+    algo = algo_class(config)
+    times = []
+    while not game.game_over and len(times) != max_moves:
+        candidates = [p for p in algo.safe_choices if not game.exposed[p[0]][p[1]]]
+        if candidates:
+            x, y = min(candidates)
+        else:
+            x, y = rng.choice([(x, y) for x in range(config.width) for y in range(config.height)
+                               if not game.exposed[x][y] and (x, y) not in algo.flags])
+        result = game.select(x, y)
+        if result.status == ms.GameStatus.DEFEAT:
+            break
+        start = timeit.default_timer()
+        algo.update(result.new_squares)
+        times.append(timeit.default_timer() - start)
+    return times
+
+
+def percentile(values, fraction):
+    return sorted(values)[int(fraction * (len(values) - 1))]
+
+
+def main():
+    print('{:>10s} {:>16s} {:>8s} {:>10s} {:>10s} {:>10s}'.format(
+        'board', 'solver', 'moves', 'mean us', 'p50 us', 'p99 us'))
+    for width, height, num_mines, num_games, max_moves in sizes:
+        config = ms.GameConfig(width, height, num_mines, safe_zone='opening')
+        for algo_class in (RescanAlgorithm, AlgorithmBeta):
+            times = []
+            for seed in range(num_games):
+                times.extend(play(algo_class, config, seed, max_moves))
+            print('{:>10s} {:>16s} {:8d} {:10.1f} {:10.1f} {:10.1f}'.format(
+                '{}x{}'.format(width, height), algo_class.__name__, len(times),
+                sum(times) / len(times) * 1e6, percentile(times, 0.5) * 1e6, percentile(times, 0.99) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Cost of polling the player's view of the board once per move
+
+Compares rebuilding the 2d state list on every access with reading the
+incrementally maintained state view. The per-move select time should not
+grow with the board size.
+
+Usage: python benchmarks/bench_state.py
+"""
+import itertools
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+
+sizes = [
+    (30, 16, 99),
+    (200, 200, 8000),
+    (1000, 1000, 200000),
+]
+NUM_MOVES = 50
+
+
+def rebuilt_state(game):
+    """The original state property"""
+    state = [[None for y in range(game.height)] for x in range(game.width)]
+    for x, y in itertools.product(range(game.width), range(game.height)):
+        if game.exposed[x][y]:
+            state[x][y] = game.counts[x][y]
+    return state
+
+
+def numbered_squares(game, rng):
+    """Unexposed safe squares with a mine count, in random order"""
+    squares = [(x, y) for x in range(game.width) for y in range(game.height)
+               if not game.mines[x][y] and game.counts[x][y] > 0]
+    rng.shuffle(squares)
+    return squares[:NUM_MOVES]
+
+
+def main():
+    print('{:>10s} {:>14s} {:>14s} {:>14s}'.format('board', 'select us', 'rebuild ms', 'view us'))
+    rng = random.Random(0)
+    for width, height, num_mines in sizes:
+        layout = ms.Game(ms.GameConfig(width, height, num_mines))
+        layout._place_mines()
+        game = ms.Game(ms.GameConfig(width, height, num_mines), layout.mines)
+        moves = numbered_squares(game, rng)
+        select = view = 0.0
+        for x, y in moves:
+            start = timeit.default_timer()
+            game.select(x, y)
+            select += timeit.default_timer() - start
+            view += timeit.timeit(lambda: game.state_view[x, y], number=1)
+        rebuild = timeit.timeit(lambda: rebuilt_state(game), number=1)
+        print('{:>10s} {:14.1f} {:14.2f} {:14.2f}'.format(
+            '{}x{}'.format(width, height), select / len(moves) * 1e6,
+            rebuild * 1e3, view / len(moves) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
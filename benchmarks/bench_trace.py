@@ -0,0 +1,52 @@
+"""Moves per second of BasicAI with and without rendering the board every move
+
+EagerBasicAI renders and logs the board after every update like BasicAI
+used to. The ais logger is at ERROR, so nothing is printed in either case.
+
+Usage: python benchmarks/bench_trace.py [num_games]
+"""
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import minesweeper as ms  # noqa: E402
+import ais  # noqa: E402
+from ais.basic_ai import logger  # noqa: E402
+
+config = ms.GameConfig(30, 16, 99, seed=0)
+
+
+class EagerBasicAI(ais.BasicAI):
+    """BasicAI building and logging the board text after every update"""
+    def update(self, result):
+        super().update(result)
+        if result.status != ms.GameStatus.DEFEAT:
+            logger.info("")
+            for line in self.board_lines():
+                logger.info(line)
+            logger.info("")
+
+
+def play(ai, num_games):
+    moves = 0
+    start = timeit.default_timer()
+    for pid in range(num_games):
+        moves += ms.run_game(config, ai, pid).num_moves
+    return moves / (timeit.default_timer() - start)
+
+
+def main():
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    logging.getLogger('ais').setLevel(logging.ERROR)
+    print('{} expert games with AlgorithmBeta'.format(num_games))
+    for name, ai_class, kwargs in [('render every move', EagerBasicAI, {}),
+                                   ('lazy', ais.BasicAI, {}),
+                                   ('lazy, trace failure', ais.BasicAI, {'trace_failure': True})]:
+        ai = ai_class(ais.AlgorithmBeta(config), **kwargs)
+        print('{:>20s}: {:8.0f} moves/s'.format(name, play(ai, num_games)))
+
+
+if __name__ == '__main__':
+    main()
@@ -23,18 +23,17 @@ def main():
     print()
 
     # results = ms.run_games(config, num_games, ai)
-    results = ms.run_games(config, num_games, ai, threads=MAX_THREADS)
+    results = ms.run_games(config, num_games, ai, threads=MAX_THREADS, viz=viz)
     print('\n\nResults:')
     print('-------------------------')
 
-    num_wins = 0
+    stats = ms.GameStats()
     for i, result in results:
-        num_wins += result.victory == True
+        stats.add(result)
         print('Game {:2d}: {:3d} steps, {:s}'.format(i, result.num_moves,'win' if result.victory else 'failed'))
 
-    ratio = num_wins / num_games
     print('-------------------------')
-    print('Ratio: {:.2f}'.format(ratio))
+    print('Ratio: {:.2f}'.format(stats.win_rate))
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
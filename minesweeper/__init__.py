@@ -1,2 +1,7 @@
-from .minesweeper import GameConfig, GameStatus, GameResult, Square, MoveResult, Game, AI, RandomAI, run_games, run_game
+from .minesweeper import UNEXPOSED, GameConfig, GameStatus, GameResult, Square, Reveal, MoveResult, SquareColumns, ColumnarMoveResult, StateView, Game, AI, RandomAI, run_games, iter_games, run_game
+from .stats import GameStats, evaluate
+from .bitboard import BitboardGame
+from .corpus import Corpus, write_corpus
+from .batch import BatchGame, BatchMoveResult, BatchAI, RandomBatchAI, BatchRunner, run_batch
+from .async_runner import AsyncAI, AsyncRunner, run_game_async, run_games_async
 from .visualize import GameVisualizer, PyGameVisualizer
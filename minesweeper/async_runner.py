@@ -0,0 +1,146 @@
+"""Asyncio game runner for AIs that wait on I/O
+
+An AsyncAI awaits its moves, for example from a model server, so one event
+loop can keep hundreds of games going while each waits for its agent.
+run_games_async plays a set of games with a bounded number of them in
+flight and an optional time limit per move.
+"""
+import abc
+import asyncio
+import logging
+import random
+
+from . import instrument
+from .minesweeper import Game, GameStatus
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAI(abc.ABC):
+    """Minesweeper AI Base class for agents that await their moves
+
+    Attributes:
+        rng: Random number generator for the current game, set before reset
+            like AI.rng.
+    """
+    rng = random
+
+    @abc.abstractmethod
+    async def reset(self, config):
+        """Reset an AI to play a new game
+
+        Args:
+            config (GameConfig): game configuration
+        """
+
+    @abc.abstractmethod
+    async def next(self):
+        """Get the next move from the AI
+
+        Returns:
+            tuple: x,y position with zero-based index
+        """
+
+    @abc.abstractmethod
+    async def update(self, result):
+        """Notify the AI of the result of the previous move
+
+        Args:
+            result (MoveResult): Status and list of squares exposed
+        """
+
+
+class AsyncRunner:
+    """Game runner as asynchronous iterator
+
+    A move that takes longer than move_timeout seconds quits the game.
+
+    Attributes:
+        game (Game): Minesweeper game
+        ai (AsyncAI): Minesweeper AI
+        move_timeout (float): Seconds allowed for each call to the AI, or None.
+        timed_out (bool): Whether the game was quit because of a timeout.
+    """
+    def __init__(self, game, ai, move_timeout=None):
+        self.game = game
+        self.ai = ai
+        self.move_timeout = move_timeout
+        self.timed_out = False
+
+    def __aiter__(self):
+        """Returns an asynchronous iterator"""
+        return self
+
+    async def __anext__(self):
+        """Advances the game one move"""
+        if self.game.game_over:
+            raise StopAsyncIteration()
+        try:
+            coordinates = await asyncio.wait_for(self.ai.next(), self.move_timeout)
+            result = self.game.select(*coordinates)
+            if instrument.enabled:
+                instrument.emit('move', x=coordinates[0], y=coordinates[1], result=result)
+            await asyncio.wait_for(self.ai.update(result), self.move_timeout)
+        except asyncio.TimeoutError:
+            logger.warning('AI timed out after %d moves, quitting', self.game.num_moves)
+            self.timed_out = True
+            self.game.quit()
+            raise StopAsyncIteration()
+        if result.status != GameStatus.PLAYING and logger.isEnabledFor(logging.INFO):
+            logger.info("Game is over: %s", result.status)
+
+
+async def run_game_async(config, ai, pid=0, move_timeout=None):
+    """ Run one game to evaluate an AsyncAI
+
+    Args:
+        config (GameConfig): Parameters of the game.
+        ai (AsyncAI): The AI
+        pid (int): The index of current run.
+        move_timeout (float, optional): Seconds allowed for each call to the AI.
+
+    Returns:
+        GameResult: Result of the game, a loss if the AI timed out
+    """
+    logger.info("Starting game %d", pid)
+    ai.rng = config.rng(pid, 'ai')
+    await ai.reset(config)
+    game = Game(config, game_id=pid)
+    async for _ in AsyncRunner(game, ai, move_timeout):
+        pass
+    return game.result
+
+
+async def run_games_async(config, num_games, ai_factory, concurrency=100, move_timeout=None):
+    """ Run a set of games concurrently on the running event loop
+
+    Each of the concurrency workers creates one AI with ai_factory and plays
+    games with it one after the other, so at most concurrency games are in
+    flight at any time. A game whose AI raises is logged and left out.
+
+    Args:
+        config (GameConfig): Parameters of the game.
+        num_games (int): Number of games.
+        ai_factory (callable): Returns a new AsyncAI.
+        concurrency (int): Max number of games played at the same time.
+        move_timeout (float, optional): Seconds allowed for each call to the AI.
+
+    Returns:
+        list: List of (pid, GameResult) tuples ordered by pid.
+    """
+    if concurrency < 1:
+        raise ValueError('concurrency must be positive')
+    pids = iter(range(num_games))
+    results = []
+
+    async def worker():
+        ai = ai_factory()
+        for pid in pids:
+            try:
+                results.append((pid, await run_game_async(config, ai, pid, move_timeout)))
+            except Exception as exc:
+                logger.error('Game %d generated an exception: %s', pid, exc)
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, num_games))))
+    results.sort(key=lambda item: item[0])
+    return results
@@ -0,0 +1,335 @@
+"""Lockstep simulation of many games of one configuration
+
+BatchGame keeps N games in numpy arrays of shape (N, W, H) and applies one
+move to every game at once. Revealing, growing openings and checking the
+status are array operations over all games, so an AI that picks its moves
+with numpy plays thousands of boards per interpreter step. BatchRunner
+advances a BatchGame with a BatchAI like Runner does for Game and AI.
+
+With a seeded configuration, game i of a batch places its mines like
+Game(config, game_id=first_game_id+i), so it plays the same boards as
+run_games given the same moves. Without a seed the mines of all games are
+drawn at once with numpy, seeded from the random module.
+
+Requires numpy.
+"""
+import abc
+import random
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+from . import neighbors
+from .minesweeper import GameResult, GameStatus, UNEXPOSED, SAFE_ZONE_OPENING, _sample_mines
+
+PLAYING = GameStatus.PLAYING.value
+VICTORY = GameStatus.VICTORY.value
+DEFEAT = GameStatus.DEFEAT.value
+
+
+class BatchMoveResult:
+    """Result of one lockstep move
+
+    Attributes:
+        status (ndarray): GameStatus value of each game after the move.
+        revealed (ndarray): (N, W, H) mask of the squares exposed by the move.
+    """
+    __slots__ = ('status', 'revealed')
+
+    def __init__(self, status, revealed):
+        self.status = status
+        self.revealed = revealed
+
+
+class BatchGame:
+    """N minesweeper games of one configuration played in lockstep
+
+    Attributes:
+        width (int): Width of the boards.
+        height (int): Height of the boards.
+        num_mines (int): Number of mines per board.
+        num_games (int): Number of games.
+        mines (ndarray): (N, W, H) booleans indicating mine locations.
+        exposed (ndarray): (N, W, H) booleans indicating exposed squares.
+        counts (ndarray): (N, W, H) int8 counts of neighboring mines, -1 on mines.
+        status (ndarray): GameStatus value of each game.
+        num_moves (ndarray): Number of moves made in each game.
+    """
+    def __init__(self, config, num_games, mines=None, first_game_id=0):
+        """
+        Args:
+            config (GameConfig): Configuration of every game.
+            num_games (int): Number of games.
+            mines (ndarray, optional): (N, W, H) mine positions. When given,
+                they are used as is instead of placing mines on the first move.
+            first_game_id (int): Game id of the first game, selects the
+                seeds of the mines when the configuration has one.
+
+        Raises:
+            ValueError: if mines does not have the shape of the batch.
+        """
+        if np is None:
+            raise ImportError('numpy is required for BatchGame')
+        self.config = config
+        self.width = config.width
+        self.height = config.height
+        self.num_mines = config.num_mines
+        self.num_games = num_games
+        self.first_game_id = first_game_id
+        shape = (num_games, self.width, self.height)
+        self.exposed = np.zeros(shape, dtype=np.bool_)
+        self.counts = np.zeros(shape, dtype=np.int8)
+        self.status = np.full(num_games, PLAYING, dtype=np.int8)
+        self.num_moves = np.zeros(num_games, dtype=np.int32)
+        self._num_exposed = np.zeros(num_games, dtype=np.int32)
+        self._num_safe_squares = self.width * self.height - self.num_mines
+        self._neighbors = neighbors.neighbor_table(self.width, self.height)
+        if mines is not None:
+            self.mines = np.array(mines, dtype=np.bool_)
+            if self.mines.shape != shape:
+                raise ValueError('Mines of shape {} do not match {} games of {}x{}'.format(
+                    self.mines.shape, num_games, self.width, self.height))
+            self.counts = _neighbor_counts(self.mines)
+            self._placed = np.ones(num_games, dtype=np.bool_)
+        else:
+            self.mines = np.zeros(shape, dtype=np.bool_)
+            self._placed = np.zeros(num_games, dtype=np.bool_)
+
+    @property
+    def game_over(self):
+        """bool: Are all games over"""
+        return not (self.status == PLAYING).any()
+
+    @property
+    def state(self):
+        """ndarray: (N, W, H) boards from the players' perspective, UNEXPOSED or counts"""
+        return np.where(self.exposed, self.counts, np.int8(UNEXPOSED))
+
+    def results(self):
+        """list: GameResult of every game"""
+        if not self.game_over:
+            raise ValueError('Games are not over')
+        return [GameResult(status == VICTORY, int(num_moves))
+                for status, num_moves in zip(self.status.tolist(), self.num_moves.tolist())]
+
+    def select(self, xs, ys):
+        """Select one square in every game that is still playing
+
+        Args:
+            xs (ndarray): Zero-based x position for each game.
+            ys (ndarray): Zero-based y position for each game.
+
+        Returns:
+            BatchMoveResult: Status of every game and the squares exposed.
+
+        Raises:
+            ValueError: if a playing game selects a square off the board or
+                one already exposed.
+        """
+        xs = np.asarray(xs, dtype=np.intp)
+        ys = np.asarray(ys, dtype=np.intp)
+        if xs.shape != (self.num_games,) or ys.shape != (self.num_games,):
+            raise ValueError('Expected {} moves'.format(self.num_games))
+        games = np.flatnonzero(self.status == PLAYING)
+        xs, ys = xs[games], ys[games]
+        if ((xs < 0) | (xs >= self.width) | (ys < 0) | (ys >= self.height)).any():
+            raise ValueError('Position off the board')
+        if self.exposed[games, xs, ys].any():
+            raise ValueError('Square has already been exposed')
+
+        first = ~self._placed[games]
+        if first.any():
+            self._place_mines(games[first], xs[first], ys[first])
+        self.num_moves[games] += 1
+
+        hit = self.mines[games, xs, ys]
+        self.status[games[hit]] = DEFEAT
+        games, xs, ys = games[~hit], xs[~hit], ys[~hit]
+        revealed = np.zeros(self.exposed.shape, dtype=np.bool_)
+        revealed[games, xs, ys] = True
+
+        # grow the openings of all games that selected a zero square at once
+        zero = self.counts[games, xs, ys] == 0
+        flooding = games[zero]
+        if len(flooding):
+            region = revealed[flooding]
+            expandable = self.counts[flooding] == 0
+            blocked = self.exposed[flooding]
+            frontier = region
+            while True:
+                grown = _dilate(frontier & expandable) & ~region & ~blocked
+                if not grown.any():
+                    break
+                region |= grown
+                frontier = grown
+            revealed[flooding] = region
+
+        self.exposed |= revealed
+        self._num_exposed[games] += revealed[games].sum(axis=(1, 2), dtype=np.int32)
+        self.status[games[self._num_exposed[games] == self._num_safe_squares]] = VICTORY
+        return BatchMoveResult(self.status.copy(), revealed)
+
+    def _place_mines(self, games, xs, ys):
+        """Place the mines of the given games around their first moves"""
+        height = self.height
+        flat = self.mines.reshape(self.num_games, -1)
+        if self.config.seed is None:
+            self._place_mines_numpy(flat, games, xs * height + ys)
+            return
+        for game, x, y in zip(games.tolist(), xs.tolist(), ys.tolist()):
+            index = x * height + y
+            excludes = [index]
+            if self.config.safe_zone == SAFE_ZONE_OPENING:
+                excludes.extend(self._neighbors.neighbors(index))
+            rng = self.config.rng(self.first_game_id + game, 'board')
+            flat[game, _sample_mines(rng, self.width * height, self.num_mines, excludes)] = True
+        self.counts[games] = _neighbor_counts(self.mines[games])
+        self._placed[games] = True
+
+    def _place_mines_numpy(self, flat, games, indices):
+        """Place mines by taking the num_mines smallest of random keys per board"""
+        rng = np.random.default_rng(random.getrandbits(64))
+        keys = rng.random((len(games), self.width * self.height))
+        rows = np.arange(len(games))
+        keys[rows, indices] = 2.0
+        if self.config.safe_zone == SAFE_ZONE_OPENING:
+            indptr = np.frombuffer(self._neighbors.indptr, dtype=np.int32)
+            neighbor_indices = np.frombuffer(self._neighbors.indices, dtype=np.int32)
+            starts, degree = indptr[indices], indptr[indices + 1] - indptr[indices]
+            for offset in range(8):
+                # the offset-th neighbor of each first move, where there is one
+                has = degree > offset
+                keys[rows[has], neighbor_indices[starts[has] + offset]] = 2.0
+        if self.num_mines:
+            chosen = np.argpartition(keys, self.num_mines - 1, axis=1)[:, :self.num_mines]
+            flat[games[:, None], chosen] = True
+        self.counts[games] = _neighbor_counts(self.mines[games])
+        self._placed[games] = True
+
+
+class BatchAI(abc.ABC):
+    """AI that picks one move for every game of a BatchGame at once"""
+
+    @abc.abstractmethod
+    def reset(self, config, num_games):
+        """Reset the AI to play a new batch
+
+        Args:
+            config (GameConfig): game configuration
+            num_games (int): number of games in the batch
+        """
+
+    @abc.abstractmethod
+    def next(self):
+        """Get the next move of every game
+
+        Returns:
+            tuple: arrays of the x and y positions, one per game. Moves of
+            games that are over are ignored.
+        """
+
+    @abc.abstractmethod
+    def update(self, result):
+        """Notify the AI of the result of the previous move
+
+        Args:
+            result (BatchMoveResult): Status and exposed squares
+        """
+
+
+class RandomBatchAI(BatchAI):
+    """Picks a random unexposed square in every game, like RandomAI"""
+    def __init__(self):
+        self.height = 0
+        self.exposed = None
+        self.playing = None
+        self.rng = None
+
+    def reset(self, config, num_games):
+        self.exposed = np.zeros((num_games, config.width * config.height), dtype=np.bool_)
+        self.playing = np.arange(num_games)
+        self.height = config.height
+        self.rng = np.random.default_rng(config.rng(0, 'batch_ai').getrandbits(64))
+
+    def next(self):
+        # only draw keys for the games that are still playing
+        keys = self.rng.random((len(self.playing), self.exposed.shape[1]))
+        keys[self.exposed[self.playing]] = -1.0
+        positions = np.zeros(len(self.exposed), dtype=np.intp)
+        positions[self.playing] = keys.argmax(axis=1)
+        return np.divmod(positions, self.height)
+
+    def update(self, result):
+        self.exposed |= result.revealed.reshape(self.exposed.shape)
+        self.playing = np.flatnonzero(result.status == PLAYING)
+
+
+class BatchRunner:
+    """Batch runner as iterator, one lockstep move per step
+
+    Attributes:
+        game (BatchGame): Minesweeper games
+        ai (BatchAI): Minesweeper AI
+    """
+    def __init__(self, game, ai):
+        self.game = game
+        self.ai = ai
+
+    def __iter__(self):
+        """Returns an iterator"""
+        return self
+
+    def __next__(self):
+        """Advances every game that is not over one move"""
+        if self.game.game_over:
+            raise StopIteration()
+        xs, ys = self.ai.next()
+        result = self.game.select(xs, ys)
+        self.ai.update(result)
+        return result
+
+
+def run_batch(config, ai, num_games, first_game_id=0):
+    """ Play num_games games in lockstep to evaluate a BatchAI
+
+    Args:
+        config (GameConfig): Parameters of the games.
+        ai (BatchAI): The AI
+        num_games (int): Number of games.
+        first_game_id (int): Game id of the first game.
+
+    Returns:
+        list: GameResult of every game
+    """
+    ai.reset(config, num_games)
+    game = BatchGame(config, num_games, first_game_id=first_game_id)
+    for _ in BatchRunner(game, ai):
+        pass
+    return game.results()
+
+
+def _neighbor_counts(mines):
+    """Neighbor counts of a stack of boards, -1 on the mines"""
+    num_games, width, height = mines.shape
+    padded = np.zeros((num_games, width + 2, height + 2), dtype=np.int8)
+    padded[:, 1:-1, 1:-1] = mines
+    counts = np.zeros(mines.shape, dtype=np.int8)
+    for dx in range(3):
+        for dy in range(3):
+            if dx != 1 or dy != 1:
+                counts += padded[:, dx:dx + width, dy:dy + height]
+    counts[mines] = -1
+    return counts
+
+
+def _dilate(mask):
+    """Squares of a stack of boards that are in mask or next to it"""
+    rows = mask.copy()
+    rows[:, 1:, :] |= mask[:, :-1, :]
+    rows[:, :-1, :] |= mask[:, 1:, :]
+    result = rows.copy()
+    result[:, :, 1:] |= rows[:, :, :-1]
+    result[:, :, :-1] |= rows[:, :, 1:]
+    return result
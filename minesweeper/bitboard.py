@@ -0,0 +1,218 @@
+"""Bitboard game engine for small and medium boards
+
+BitboardGame keeps the mines and the exposed squares of a board in one
+Python int each. Bit x * (height + 1) + y is square (x, y). The extra bit
+at the end of every column is always clear, so a shift by one row lands
+there instead of in the next column and is masked off. Neighbor counts are
+added up as four bit planes with eight shifted copies of the mines, and an
+opening grows by dilating its zero squares one step at a time. A move costs
+a few big-int operations per step instead of a Python loop over squares.
+
+Game(config) returns a BitboardGame when config.board_type is 'bitboard'.
+The engine does not index openings, so index_openings has no effect.
+"""
+import array
+
+from . import board
+from .minesweeper import Game, Reveal, _sample_mines
+
+# hex digit of a nibble spread count -> count
+_HEX_COUNTS = bytes.maketrans(b'012345678', bytes(range(9)))
+
+
+class BitGrid:
+    """Read only [x][y] view of a bitboard of a game
+
+    Attributes:
+        width (int): Number of columns.
+        height (int): Number of rows.
+    """
+    __slots__ = ('_game', '_name', 'width', 'height')
+
+    def __init__(self, game, name):
+        self._game = game
+        self._name = name
+        self.width = game.width
+        self.height = game.height
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.width:
+            raise IndexError('column {} is outside the board'.format(x))
+        return _BitColumn(getattr(self._game, self._name) >> (x * self._game._stride), self.height)
+
+    def __len__(self):
+        return self.width
+
+    def __iter__(self):
+        return (self[x] for x in range(self.width))
+
+    def __eq__(self, other):
+        if isinstance(other, BitGrid):
+            other = other.tolist()
+        return self.tolist() == other
+
+    def tolist(self):
+        """list: Copy of the grid as a 2d list of lists"""
+        return [column.tolist() for column in self]
+
+
+class _BitColumn:
+    """Column of a BitGrid, the bits of the column start at bit 0"""
+    __slots__ = ('_bits', '_height')
+
+    def __init__(self, bits, height):
+        self._bits = bits
+        self._height = height
+
+    def __getitem__(self, y):
+        if not 0 <= y < self._height:
+            raise IndexError('row {} is outside the board'.format(y))
+        return bool(self._bits >> y & 1)
+
+    def __len__(self):
+        return self._height
+
+    def tolist(self):
+        bits = self._bits
+        return [bool(bits >> y & 1) for y in range(self._height)]
+
+
+class CountGrid(BitGrid):
+    """Read only [x][y] view of the neighbor counts of a game, -1 on the mines"""
+    __slots__ = ()
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.width:
+            raise IndexError('column {} is outside the board'.format(x))
+        return _CountColumn(self._game, x * self._game._stride, self.height)
+
+
+class _CountColumn:
+    """Column of a CountGrid, reads the counts of the game on every access"""
+    __slots__ = ('_game', '_start', '_height')
+
+    def __init__(self, game, start, height):
+        self._game = game
+        self._start = start
+        self._height = height
+
+    def __getitem__(self, y):
+        if not 0 <= y < self._height:
+            raise IndexError('row {} is outside the board'.format(y))
+        index = self._start + y
+        return -1 if self._game._mines >> index & 1 else self._game._counts[index]
+
+    def __len__(self):
+        return self._height
+
+    def tolist(self):
+        return [self[y] for y in range(self._height)]
+
+
+class BitboardGame(Game):
+    """Minesweeper game engine on bitboards
+
+    Has the attributes and methods of Game. mines and exposed are read only
+    BitGrid views and counts is a read only CountGrid view.
+    """
+    def _init_board(self, mines):
+        self._stride = self.height + 1
+        self._size = self.width * self._stride
+        column = (1 << self.height) - 1
+        self._valid = sum(column << (x * self._stride) for x in range(self.width))
+        self._mines = 0
+        self._exposed = 0
+        # non-mine squares without neighboring mines
+        self._zero = 0
+        # neighboring mines by bit index
+        self._counts = bytes(self._size)
+        self.mines = BitGrid(self, '_mines')
+        self.exposed = BitGrid(self, '_exposed')
+        self.counts = CountGrid(self, '_counts')
+        if mines is not None:
+            rows = board._as_lists(mines)
+            self._set_mines([x * self.height + y for x in range(self.width)
+                             for y in range(self.height) if rows[x][y]])
+
+    def _set_mines(self, locations):
+        """Set the mines from flat indices x * height + y"""
+        bits = bytearray((self._size + 7) // 8)
+        height, stride = self.height, self._stride
+        for index in locations:
+            x, y = divmod(index, height)
+            bit = x * stride + y
+            bits[bit >> 3] |= 1 << (bit & 7)
+        self._mines = int.from_bytes(bits, 'little')
+
+    def _place_mines(self, excludes=()):
+        """Places num_mines mines uniformly at random, like Game"""
+        self._set_mines(_sample_mines(self.rng, self.width * self.height, self.num_mines, excludes))
+
+    def _spread(self, bits):
+        """The squares of bits and their neighbors"""
+        valid, stride = self._valid, self._stride
+        column = (bits | bits << 1 | bits >> 1) & valid
+        return (column | column << stride | column >> stride) & valid
+
+    def _init_counts(self):
+        """Add up the neighboring mines of every square as four bit planes"""
+        mines, valid, stride = self._mines, self._valid, self._stride
+        planes = [0, 0, 0, 0]
+        for shift in (1, stride - 1, stride, stride + 1):
+            for addend in (mines << shift & valid, mines >> shift & valid):
+                # ripple carry add of one bit per square
+                for i in range(4):
+                    if not addend:
+                        break
+                    planes[i], addend = planes[i] ^ addend, planes[i] & addend
+        # spread each plane to one bit per hex digit, then read the digits
+        nibbles = 0
+        for i, plane in enumerate(planes):
+            nibbles |= int(format(plane, 'b'), 16) << i
+        self._counts = format(nibbles, '0{}x'.format(self._size))[::-1].encode().translate(_HEX_COUNTS)
+        self._zero = valid & ~mines & ~(planes[0] | planes[1] | planes[2] | planes[3])
+
+    def _update(self, x, y):
+        """Update the state of the game
+
+        A zero square grows its opening one ring of neighbors per step while
+        the ring has zero squares that were not exposed before.
+        Returns a Reveal with the exposed squares, the selected one first.
+        """
+        stride, height = self._stride, self.height
+        index = x * stride + y
+        bit = 1 << index
+        count = -1 if self._mines & bit else self._counts[index]
+        revealed = Reveal(array.array('i', [x]), array.array('i', [y]), array.array('b', [count]))
+        self._state[x * height + y] = count
+        before = self._exposed
+        self._exposed = before | bit
+        self._num_exposed_squares += 1
+        if count < 0:
+            self._explosion = True
+        elif count == 0:
+            expandable = self._zero & ~before
+            region = frontier = bit
+            while frontier:
+                grown = self._spread(frontier) & ~region & ~before
+                region |= grown
+                frontier = grown & expandable
+            self._exposed = before | region
+            xs, ys, values = revealed
+            counts, state = self._counts, self._state
+            digits = format(region ^ bit, 'b')[::-1]
+            new = digits.find('1')
+            while new >= 0:
+                new_x, new_y = divmod(new, stride)
+                xs.append(new_x)
+                ys.append(new_y)
+                values.append(counts[new])
+                state[new_x * height + new_y] = counts[new]
+                new = digits.find('1', new + 1)
+            self._num_exposed_squares += len(xs) - 1
+        return revealed
+
+    def double_check_mine_counts(self) -> bool:
+        """Recalculates the neighboring mine counts and compares them to the board"""
+        expected = board.neighbor_counts(self.mines.tolist(), self.width, self.height)
+        return board.grids_equal(expected, self.counts)
@@ -0,0 +1,229 @@
+"""Board storage backends for the game engine
+
+The default layout is a 2d list of lists. The compact layouts keep a whole
+board in a single contiguous buffer in column-major order, so the flat index
+of square (x, y) is ``x * height + y``, and still support ``[x][y]`` indexing.
+The bitboard layout has its own engine, see bitboard.BitboardGame.
+"""
+import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+BOARD_LIST = 'list'
+BOARD_ARRAY = 'array'
+BOARD_NUMPY = 'numpy'
+BOARD_BITBOARD = 'bitboard'
+BOARD_TYPES = (BOARD_LIST, BOARD_ARRAY, BOARD_NUMPY, BOARD_BITBOARD)
+
+
+class Grid:
+    """Compact 2d grid stored in a flat ``array.array``
+
+    Indexing with ``grid[x]`` returns a writable memoryview of column x so
+    ``grid[x][y]`` reads and writes a single byte of the shared buffer.
+
+    Attributes:
+        width (int): Number of columns.
+        height (int): Number of rows.
+        flat (array.array): Column-major backing buffer.
+    """
+    def __init__(self, width, height, typecode='b'):
+        self.width = width
+        self.height = height
+        self.flat = array.array(typecode, bytes(width * height))
+        view = memoryview(self.flat)
+        self._columns = [view[x * height:(x + 1) * height] for x in range(width)]
+
+    def __getitem__(self, x):
+        return self._columns[x]
+
+    def __len__(self):
+        return self.width
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __eq__(self, other):
+        if isinstance(other, Grid):
+            return self.width == other.width and self.height == other.height and self.flat == other.flat
+        return self.tolist() == other
+
+    def tolist(self):
+        """list: Copy of the grid as a 2d list of lists"""
+        return [column.tolist() for column in self._columns]
+
+
+def make_grid(board_type, width, height, signed=False):
+    """Allocate a zeroed width x height grid
+
+    Args:
+        board_type (str): One of BOARD_TYPES.
+        width (int): Width of the board.
+        height (int): Height of the board.
+        signed (bool): Whether the grid holds small signed integers (counts)
+            instead of booleans.
+
+    Returns:
+        A grid supporting [x][y] indexing.
+    """
+    if board_type == BOARD_LIST:
+        fill = 0 if signed else False
+        return [[fill for y in range(height)] for x in range(width)]
+    if board_type == BOARD_ARRAY:
+        return Grid(width, height, 'b' if signed else 'B')
+    if board_type == BOARD_NUMPY:
+        if np is None:
+            raise ImportError('numpy is required for the numpy board type')
+        return np.zeros((width, height), dtype=np.int8 if signed else np.bool_)
+    raise ValueError('Unknown board type {!r}'.format(board_type))
+
+
+def copy_grid(board_type, source, width, height, signed=False):
+    """Copy a grid of any layout into a new grid of the requested layout
+
+    Args:
+        board_type (str): One of BOARD_TYPES.
+        source: Grid with [x][y] indexing (list of lists, Grid or ndarray).
+        width (int): Width of the board.
+        height (int): Height of the board.
+        signed (bool): Whether the grid holds counts instead of booleans.
+
+    Returns:
+        A new grid that does not share memory with source.
+    """
+    if board_type == BOARD_LIST:
+        if signed:
+            return [[int(source[x][y]) for y in range(height)] for x in range(width)]
+        return [[bool(source[x][y]) for y in range(height)] for x in range(width)]
+    if board_type == BOARD_NUMPY:
+        if np is None:
+            raise ImportError('numpy is required for the numpy board type')
+        if isinstance(source, Grid):
+            source = source.tolist()
+        return np.array(source, dtype=np.int8 if signed else np.bool_).reshape(width, height)
+    grid = make_grid(board_type, width, height, signed)
+    for x in range(width):
+        column = grid[x]
+        for y, value in enumerate(source[x]):
+            column[y] = int(value)
+    return grid
+
+
+def columns(grid):
+    """Get fast per-column accessors for a grid of any layout
+
+    Indexing a numpy array one element at a time is slow, so numpy columns are
+    wrapped in memoryviews. The accessors share memory with the grid.
+
+    Args:
+        grid: Grid with [x][y] indexing.
+
+    Returns:
+        list: Objects indexed by y, one per column x.
+    """
+    if np is not None and isinstance(grid, np.ndarray):
+        return [memoryview(column) for column in grid]
+    return list(grid)
+
+
+def set_flat(grid, height, indices, value=True):
+    """Set the squares at the given flat indices of a grid of any layout
+
+    Args:
+        grid: Grid with [x][y] indexing.
+        height (int): Height of the board.
+        indices (list): Flat indices x * height + y.
+        value: Value to store.
+    """
+    if isinstance(grid, Grid):
+        flat = grid.flat
+        for index in indices:
+            flat[index] = value
+    elif np is not None and isinstance(grid, np.ndarray):
+        grid.reshape(-1)[np.asarray(indices, dtype=np.intp)] = value
+    else:
+        for index in indices:
+            x, y = divmod(index, height)
+            grid[x][y] = value
+
+
+def grids_equal(first, second):
+    """bool: Do two grids of any layout hold the same values"""
+    if np is not None and (isinstance(first, np.ndarray) or isinstance(second, np.ndarray)):
+        return bool(np.array_equal(_as_ndarray(first), _as_ndarray(second)))
+    return _as_lists(first) == _as_lists(second)
+
+
+def neighbor_counts(mines, width, height, board_type=BOARD_LIST):
+    """Count the mines around every square of a board
+
+    Uses eight shifted adds over a padded numpy array when numpy is
+    installed and a separable 3x3 box sum in pure Python otherwise.
+
+    Args:
+        mines: Grid of mine locations in any layout.
+        width (int): Width of the board.
+        height (int): Height of the board.
+        board_type (str): Layout of the returned grid.
+
+    Returns:
+        A grid of neighbor counts with -1 on the mines.
+    """
+    if np is not None:
+        counts = _counts_numpy(mines, width, height)
+        if board_type == BOARD_NUMPY:
+            return counts
+        if board_type == BOARD_LIST:
+            return counts.tolist()
+        grid = make_grid(board_type, width, height, signed=True)
+        grid.flat[:] = array.array('b', counts.tobytes())
+        return grid
+    counts = _counts_python(mines, width, height)
+    if board_type == BOARD_LIST:
+        return counts
+    return copy_grid(board_type, counts, width, height, signed=True)
+
+
+def _as_lists(grid):
+    return grid if isinstance(grid, list) else grid.tolist()
+
+
+def _as_ndarray(grid):
+    if isinstance(grid, Grid):
+        return np.frombuffer(grid.flat, dtype=grid.flat.typecode).reshape(grid.width, grid.height)
+    if not isinstance(grid, (list, np.ndarray)):
+        grid = grid.tolist()
+    return np.asarray(grid)
+
+
+def _counts_numpy(mines, width, height):
+    padded = np.zeros((width + 2, height + 2), dtype=np.int8)
+    padded[1:-1, 1:-1] = _as_ndarray(mines)
+    counts = np.zeros((width, height), dtype=np.int8)
+    for dx in range(3):
+        for dy in range(3):
+            if dx != 1 or dy != 1:
+                counts += padded[dx:dx + width, dy:dy + height]
+    counts[padded[1:-1, 1:-1] != 0] = -1
+    return counts
+
+
+def _counts_python(mines, width, height):
+    # sum each column over y-1..y+1, then add up three neighboring columns
+    columns = []
+    for x in range(width):
+        column = [1 if m else 0 for m in mines[x]]
+        padded = [0] + column + [0]
+        columns.append([padded[y] + padded[y + 1] + padded[y + 2] for y in range(height)])
+    empty = [0] * height
+    counts = []
+    for x in range(width):
+        left = columns[x - 1] if x > 0 else empty
+        right = columns[x + 1] if x + 1 < width else empty
+        own = mines[x]
+        counts.append([-1 if own[y] else left[y] + columns[x][y] + right[y]
+                       for y in range(height)])
+    return counts
@@ -0,0 +1,176 @@
+"""Pre-generated boards stored in a compact binary file
+
+A corpus lets every AI play exactly the same boards and skips mine placement
+while playing. The file is a 32 byte header followed by one fixed size record
+per board:
+
+    header: magic b'MSBOARDS', format version (uint16), width, height,
+            num_mines, num_boards (uint32), board type, safe zone and
+            index_openings codes (uint8), 3 bytes padding
+    record: first move x, y (uint16), then the mines as one bit per square
+            in flat index order x * height + y, least significant bit first
+
+All numbers are little endian. The boards were generated to be safe around
+the first move, so the runner plays it before handing over to the AI.
+
+Corpus memory maps the file and only unpacks the records that are read.
+"""
+import mmap
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+from . import board
+from .minesweeper import Game, GameConfig, SAFE_ZONE_SQUARE, SAFE_ZONE_OPENING
+
+MAGIC = b'MSBOARDS'
+VERSION = 1
+_HEADER = struct.Struct('<8sH4I3B3x')
+_FIRST_MOVE = struct.Struct('<HH')
+_SAFE_ZONES = (SAFE_ZONE_SQUARE, SAFE_ZONE_OPENING)
+
+
+def record_size(width, height):
+    """Bytes per board in a corpus of width x height boards"""
+    return _FIRST_MOVE.size + (width * height + 7) // 8
+
+
+def write_corpus(path, config, num_boards):
+    """Generate num_boards boards and write them to path
+
+    The first move of board i is drawn from the 'first_move' stream of the
+    configuration, and the mines are the ones Game(config, game_id=i) places
+    for that move. A seeded configuration always produces the same corpus.
+
+    Args:
+        path (str): File to write.
+        config (GameConfig): Parameters of the boards.
+        num_boards (int): Number of boards.
+    """
+    width, height = config.width, config.height
+    if width > 0xffff or height > 0xffff:
+        raise ValueError('Board size {}x{} is too large for a corpus'.format(width, height))
+    header = _HEADER.pack(MAGIC, VERSION, width, height, config.num_mines, num_boards,
+                          board.BOARD_TYPES.index(config.board_type),
+                          _SAFE_ZONES.index(config.safe_zone), bool(config.index_openings))
+    with open(path, 'wb') as f:
+        f.write(header)
+        for game_id in range(num_boards):
+            rng = config.rng(game_id, 'first_move')
+            x, y = rng.randrange(width), rng.randrange(height)
+            game = Game(config, game_id=game_id)
+            game._place_mines(game._safe_zone(x, y))
+            f.write(_FIRST_MOVE.pack(x, y))
+            f.write(_pack(game.mines, width, height))
+
+
+class Corpus:
+    """Read only, memory mapped view of a corpus file
+
+    Pickling a Corpus only sends its path, so worker processes map the file
+    themselves instead of receiving the boards.
+
+    Attributes:
+        path (str): The corpus file.
+        config (GameConfig): Parameters of the boards from the header.
+        num_boards (int): Number of boards.
+
+    Raises:
+        ValueError: if the file is not a corpus or is truncated.
+    """
+    def __init__(self, path, board_type=None):
+        """
+        Args:
+            path (str): The corpus file.
+            board_type (str, optional): Board layout of the games, overrides
+                the one in the header.
+        """
+        self.path = path
+        self._board_type = board_type
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        if len(self._buffer) < _HEADER.size:
+            self.close()
+            raise ValueError('{} is not a board corpus'.format(path))
+        magic, version, width, height, num_mines, num_boards, board_code, zone_code, index_openings = \
+            _HEADER.unpack_from(self._buffer)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError('{} is not a version {} board corpus'.format(path, VERSION))
+        self.config = GameConfig(width, height, num_mines,
+                                 board_type=board_type or board.BOARD_TYPES[board_code],
+                                 safe_zone=_SAFE_ZONES[zone_code], index_openings=bool(index_openings))
+        self.num_boards = num_boards
+        self._record_size = record_size(width, height)
+        if len(self._buffer) < _HEADER.size + num_boards * self._record_size:
+            self.close()
+            raise ValueError('{} is truncated'.format(path))
+
+    def __len__(self):
+        return self.num_boards
+
+    def __reduce__(self):
+        return Corpus, (self.path, self._board_type)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._buffer.release()
+        self._mmap.close()
+
+    def _record(self, index):
+        if not 0 <= index < self.num_boards:
+            raise IndexError('Board {} is not in a corpus of {}'.format(index, self.num_boards))
+        start = _HEADER.size + index * self._record_size
+        return self._buffer[start:start + self._record_size]
+
+    def first_move(self, index):
+        """The x,y position the board was generated to be safe around"""
+        return _FIRST_MOVE.unpack_from(self._record(index))
+
+    def mines(self, index):
+        """Mine grid of one board, a numpy array or lists of lists without numpy"""
+        mines = _unpack(self._record(index)[_FIRST_MOVE.size:], self.config.width, self.config.height)
+        if np is not None and self.config.board_type == board.BOARD_LIST:
+            return mines.tolist()
+        return mines
+
+    def game(self, index):
+        """A new Game on board index"""
+        return Game(self.config, self.mines(index), game_id=index)
+
+    def check(self, config):
+        """Raise ValueError unless config describes the boards of this corpus"""
+        if (config.width, config.height, config.num_mines) != \
+                (self.config.width, self.config.height, self.config.num_mines):
+            raise ValueError('Corpus {} has {}x{} boards with {} mines'.format(
+                self.path, self.config.width, self.config.height, self.config.num_mines))
+
+
+def _pack(mines, width, height):
+    if np is not None:
+        bits = board._as_ndarray(mines).astype(np.bool_).reshape(-1)
+        return np.packbits(bits, bitorder='little').tobytes()
+    value = 0
+    for x in range(width):
+        column = mines[x]
+        for y in range(height):
+            if column[y]:
+                value |= 1 << (x * height + y)
+    return value.to_bytes((width * height + 7) // 8, 'little')
+
+
+def _unpack(data, width, height):
+    if np is not None:
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=width * height, bitorder='little')
+        return bits.view(np.bool_).reshape(width, height)
+    value = int.from_bytes(data, 'little')
+    return [[bool(value >> (x * height + y) & 1) for y in range(height)] for x in range(width)]
@@ -0,0 +1,64 @@
+"""Hot path instrumentation
+
+Game and Runner report each move as a structured event instead of
+formatting log messages. Events are only built while a hook is registered;
+otherwise the cost per move is a check of the module-level ``enabled`` flag.
+
+Events and their fields:
+    'select': x, y, revealed (Reveal), status (GameStatus)
+    'move': x, y, result (MoveResult)
+    'game_over': x, y, status (GameStatus), num_moves
+"""
+import logging
+
+hooks = []
+enabled = False
+
+
+def add_hook(hook):
+    """Register a hook
+
+    Args:
+        hook (callable): Called as hook(event, **fields) for every event.
+    """
+    global enabled
+    hooks.append(hook)
+    enabled = True
+
+
+def remove_hook(hook):
+    """Unregister a hook added with add_hook"""
+    global enabled
+    hooks.remove(hook)
+    enabled = bool(hooks)
+
+
+def emit(event, **fields):
+    """Send an event to all hooks. Callers check enabled first."""
+    for hook in hooks:
+        hook(event, **fields)
+
+
+class LogHook:
+    """Hook that writes events as log messages
+
+    Attributes:
+        logger (logging.Logger): Destination logger.
+        level (int): Log level of the messages.
+    """
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def __call__(self, event, **fields):
+        if not self.logger.isEnabledFor(self.level):
+            return
+        if event == 'select':
+            self.logger.log(self.level, "(%d, %d) revealed %d squares, %s",
+                            fields['x'], fields['y'], len(fields['revealed'].xs), fields['status'].name)
+        elif event == 'move':
+            self.logger.log(self.level, "Move (%d, %d): %s",
+                            fields['x'], fields['y'], fields['result'].status.name)
+        elif event == 'game_over':
+            self.logger.log(self.level, "Game over after %d moves, last move (%d, %d): %s",
+                            fields['num_moves'], fields['x'], fields['y'], fields['status'].name)
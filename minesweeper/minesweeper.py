@@ -1,15 +1,27 @@
 import abc
-import copy
+import array
+import collections
+import collections.abc
 import enum
 import itertools
 import logging
+import pickle
 import random
+import uuid
 import concurrent.futures
 
-from typing import List, Tuple, Set
+from typing import List
+
+from . import board, instrument, neighbors, pool
 
 logger = logging.getLogger(__name__)
 
+# value of unexposed squares in Game.state_view
+UNEXPOSED = -2
+
+SAFE_ZONE_SQUARE = 'square'
+SAFE_ZONE_OPENING = 'opening'
+
 
 class GameConfig:
     """Minesweeper game configuration
@@ -18,11 +30,74 @@ class GameConfig:
         width (int): Width of the board.
         height (int): Height of the board.
         num_mines (int): Number of mines for the game.
+        board_type (str): Storage layout of the board: 'list' (2d lists),
+            'array' (compact byte buffer), 'numpy' (requires numpy) or
+            'bitboard' (one int per grid, played by BitboardGame).
+        safe_zone (str): Squares kept free of mines on the first move:
+            'square' for the selected square only or 'opening' for the
+            selected square and its neighbors, which guarantees an opening.
+        index_openings (bool): Label every zero region and its border once
+            the mines are placed so that selecting a zero square exposes its
+            region from the index without searching.
+        seed (int, optional): Master seed. When set, every game draws its
+            mines and its AI's moves from generators seeded with it and the
+            game id, so any game of a run can be replayed. Otherwise they use
+            the random module.
+
+    Raises:
+        ValueError: if the size is not positive, the mines do not fit next to
+            the safe zone, or the board type or safe zone is unknown.
     """
-    def __init__(self, width=8, height=8, num_mines=10):
+    __slots__ = ('width', 'height', 'num_mines', 'board_type', 'safe_zone', 'index_openings', 'seed')
+
+    def __init__(self, width=8, height=8, num_mines=10, board_type=board.BOARD_LIST,
+                 safe_zone=SAFE_ZONE_SQUARE, index_openings=False, seed=None):
+        if width < 1 or height < 1:
+            raise ValueError('Board size {}x{} must be positive'.format(width, height))
+        if board_type not in board.BOARD_TYPES:
+            raise ValueError('Unknown board type {!r}'.format(board_type))
+        if safe_zone == SAFE_ZONE_SQUARE:
+            zone_size = 1
+        elif safe_zone == SAFE_ZONE_OPENING:
+            zone_size = min(width, 3) * min(height, 3)
+        else:
+            raise ValueError('Unknown safe zone {!r}'.format(safe_zone))
+        if num_mines < 0 or num_mines > width * height - zone_size:
+            raise ValueError('{} mines do not fit on a {}x{} board with a {} safe zone'
+                             .format(num_mines, width, height, safe_zone))
         self.width = width
         self.height = height
         self.num_mines = num_mines
+        self.board_type = board_type
+        self.safe_zone = safe_zone
+        self.index_openings = index_openings
+        self.seed = seed
+
+    def rng(self, game_id, stream):
+        """Random number generator for one game
+
+        Args:
+            game_id (int): Index of the game in a run.
+            stream (str): What the numbers are for, 'board' for the mines and
+                'ai' for the player, so that the boards do not depend on how
+                many numbers the AI draws.
+
+        Returns:
+            random.Random seeded from seed, game_id and stream, or the random
+            module when seed is None.
+        """
+        if self.seed is None:
+            return random
+        return random.Random('{}:{}:{}'.format(self.seed, game_id, stream))
+
+
+def _sample_mines(rng, size, num_mines, excludes=()):
+    """Draw num_mines distinct flat indices below size, avoiding excludes"""
+    excludes = sorted(set(excludes))
+    locations = rng.sample(range(size - len(excludes)), num_mines)
+    for skip in excludes:
+        locations = [index + 1 if index >= skip else index for index in locations]
+    return locations
 
 
 class GameStatus (enum.Enum):
@@ -40,6 +115,8 @@ class GameResult:
         victory (bool): Whether the player won.
         num_moves (int): Number of moves in the game.
     """
+    __slots__ = ('victory', 'num_moves')
+
     def __init__(self, victory, num_moves):
         self.victory = victory
         self.num_moves = num_moves
@@ -52,6 +129,8 @@ class Square:
         y (int): Zero-based y position.
         num_mines (int): Number of mines in neighboring squares.
     """
+    __slots__ = ('x', 'y', 'num_mines')
+
     def __init__(self, x, y, num_mines):
         self.x = x
         self.y = y
@@ -69,16 +148,103 @@ class Square:
         return '({:d},{:d}:{:d})'.format(self.x, self.y, self.num_mines)
 
 
+Reveal = collections.namedtuple('Reveal', ['xs', 'ys', 'counts'])
+Reveal.__doc__ = """Squares exposed by a selection as parallel arrays
+
+Attributes:
+    xs (array.array): Zero-based x positions.
+    ys (array.array): Zero-based y positions.
+    counts (array.array): Number of mines in neighboring squares (-1 for a mine).
+"""
+
+
 class MoveResult:
     """Result of a square selection
 
     Attributes:
         status (GameStatus): Status of the current game.
         new_squares (set): The set of Square objects exposed by the selection.
+        revealed (Reveal): The exposed squares as parallel arrays, if available.
     """
-    def __init__(self, status, new_squares=()):
+    __slots__ = ('status', 'new_squares', 'revealed')
+
+    def __init__(self, status, new_squares=(), revealed=None):
         self.status = status
         self.new_squares = set(new_squares)
+        self.revealed = revealed
+
+
+class SquareColumns(collections.abc.Set):
+    """Read-only set of Square objects backed by a Reveal
+
+    Squares are created on demand while iterating. Membership tests build
+    a position index on first use.
+    """
+    __slots__ = ('_revealed', '_index')
+
+    def __init__(self, revealed):
+        self._revealed = revealed
+        self._index = None
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        return set(iterable)
+
+    def __len__(self):
+        return len(self._revealed.xs)
+
+    def __iter__(self):
+        return map(Square, *self._revealed)
+
+    def __contains__(self, square):
+        if not isinstance(square, Square):
+            return False
+        if self._index is None:
+            xs, ys, counts = self._revealed
+            self._index = dict(zip(zip(xs, ys), counts))
+        return self._index.get((square.x, square.y)) == square.num_mines
+
+
+class ColumnarMoveResult(MoveResult):
+    """Result of a square selection stored as parallel arrays
+
+    new_squares is a SquareColumns view over revealed instead of a set of
+    Square objects, so a large opening allocates three arrays rather than
+    one object per square.
+    """
+    __slots__ = ()
+
+    def __init__(self, status, revealed):
+        self.status = status
+        self.revealed = revealed
+        self.new_squares = SquareColumns(revealed)
+
+
+class StateView:
+    """Read-only live [x, y] view of the player's state of a game
+
+    Reads go straight to a memoryview of the game's state buffer, which
+    stays private so that the view cannot be written to.
+    """
+    __slots__ = ('_view',)
+
+    def __init__(self, view):
+        self._view = view
+
+    def __getitem__(self, position):
+        return self._view[position]
+
+    def __len__(self):
+        return len(self._view)
+
+    @property
+    def shape(self):
+        """tuple: width and height of the board"""
+        return self._view.shape
+
+    def tolist(self):
+        """list: Copy of the state as a 2d list of lists"""
+        return self._view.tolist()
 
 
 class Game:
@@ -91,37 +257,69 @@ class Game:
         height (int): Height of the board.
         num_mines (int): Number of mines.
         num_moves (int): Number of moves made by the player.
-        mines (list): 2d list of booleans indicating mine locations.
-        exposed (list): 2d list of booleans indicating exposed squares.
-        counts (list): 2d list of integer counts of neighboring mines.
+        mines (list): 2d grid of booleans indicating mine locations.
+        exposed (list): 2d grid of booleans indicating exposed squares.
+        counts (list): 2d grid of integer counts of neighboring mines.
+        game_id (int): Index of the game in a run.
+        rng: Random number generator for placing the mines.
+
+    The grids are lists of lists by default. With a compact board type
+    they are byte buffers or numpy arrays with the same [x][y] indexing.
+    The bitboard type creates a BitboardGame instead.
     """
 
-    def __init__(self, config, mines=None):
+    def __new__(cls, config=None, *args, **kwargs):
+        if cls is Game and config is not None and config.board_type == board.BOARD_BITBOARD:
+            from .bitboard import BitboardGame
+            cls = BitboardGame
+        return super().__new__(cls)
+
+    def __init__(self, config, mines=None, game_id=0):
         """
         Args:
             config (GameConfig): Configuration for this game.
-            mines (list, optional): Optional mine positions.
+            mines (list, optional): Optional mine positions. When given, they
+                are used as is instead of placing mines on the first move.
+            game_id (int): Index of the game, selects the seed of the mines
+                when the configuration has one.
         """
         self.width = config.width
         self.height = config.height
         self.num_mines = config.num_mines
+        self.safe_zone = config.safe_zone
+        self.index_openings = config.index_openings
+        self.game_id = game_id
+        self.rng = config.rng(game_id, 'board')
         self.num_moves = 0
         self._num_exposed_squares = 0
         self._explosion = False
         self._quit = False
         self._num_safe_squares = self.width * self.height - self.num_mines
-        self.exposed = [[False for y in range(self.height)] for x in range(self.width)]
-        self.counts = [[0 for y in range(self.height)] for x in range(self.width)]
+        self.board_type = config.board_type
+        # player's view of the board, kept up to date as squares are exposed
+        self._state = array.array('b', [UNEXPOSED]) * (self.width * self.height)
+        self._state_view = StateView(memoryview(self._state).cast('B').cast('b', [self.width, self.height]))
         self._flags = {}
         self._first_move = True
+        self._neighbors = neighbors.neighbor_table(self.width, self.height)
+        self._init_board(mines)
+        if mines is not None:
+            self._init_counts()
+            self._first_move = False
+        logger.info("Game initialized")
 
-        if mines:
-            self.mines = copy.deepcopy(mines)
+    def _init_board(self, mines):
+        """Create the grids of the engine, holding mines when given"""
+        self.exposed = board.make_grid(self.board_type, self.width, self.height)
+        self.counts = board.make_grid(self.board_type, self.width, self.height, signed=True)
+        self._exposed_columns = board.columns(self.exposed)
+        self._count_columns = board.columns(self.counts)
+        self._openings = []
+        self._opening_index = None
+        if mines is not None:
+            self.mines = board.copy_grid(self.board_type, mines, self.width, self.height)
         else:
-            self.mines = [[False for y in range(self.height)] for x in range(self.width)]
-        #     self._place_mines()
-        # self._init_counts()
-        logger.info("Game initialized")
+            self.mines = board.make_grid(self.board_type, self.width, self.height)
 
     @property
     def flags(self):
@@ -137,12 +335,28 @@ class Game:
         """list: 2d list of the state of the board from the player's perspective
 
         None means not exposed and the rest are counts of neighboring mines.
+        This builds a new list on every access; use state_view for polling.
         """
-        state = [[None for y in range(self.height)] for x in range(self.width)]
-        for x, y in itertools.product(range(self.width), range(self.height)):
-            if self.exposed[x][y]:
-                state[x][y] = self.counts[x][y]
-        return state
+        return [[None if value == UNEXPOSED else value for value in column]
+                for column in self._state_view.tolist()]
+
+    @property
+    def state_view(self):
+        """StateView: read-only live view of the board from the player's perspective
+
+        Indexed as view[x, y]. UNEXPOSED means not exposed and the rest are
+        counts of neighboring mines (-1 for an exploded mine). The view is
+        updated in place as squares are exposed.
+        """
+        return self._state_view
+
+    def snapshot(self):
+        """Copy the current player's view of the board
+
+        Returns:
+            memoryview: read-only copy indexed as [x, y] like state_view.
+        """
+        return memoryview(self._state.tobytes()).cast('b', [self.width, self.height])
 
     @property
     def status(self):
@@ -188,87 +402,179 @@ class Game:
         Raises:
             ValueError: if game over, squared already selected, or position off the board
         """
-        logger.info("Player has picked %d, %d", x, y)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Player has picked %d, %d", x, y)
         if self._is_outside_board(x, y):
             raise ValueError('Position ({},{}) is outside the board'.format(x, y))
         if self._explosion:
             raise ValueError('Game is already over')
-        if self.exposed[x][y]:
+        # the player's view is kept in step with exposed by every engine
+        if self._state[x * self.height + y] != UNEXPOSED:
             raise ValueError('Position already exposed')
         self.num_moves += 1
         
         if self._first_move:
-            self._place_mines({(x,y)})
+            self._place_mines(self._safe_zone(x, y))
             self._init_counts()
             self._first_move = False
         
         # must call update before accessing the status
-        squares = self._update(x, y)
-        logger.info("%d squares are revealed%s", len(squares), "" if len(squares)>1 else " -> "+str(squares[0].num_mines))
-        return MoveResult(self.status, squares)
-
-    def _place_mines(self, excludes: Set[Tuple[int, int]] = {}):
-        locations = set()
-        while len(locations) < self.num_mines:
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
-            if (x,y) not in excludes:
-                locations.add((x, y))
-        for location in locations:
-            self.mines[location[0]][location[1]] = True
+        revealed = self._update(x, y)
+        status = self.status
+        if instrument.enabled:
+            instrument.emit('select', x=x, y=y, revealed=revealed, status=status)
+        if logger.isEnabledFor(logging.INFO):
+            if len(revealed.xs) > 1:
+                logger.info("%d squares are revealed", len(revealed.xs))
+            else:
+                logger.info("1 squares are revealed -> %d", revealed.counts[0])
+        return ColumnarMoveResult(status, revealed)
+
+    def _safe_zone(self, x, y):
+        """Flat indices of the squares to keep free of mines on the first move"""
+        if self.safe_zone == SAFE_ZONE_OPENING:
+            return [x * self.height + y] + list(self._neighbors.neighbors(x * self.height + y))
+        return [x * self.height + y]
+
+    def _place_mines(self, excludes=()):
+        """Places num_mines mines uniformly at random
+
+        Samples the flat indices directly so the cost is O(num_mines) at any
+        density. Samples are drawn from the squares left after removing the
+        excluded ones and then shifted past each excluded index.
+
+        Args:
+            excludes (iterable): Flat indices that must not hold a mine.
+        """
+        locations = _sample_mines(self.rng, self.width * self.height, self.num_mines, excludes)
+        board.set_flat(self.mines, self.height, locations)
 
     def _init_counts(self):
         """Calculates how many neighboring squares have mines for all squares"""
-        for x, y in itertools.product(range(self.width), range(self.height)):
-            if self.mines[x][y]:
-                self.counts[x][y] = -1
-                continue
-            for dx, dy in itertools.product([-1, 0, 1], repeat=2):
-                if dx == 0 and dy == 0:
+        self.counts = board.neighbor_counts(self.mines, self.width, self.height, self.board_type)
+        self._count_columns = board.columns(self.counts)
+        if self.index_openings:
+            self._label_openings()
+
+    def _label_openings(self):
+        """Precompute the squares exposed by selecting each zero square
+
+        Every connected zero region is filled once on a scratch board. The
+        region and its border are stored as flat indices in _openings and
+        _opening_index maps each zero square to its region.
+        """
+        width, height = self.width, self.height
+        scratch = [bytearray(height) for _ in range(width)]
+        counts = self._count_columns
+        self._openings = []
+        self._opening_index = array.array('i', [-1]) * (width * height)
+        for x in range(width):
+            column_counts = counts[x]
+            for y in range(height):
+                if column_counts[y] != 0 or scratch[x][y]:
                     continue
-                if not self._is_outside_board(x + dx, y + dy):
-                    self.counts[x][y] += self.mines[x + dx][y + dy]
+                region = Reveal(array.array('i', [x]), array.array('i', [y]), array.array('b', [0]))
+                scratch[x][y] = True
+                self._flood_fill(x, y, region, scratch)
+                label = len(self._openings)
+                opening = array.array('i')
+                for new_x, new_y, count in zip(*region):
+                    opening.append(new_x * height + new_y)
+                    if count == 0:
+                        self._opening_index[new_x * height + new_y] = label
+                    else:
+                        # border squares can also border other regions
+                        scratch[new_x][new_y] = False
+                self._openings.append(opening)
 
     def _update(self, x, y):
         """Update the state of the game
 
         Finds all the squares to expose based on a selection.
-        This uses an 8 neighbor region growing algorithm to expand the board if
-        the chosen square is not a neighbor to a mine.
-        Returns a list of squares that have been exposed.
+        If the chosen square is not a neighbor to a mine, the connected region
+        of zero squares and its border are exposed with a scanline flood fill.
+        Returns a Reveal with the exposed squares, the selected one first.
         """
-        self._expose_square(x, y)
-        squares = [Square(x, y, self.counts[x][y])]
+        count = self._count_columns[x][y]
+        revealed = Reveal(array.array('i', [x]), array.array('i', [y]), array.array('b', [count]))
+        self._exposed_columns[x][y] = True
         if self.mines[x][y]:
             self._explosion = True
-            return squares
-        if self.counts[x][y] != 0:
-            return squares
+        elif count == 0 and self._opening_index is not None:
+            self._expose_opening(x, y, revealed)
+        elif count == 0:
+            self._flood_fill(x, y, revealed)
+        self._num_exposed_squares += len(revealed.xs)
+        state, height = self._state, self.height
+        for new_x, new_y, new_count in zip(*revealed):
+            state[new_x * height + new_y] = new_count
+        return revealed
+
+    def _expose_opening(self, x, y, revealed):
+        """Expose the precomputed region of the zero square (x, y)"""
+        height = self.height
+        exposed, counts = self._exposed_columns, self._count_columns
+        xs, ys, values = revealed
+        for index in self._openings[self._opening_index[x * height + y]]:
+            new_x, new_y = divmod(index, height)
+            column_exposed = exposed[new_x]
+            if not column_exposed[new_y]:
+                column_exposed[new_y] = True
+                xs.append(new_x)
+                ys.append(new_y)
+                values.append(counts[new_x][new_y])
+
+    def _flood_fill(self, x, y, revealed, exposed=None):
+        """Expose the zero region containing (x, y) and its border
+
+        Each step takes a zero square, grows it into the longest vertical run
+        of zero squares that are not done yet, and exposes the run with the
+        squares next to it in the three columns x-1, x and x+1. Newly exposed
+        zero squares in the side columns become seeds for later runs.
 
-        # When this square have 0 mine in its neighours, then all of these 8
-        # neighbors could be expanded safely. We do this in a BFS maner.
+        Args:
+            x (int): Zero-based x position of an exposed zero square.
+            y (int): Zero-based y position of an exposed zero square.
+            revealed (Reveal): Arrays that newly exposed squares are appended to.
+            exposed (list, optional): Columns of exposed flags to update
+                instead of the board's.
+        """
+        width, height = self.width, self.height
+        counts = self._count_columns
+        if exposed is None:
+            exposed = self._exposed_columns
+        xs, ys, values = revealed
+        # zero squares exposed in this fill whose run has not been processed
+        pending = {x * height + y}
         stack = [(x, y)]
-        while len(stack) > 0:
-            (x, y) = stack.pop()
-            for dx, dy in itertools.product([-1, 0, 1], repeat=2):
-                if dx == 0 and dy == 0:
-                    continue
-                new_x, new_y = x + dx, y + dy
-                if not self._is_outside_board(new_x, new_y):
-                    if not self.exposed[new_x][new_y]:
-                        self._expose_square(new_x, new_y)
-                        squares.append(Square(new_x, new_y, self.counts[new_x][new_y]))
-                        if self._test_if_count_0(new_x, new_y):
+        while stack:
+            x, y = stack.pop()
+            if x * height + y not in pending:
+                continue
+            column_exposed, column_counts = exposed[x], counts[x]
+            base = x * height
+            top = y
+            while top > 0 and column_counts[top - 1] == 0 and \
+                    (not column_exposed[top - 1] or base + top - 1 in pending):
+                top -= 1
+            bottom = y
+            while bottom < height - 1 and column_counts[bottom + 1] == 0 and \
+                    (not column_exposed[bottom + 1] or base + bottom + 1 in pending):
+                bottom += 1
+            pending.difference_update(range(base + top, base + bottom + 1))
+            rows = range(max(top - 1, 0), min(bottom + 2, height))
+            for new_x in range(max(x - 1, 0), min(x + 2, width)):
+                column_exposed, column_counts = exposed[new_x], counts[new_x]
+                for new_y in rows:
+                    if not column_exposed[new_y]:
+                        column_exposed[new_y] = True
+                        count = column_counts[new_y]
+                        xs.append(new_x)
+                        ys.append(new_y)
+                        values.append(count)
+                        if count == 0 and new_x != x:
+                            pending.add(new_x * height + new_y)
                             stack.append((new_x, new_y))
-        return squares
-
-    def _expose_square(self, x, y):
-        self.exposed[x][y] = True
-        self._num_exposed_squares += 1
-
-    def _test_if_count_0(self, x, y):
-        """Does this square have a count of zero?"""
-        return self.counts[x][y] == 0
 
     def _is_outside_board(self, x, y):
         if x < 0 or x >= self.width:
@@ -278,22 +584,19 @@ class Game:
         return False
 
     def double_check_mine_counts(self) -> bool:
-        """Calculates how many neighboring squares have mines for all squares"""
-
-        for x, y in itertools.product(range(self.width), range(self.height)):
-            count = 0
-            for dx, dy in itertools.product([-1, 0, 1], repeat=2):
-                if dx == 0 and dy == 0:
-                    continue
-                if not self._is_outside_board(x + dx, y + dy):
-                    if self.mines[x+dx][y+dy]:
-                        count +=1
-            if count != self.counts[x][y]:
-                return False
-        return True
+        """Recalculates the neighboring mine counts and compares them to the board"""
+        expected = board.neighbor_counts(self.mines, self.width, self.height, self.board_type)
+        return board.grids_equal(expected, self.counts)
 
 class AI(abc.ABC):
-    """Minesweeper AI Base class"""
+    """Minesweeper AI Base class
+
+    Attributes:
+        rng: Random number generator for the current game. run_game sets it
+            before reset; it is the random module unless the configuration
+            has a seed.
+    """
+    rng = random
 
     @abc.abstractmethod
     def pretty_print(self):
@@ -336,10 +639,12 @@ class AI(abc.ABC):
         return []
 
 class RandomAI(AI):
+    """Picks a uniformly random unexposed square from a candidate pool"""
     def __init__(self):
         self.width = 0
         self.height = 0
         self.exposed_squares = dict()
+        self._candidates = pool.CandidatePool(0)
 
     def pretty_print(self):
         pass
@@ -348,18 +653,19 @@ class RandomAI(AI):
         self.width = config.width
         self.height = config.height
         self.exposed_squares.clear()
+        if self._candidates.size == self.width * self.height:
+            self._candidates.reset()
+        else:
+            self._candidates = pool.CandidatePool(self.width * self.height)
 
     def next(self):
-        while True:
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
-            if (x, y) not in self.exposed_squares:
-                break
-        return x, y
+        return divmod(self._candidates.choice(self.rng), self.height)
 
     def update(self, result):
+        height = self.height
         for position in result.new_squares:
             self.exposed_squares[(position.x, position.y)] = position.num_mines
+            self._candidates.discard(position.x * height + position.y)
 
 
 class Runner:
@@ -381,17 +687,25 @@ class Runner:
         """Advances the game one move"""
         if not self.game.game_over:
             coordinates = self.ai.next()
-            logger.debug("Next is ({:d}, {:d})".format(coordinates[0], coordinates[1]))
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("Next is (%d, %d)", coordinates[0], coordinates[1])
             result = self.game.select(*coordinates)
-            logger.debug("Result: status - {:s}".format(result.status))
-            logger.debug("Result: new_squares", list(result.new_squares)[0])
+            if debug:
+                logger.debug("Result: status - %s, %d new squares", result.status, len(result.new_squares))
+            if instrument.enabled:
+                instrument.emit('move', x=coordinates[0], y=coordinates[1], result=result)
             self.ai.update(result)
             if result.status == GameStatus.PLAYING:
                 self.game.flags = self.ai.flags
             else:
                 logger.info("Game is over")
-                logger.debug("Status: {:s}".format(result.status))
-                logger.debug("Last move: ({:d},{:d})".format(coordinates[0], coordinates[1]))
+                if debug:
+                    logger.debug("Status: %s", result.status)
+                    logger.debug("Last move: (%d,%d)", coordinates[0], coordinates[1])
+                if instrument.enabled:
+                    instrument.emit('game_over', x=coordinates[0], y=coordinates[1],
+                                    status=result.status, num_moves=self.game.num_moves)
                 # wrong_placed_mines = []
                 # for x, y in self.ai.flags:
                 #     if not self.game.mines[x][y]:
@@ -450,33 +764,133 @@ class Runner:
 #         results.append(game.result)
 #     return results
 
-def run_games(config, num_games, ai, threads = 2, viz=None):
+def run_games(config, num_games, ai, threads = 2, viz=None, chunk_size=None, corpus=None):
     """ Run a set of games parallelly to evaluate an AI
 
+    The configuration, the AI and the corpus are pickled once and sent with
+    every chunk of consecutive games. Each worker process unpickles them for
+    its first chunk of the run only, and sends back one
+    (pid, victory, num_moves) tuple per game. With a visualizer the games
+    are played one by one in this process.
+
     Args:
         config (GameConfig): Parameters of the game.
         num_games (int): Number of games.
-        threads (int): Max number of threads to use
+        threads (int): Max number of worker processes to use
         ai (AI): The AI
         viz (GameVisualizer, optional): Visualizer
+        chunk_size (int, optional): Number of games per task. By default
+            the games are split into about 4 chunks per worker.
+        corpus (Corpus, optional): Pre-generated boards. Game pid is played
+            on board pid; each worker maps the corpus file itself.
+
+    Returns:
+        list: List of (pid, GameResult) tuples ordered by pid.
+
+    Raises:
+        ValueError: if the corpus has other boards than config or fewer
+            than num_games.
+    """
+    results = list(iter_games(config, ai, num_games, threads, viz, chunk_size, corpus))
+    results.sort(key=lambda item: item[0])
+    return results
+
+def iter_games(config, ai, num_games, threads = 2, viz=None, chunk_size=None, corpus=None):
+    """ Play games like run_games, yielding each result as its chunk completes
+
+    At most two chunks per worker are queued at a time, so memory does not
+    grow with the number of games. Closing the generator early cancels the
+    chunks that have not started.
+
+    Args:
+        See run_games.
+
+    Yields:
+        tuple: pid and GameResult, in completion order.
+    """
+    if corpus is not None:
+        corpus.check(config)
+        if num_games > len(corpus):
+            raise ValueError('{} games requested from a corpus of {} boards'.format(num_games, len(corpus)))
+    if viz:
+        for pid in range(num_games):
+            yield pid, run_game(config, ai, pid, viz, corpus)
+        return
+
+    if chunk_size is None:
+        chunk_size = max(1, min(100, num_games // (4 * threads)))
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be positive')
+    starts = iter(range(0, num_games, chunk_size))
+    # ProcessPoolExecutor has no initializer before Python 3.7
+    token = uuid.uuid4().hex
+    state = pickle.dumps((config, ai, corpus))
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=threads)
+    pending = {}
+
+    def submit(start):
+        pending[executor.submit(_run_chunk, token, state, start, min(start + chunk_size, num_games))] = start
+
+    try:
+        for start in itertools.islice(starts, 2 * threads):
+            submit(start)
+        while pending:
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                start = pending.pop(future)
+                next_start = next(starts, None)
+                if next_start is not None:
+                    submit(next_start)
+                try:
+                    chunk = future.result()
+                except Exception as exc:
+                    logger.error('Games from %d generated an exception: %s', start, exc)
+                    continue
+                for pid, victory, num_moves in chunk:
+                    yield pid, GameResult(victory, num_moves)
+    finally:
+        # chunks that have not started yet are dropped when the caller stops early
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+# run token, configuration, AI and corpus of a run_games worker process
+_worker_token = None
+_worker_config = None
+_worker_ai = None
+_worker_corpus = None
+
+def _init_worker(token, state):
+    """Unpickle the configuration, the AI and the corpus of a new run"""
+    global _worker_token, _worker_config, _worker_ai, _worker_corpus
+    if token == _worker_token:
+        return
+    _worker_config, _worker_ai, _worker_corpus = pickle.loads(state)
+    _worker_token = token
+    # forked workers would otherwise all continue the parent's random
+    # sequence when the configuration has no seed
+    random.seed()
+
+def _run_chunk(token, state, start, stop):
+    """Play games start to stop-1 with the worker's AI
+
+    Args:
+        token (str): Identifies the run_games call the chunk belongs to.
+        state (bytes): Pickled configuration, AI and corpus of the run.
+        start (int): pid of the first game.
+        stop (int): pid after the last game.
 
     Returns:
-        dict: A Map from pid to GameResult.
+        list: (pid, victory, num_moves) tuples.
     """
+    _init_worker(token, state)
     results = []
-    with concurrent.futures.ProcessPoolExecutor(max_workers=threads) as executor:
-        future_to_pid = {executor.submit(run_game, config, ai, pid): pid for pid in range(num_games)}
-        for future in concurrent.futures.as_completed(future_to_pid):
-            pid = future_to_pid[future]
-            try:
-                result = future.result()
-            except Exception as exc:
-                print('%d generated an exception: %s' % (pid, exc))
-            else:
-                results.append((pid, result))
+    for pid in range(start, stop):
+        result = run_game(_worker_config, _worker_ai, pid, corpus=_worker_corpus)
+        results.append((pid, result.victory, result.num_moves))
     return results
 
-def run_game(config, ai, pid = 0, viz=None):
+def run_game(config, ai, pid = 0, viz=None, corpus=None):
     """ Run one game to evaluate an AI
 
     Args:
@@ -484,13 +898,21 @@ def run_game(config, ai, pid = 0, viz=None):
         ai (AI): The AI
         pid (int): The index of current run.
         viz (GameVisualizer, optional): Visualizer
+        corpus (Corpus, optional): Play board pid of the corpus. Its first
+            move, which the board is safe around, is made for the AI.
 
     Returns:
-        list: List of GameResult objects
+        GameResult: Result of the game
     """
     logger.info("Starting game %d", pid)
+    ai.rng = config.rng(pid, 'ai')
     ai.reset(config)
-    game = Game(config)
+    if corpus is not None:
+        game = corpus.game(pid)
+        # the board is only safe around the square it was generated for
+        ai.update(game.select(*corpus.first_move(pid)))
+    else:
+        game = Game(config, game_id=pid)
     runner = Runner(game, ai)
     if viz:
         viz.run(runner)
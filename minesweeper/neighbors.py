@@ -0,0 +1,91 @@
+"""Precomputed neighbor tables
+
+Squares are addressed by their flat index ``x * height + y``. The table for
+a board size stores the 8-neighborhood of every square in compressed sparse
+row form and is cached so that games of the same size share it.
+"""
+import array
+import functools
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+class NeighborTable:
+    """Neighbors of every square of a board in CSR form
+
+    The neighbors of flat index i are ``indices[indptr[i]:indptr[i + 1]]``.
+
+    Attributes:
+        width (int): Width of the board.
+        height (int): Height of the board.
+        indptr (array.array): int32 row offsets of length width * height + 1.
+        indices (array.array): int32 flat indices of the neighbors.
+    """
+    def __init__(self, width, height, indptr, indices):
+        self.width = width
+        self.height = height
+        self.indptr = indptr
+        self.indices = indices
+
+    def __len__(self):
+        return self.width * self.height
+
+    def neighbors(self, i):
+        """array.array: flat indices of the neighbors of flat index i"""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def neighbors_xy(self, x, y):
+        """Yields the x,y positions of the neighbors of (x, y)"""
+        height = self.height
+        for j in self.neighbors(x * height + y):
+            yield divmod(j, height)
+
+
+@functools.lru_cache(maxsize=32)
+def neighbor_table(width, height):
+    """Get the shared neighbor table for a board size
+
+    Args:
+        width (int): Width of the board.
+        height (int): Height of the board.
+
+    Returns:
+        NeighborTable: Cached table for the size.
+    """
+    if np is not None:
+        indptr, indices = _build_numpy(width, height)
+    else:
+        indptr, indices = _build_python(width, height)
+    return NeighborTable(width, height, indptr, indices)
+
+
+def _build_python(width, height):
+    indptr = array.array('i', [0])
+    indices = array.array('i')
+    for x in range(width):
+        for y in range(height):
+            for dx, dy in OFFSETS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height:
+                    indices.append(nx * height + ny)
+            indptr.append(len(indices))
+    return indptr, indices
+
+
+def _build_numpy(width, height):
+    xs, ys = np.divmod(np.arange(width * height, dtype=np.int32), height)
+    candidates = np.empty((width * height, len(OFFSETS)), dtype=np.int32)
+    valid = np.empty(candidates.shape, dtype=np.bool_)
+    for k, (dx, dy) in enumerate(OFFSETS):
+        nx, ny = xs + dx, ys + dy
+        valid[:, k] = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+        candidates[:, k] = nx * height + ny
+    indptr = np.zeros(width * height + 1, dtype=np.int32)
+    np.cumsum(valid.sum(axis=1), out=indptr[1:])
+    indices = candidates[valid]
+    return array.array('i', indptr.tobytes()), array.array('i', indices.tobytes())
@@ -0,0 +1,66 @@
+"""Pool of the squares a player may still guess
+
+The unknown squares are kept in a dense array of flat indices plus the slot
+of each index in that array. Removing a square moves the last one into its
+slot, so removal, membership and a uniform random pick are all O(1) however
+full the board is.
+"""
+import array
+
+
+class CandidatePool:
+    """Flat indices of the squares that are still candidates for a guess
+
+    Attributes:
+        size (int): Number of squares of the board.
+    """
+    def __init__(self, size):
+        self.size = size
+        self._identity = array.array('i', range(size))
+        self._cells = array.array('i', self._identity)
+        self._slots = array.array('i', self._identity)
+        self._count = size
+
+    def reset(self):
+        """Make every square a candidate again"""
+        self._cells[:] = self._identity
+        self._slots[:] = self._identity
+        self._count = self.size
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, index):
+        return self._slots[index] >= 0
+
+    def __iter__(self):
+        return iter(self._cells[:self._count])
+
+    def add(self, index):
+        """Make the square at flat index a candidate again"""
+        if self._slots[index] >= 0:
+            return
+        self._cells[self._count] = index
+        self._slots[index] = self._count
+        self._count += 1
+
+    def discard(self, index):
+        """Remove the square at flat index if it is a candidate"""
+        slot = self._slots[index]
+        if slot < 0:
+            return
+        self._count -= 1
+        last = self._cells[self._count]
+        self._cells[slot] = last
+        self._slots[last] = slot
+        self._slots[index] = -1
+
+    def choice(self, rng):
+        """A uniformly random candidate
+
+        Raises:
+            IndexError: if the pool is empty.
+        """
+        if not self._count:
+            raise IndexError('No candidates left')
+        return self._cells[rng.randrange(self._count)]
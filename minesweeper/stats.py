@@ -0,0 +1,125 @@
+"""Online statistics of game results
+
+GameStats keeps counters and a fixed width histogram of the move counts, so
+its memory does not depend on the number of games. evaluate plays games with
+iter_games, logs a progress report now and then and can stop as soon as the
+win rate is known precisely enough.
+"""
+import collections
+import logging
+import math
+import timeit
+
+from .minesweeper import iter_games
+
+logger = logging.getLogger(__name__)
+
+
+class GameStats:
+    """Win rate, move counts and throughput of a stream of games
+
+    Attributes:
+        num_games (int): Number of games added.
+        num_wins (int): Number of victories.
+        total_moves (int): Sum of the moves of all games.
+        bin_width (int): Width of the move count histogram bins.
+        histogram (Counter): Number of games by the first move count of their bin.
+        z (float): Normal quantile of the confidence interval, 1.96 for 95%.
+    """
+    def __init__(self, bin_width=10, z=1.96):
+        if bin_width < 1:
+            raise ValueError('bin_width must be positive')
+        self.num_games = 0
+        self.num_wins = 0
+        self.total_moves = 0
+        self.bin_width = bin_width
+        self.histogram = collections.Counter()
+        self.z = z
+        self.start_time = timeit.default_timer()
+
+    def add(self, result):
+        """Count one GameResult"""
+        self.num_games += 1
+        self.num_wins += bool(result.victory)
+        self.total_moves += result.num_moves
+        self.histogram[result.num_moves - result.num_moves % self.bin_width] += 1
+
+    @property
+    def win_rate(self):
+        return self.num_wins / self.num_games if self.num_games else 0.0
+
+    @property
+    def mean_moves(self):
+        return self.total_moves / self.num_games if self.num_games else 0.0
+
+    @property
+    def games_per_second(self):
+        elapsed = timeit.default_timer() - self.start_time
+        return self.num_games / elapsed if elapsed > 0 else 0.0
+
+    def confidence_interval(self):
+        """Wilson score interval of the win rate
+
+        Returns:
+            tuple: Lower and upper bound, (0, 1) before the first game.
+        """
+        n = self.num_games
+        if n == 0:
+            return 0.0, 1.0
+        p, z2 = self.win_rate, self.z * self.z
+        center = (p + z2 / (2 * n)) / (1 + z2 / n)
+        half_width = self.z * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / (1 + z2 / n)
+        return max(0.0, center - half_width), min(1.0, center + half_width)
+
+    def converged(self, precision, min_games=100):
+        """Whether the confidence interval is at most 2 * precision wide"""
+        if self.num_games < min_games:
+            return False
+        lower, upper = self.confidence_interval()
+        return upper - lower <= 2 * precision
+
+    def report(self):
+        """One line summary of the games so far"""
+        lower, upper = self.confidence_interval()
+        return '{:d} games, win rate {:.2%} ({:.2%} - {:.2%}), {:.1f} moves, {:.1f} games/s'.format(
+            self.num_games, self.win_rate, lower, upper, self.mean_moves, self.games_per_second)
+
+    def histogram_lines(self, width=40):
+        """Text bars of the move count histogram"""
+        if not self.histogram:
+            return []
+        most = max(self.histogram.values())
+        return ['{:5d}-{:<5d} {:8d} {:s}'.format(start, start + self.bin_width - 1, count,
+                                                 '#' * max(1, round(width * count / most)))
+                for start, count in sorted(self.histogram.items())]
+
+
+def evaluate(config, ai, max_games, precision=None, min_games=100, report_every=None, **kwargs):
+    """ Play up to max_games games and collect their statistics
+
+    Args:
+        config (GameConfig): Parameters of the game.
+        ai (AI): The AI
+        max_games (int): Number of games to play at most.
+        precision (float, optional): Stop once the confidence interval of
+            the win rate is within +/- precision.
+        min_games (int): Games to play before stopping early.
+        report_every (int, optional): Log a report every this many games.
+        **kwargs: threads and chunk_size, passed to iter_games.
+
+    Returns:
+        GameStats: Statistics of the games played.
+    """
+    stats = GameStats()
+    games = iter_games(config, ai, max_games, **kwargs)
+    try:
+        for _, result in games:
+            stats.add(result)
+            if report_every and stats.num_games % report_every == 0:
+                logger.info('%s', stats.report())
+            if precision is not None and stats.converged(precision, min_games):
+                logger.info('Stopping early: %s', stats.report())
+                break
+    finally:
+        games.close()
+    return stats
@@ -1,6 +1,12 @@
+import itertools
+import random
+
 import pytest
 
-from ais import AlgorithmBeta
+from ais import BasicAI, AlgorithmBeta, AlgorithmGamma, AlgorithmDelta, AlgorithmEpsilon
+from ais.guess_policy import CornerPolicy, ProbabilityPolicy, OpeningPolicy
+from ais.knowledge import Knowledge
+from ais.pattern_cache import PatternCache
 import minesweeper as ms
 
 
@@ -196,4 +202,354 @@ def test_algo_update_flags_case3(algo_case3):
 
     flags, safe_choices = algo.update_flags()
     assert flags == {(0,0), (3,1), (3,2), (2,3), (2,1)}
-    assert safe_choices == {(1,0), (1,1), (1,2), (0,2), (3,0), (4,1), (4,2), (3,3)}
\ No newline at end of file
+    assert safe_choices == {(1,0), (1,1), (1,2), (0,2), (3,0), (4,1), (4,2), (3,3)}
+
+def rescan_update(algo, new_squares):
+    """Original solver: rescan every exposed square until nothing changes"""
+    for square in new_squares:
+        algo.exposed_squares[(square.x, square.y)] = square.num_mines
+        algo.safe_choices.discard((square.x, square.y))
+    changed = True
+    while changed:
+        changed = False
+        for (x, y), num_mines in algo.exposed_squares.items():
+            if num_mines == 0:
+                continue
+            marked_mines, unexposed_squares = algo.check_neighbors(x, y)
+            if not unexposed_squares:
+                continue
+            if marked_mines == num_mines:
+                algo.safe_choices.update(unexposed_squares)
+                changed = True
+            elif marked_mines + len(unexposed_squares) == num_mines:
+                algo.flags.update(unexposed_squares)
+                changed = True
+
+
+@pytest.mark.parametrize('width,height,num_mines', [(8, 8, 10), (16, 16, 40), (30, 16, 99)])
+def test_algo_update_matches_rescanning_solver(width, height, num_mines):
+    rng = random.Random(num_mines)
+    config = ms.GameConfig(width, height, num_mines)
+    for _ in range(20):
+        game = ms.Game(config)
+        algo = AlgorithmBeta(config)
+        reference = AlgorithmBeta(config)
+        while not game.game_over:
+            candidates = [p for p in algo.safe_choices if not game.exposed[p[0]][p[1]]]
+            if candidates:
+                x, y = min(candidates)
+            else:
+                x, y = rng.choice([(x, y) for x in range(width) for y in range(height)
+                                   if not game.exposed[x][y] and (x, y) not in algo.flags])
+            result = game.select(x, y)
+            if result.status == ms.GameStatus.DEFEAT:
+                break
+            algo.update(result.new_squares)
+            rescan_update(reference, result.new_squares)
+            assert reference.flags == algo.flags
+            assert reference.safe_choices == algo.safe_choices
+
+
+def test_gamma_subset_rule_finds_safe_squares():
+    """ 1-1-1 along an edge.
+           0 1 2  (x)
+        0 [. . .]
+        1 [1 1 1]
+       (y)
+    The mine next to (0,1) is also the only one next to (1,1), so (2,0) is
+    safe, and likewise for (2,1) and (0,0). That leaves (1,0) as the mine.
+    """
+    algo = AlgorithmGamma(ms.GameConfig(3, 2, 1))
+    algo.exposed_squares = {(0, 1): 1, (1, 1): 1, (2, 1): 1}
+    flags, safe_choices = algo.update_flags()
+    assert {(1, 0)} == flags
+    assert {(0, 0), (2, 0)} == safe_choices
+    beta = AlgorithmBeta(ms.GameConfig(3, 2, 1))
+    beta.exposed_squares = {(0, 1): 1, (1, 1): 1, (2, 1): 1}
+    assert (set(), set()) == beta.update_flags()
+
+
+def test_gamma_subset_rule_finds_mines():
+    """ 1-2-1 along an edge.
+           0 1 2  (x)
+        0 [. . .]
+        1 [1 2 1]
+       (y)
+    One mine is in (0,0)/(1,0), so the other mine next to (1,1) is (2,0).
+    """
+    algo = AlgorithmGamma(ms.GameConfig(3, 2, 2))
+    algo.exposed_squares = {(0, 1): 1, (1, 1): 2, (2, 1): 1}
+    flags, safe_choices = algo.update_flags()
+    assert {(0, 0), (2, 0)} == flags
+    assert {(1, 0)} == safe_choices
+
+
+@pytest.mark.parametrize('algo_class', [AlgorithmGamma, AlgorithmEpsilon])
+def test_deductions_are_sound(algo_class):
+    if algo_class is AlgorithmEpsilon:
+        pytest.importorskip('numpy')
+    random.seed(7)
+    config = ms.GameConfig(30, 16, 99)
+    for _ in range(30):
+        game = ms.Game(config)
+        algo = algo_class(config)
+        while not game.game_over:
+            candidates = [p for p in algo.safe_choices if not game.exposed[p[0]][p[1]]]
+            x, y = min(candidates) if candidates else random.choice(
+                [(x, y) for x in range(30) for y in range(16)
+                 if not game.exposed[x][y] and (x, y) not in algo.flags])
+            result = game.select(x, y)
+            if result.status == ms.GameStatus.DEFEAT:
+                assert not candidates
+                break
+            algo.update(result.new_squares)
+            assert all(game.mines[x][y] for x, y in algo.flags)
+            assert not any(game.mines[x][y] for x, y in algo.safe_choices)
+
+
+def test_epsilon_solves_edge_patterns():
+    """ The 1-1-1 and 1-2-1 patterns follow from row reduction as well."""
+    pytest.importorskip('numpy')
+    algo = AlgorithmEpsilon(ms.GameConfig(3, 2, 1))
+    algo.exposed_squares = {(0, 1): 1, (1, 1): 1, (2, 1): 1}
+    assert ({(1, 0)}, {(0, 0), (2, 0)}) == algo.update_flags()
+    algo = AlgorithmEpsilon(ms.GameConfig(3, 2, 2))
+    algo.exposed_squares = {(0, 1): 1, (1, 1): 2, (2, 1): 1}
+    assert ({(0, 0), (2, 0)}, {(1, 0)}) == algo.update_flags()
+
+
+def test_epsilon_uses_three_constraints():
+    """ No pair of numbers is a subset of another.
+           0 1 2 3  (x)
+        0 [. . . .]
+        1 [1 2 2 1]
+       (y)
+    (0,0)+(1,0) = 1, (0,0)+(1,0)+(2,0) = 2, (1,0)+(2,0)+(3,0) = 2 and
+    (2,0)+(3,0) = 1 give (2,0) and (1,0) as the mines.
+    """
+    pytest.importorskip('numpy')
+    config = ms.GameConfig(4, 2, 2)
+    exposed = {(0, 1): 1, (1, 1): 2, (2, 1): 2, (3, 1): 1}
+    algo = AlgorithmEpsilon(config)
+    algo.exposed_squares = dict(exposed)
+    assert ({(1, 0), (2, 0)}, {(0, 0), (3, 0)}) == algo.update_flags()
+
+
+def test_epsilon_reduces_only_changed_rows():
+    pytest.importorskip('numpy')
+    config = ms.GameConfig(3, 2, 1)
+    algo = AlgorithmEpsilon(config)
+    algo.update([ms.Square(0, 1, 1), ms.Square(1, 1, 1)])
+    assert {(2, 0), (2, 1)} == algo.safe_choices
+    assert ([], []) == algo._linear_deductions()
+
+
+def brute_force_probabilities(algo, num_mines):
+    unknown = [(x, y) for x in range(algo.width) for y in range(algo.height) if algo._is_unknown((x, y))]
+    remaining = num_mines - len(algo.flags)
+    totals, layouts = {p: 0 for p in unknown}, 0
+    for mines in itertools.combinations(unknown, remaining):
+        mines = set(mines) | algo.flags
+        if all(num == sum(n in mines for n in algo.neighours(x, y)) for (x, y), num in algo.exposed_squares.items()):
+            layouts += 1
+            for p in mines & set(unknown):
+                totals[p] += 1
+    return {p: count / layouts for p, count in totals.items()}
+
+
+def test_delta_probabilities_match_brute_force():
+    random.seed(3)
+    config = ms.GameConfig(5, 4, 4)
+    checked = 0
+    while checked < 10:
+        game = ms.Game(config)
+        algo = AlgorithmDelta(config)
+        result = game.select(random.randrange(5), random.randrange(4))
+        if result.status != ms.GameStatus.PLAYING:
+            continue
+        algo.update(result.new_squares)
+        estimate = algo.probabilities()
+        if not estimate[0]:
+            continue
+        frontier, unconstrained, outside = estimate
+        expected = brute_force_probabilities(algo, 4)
+        for position, probability in frontier.items():
+            assert expected[position] == pytest.approx(probability)
+        for position in outside:
+            assert expected[position] == pytest.approx(unconstrained)
+        checked += 1
+
+
+def test_delta_budget_falls_back_to_sampling():
+    config = ms.GameConfig(30, 16, 99)
+    exact, sampled = AlgorithmDelta(config), AlgorithmDelta(config, max_component=0, num_samples=2000)
+    sampled.rng = random.Random(5)
+    for algo in (exact, sampled):
+        algo.exposed_squares = {(0, 1): 1, (1, 1): 1, (3, 0): 2, (3, 1): 3}
+        algo.update_flags()
+    expected, estimate = exact.probabilities()[0], sampled.probabilities()[0]
+    assert expected.keys() == estimate.keys()
+    for position, probability in expected.items():
+        assert probability == pytest.approx(estimate[position], abs=0.1)
+    # squares off the frontier are less likely to be mines than any on it
+    assert sampled.guess() not in estimate
+
+
+@pytest.mark.parametrize('algo_class', [AlgorithmBeta, AlgorithmDelta])
+def test_seeded_basic_ai_runs_are_reproducible(algo_class):
+    config = ms.GameConfig(16, 16, 40, seed=11)
+    ai = BasicAI(algo_class(config))
+    serial = [(pid, ms.run_game(config, ai, pid)) for pid in range(6)]
+    parallel = ms.run_games(config, 6, ai, threads=2, chunk_size=2)
+    assert [(pid, r.victory, r.num_moves) for pid, r in serial] == \
+        [(pid, r.victory, r.num_moves) for pid, r in parallel]
+
+
+def test_basic_ai_traces_chosen_moves_and_failure():
+    config = ms.GameConfig(16, 16, 40, seed=3)
+    ai = BasicAI(AlgorithmBeta(config), trace_moves={1, 2}, trace_failure=True)
+    pid = next(pid for pid in range(50) if not ms.run_game(config, ai, pid).victory)
+    moves = [move for move, _ in ai.snapshots]
+    assert [1, 2] == moves[:2]
+    last_move, lines = ai.snapshots[-1]
+    assert last_move == ai.num_moves
+    assert 1 == sum(line.count('*') for line in lines[1:])
+    assert 17 == len(lines)
+
+
+def test_basic_ai_renders_nothing_by_default(monkeypatch):
+    config = ms.GameConfig(16, 16, 40, seed=3)
+    ai = BasicAI(AlgorithmBeta(config))
+
+    def fail(*args):
+        raise AssertionError('board rendered')
+
+    monkeypatch.setattr(ai, 'board_lines', fail)
+    for pid in range(5):
+        ms.run_game(config, ai, pid)
+    assert [] == ai.snapshots
+
+
+def test_basic_ai_guesses_only_unknown_squares():
+    config = ms.GameConfig(16, 16, 40, seed=8)
+    ai = BasicAI(AlgorithmBeta(config))
+    for pid in range(20):
+        ai.rng = config.rng(pid, 'ai')
+        ai.reset(config)
+        game = ms.Game(config, game_id=pid)
+        while not game.game_over:
+            knowledge = ai.knowledge
+            unknown = {(x, y) for x in range(16) for y in range(16)
+                       if (x, y) not in ai.exposed_squares and (x, y) not in knowledge.flags
+                       and (x, y) not in knowledge.safe_choices}
+            assert unknown == {divmod(i, 16) for i in knowledge.candidates}
+            ai.update(game.select(*ai.next()))
+
+
+def test_knowledge_keeps_each_square_in_one_state():
+    knowledge = Knowledge(4, 3)
+    knowledge.safe_choices.update([(0, 0), (1, 1)])
+    knowledge.flags.add((2, 2))
+    assert 9 == len(knowledge.candidates)
+    knowledge.exposed_squares[(1, 1)] = 2
+    assert {(0, 0)} == knowledge.safe_choices
+    assert (0, 0) == knowledge.peek_safe()
+    assert [((1, 1), 2)] == list(knowledge.exposed_squares.items())
+    knowledge.flags.discard((2, 2))
+    assert 2 * 3 + 2 in knowledge.candidates
+    assert 0 == len(knowledge.flags)
+    knowledge.reset()
+    assert 12 == len(knowledge.candidates)
+    assert not knowledge.exposed_squares and not knowledge.safe_choices
+    assert knowledge.peek_safe() is None
+
+
+def test_basic_ai_shares_knowledge_with_algorithm():
+    config = ms.GameConfig(16, 16, 40, seed=4)
+    ai = BasicAI(AlgorithmBeta(config))
+    ms.run_game(config, ai, 0)
+    assert ai.exposed_squares is ai.algo.exposed_squares
+    assert ai.safe_choices is ai.algo.safe_choices
+    assert not any(position in ai.exposed_squares for position in ai.safe_choices)
+
+
+
+def test_corner_policy_guesses_corners_first():
+    config = ms.GameConfig(10, 8, 10)
+    ai = BasicAI(AlgorithmBeta(config), guess_policy=CornerPolicy())
+    ai.reset(config)
+    assert ai.next() in {(0, 0), (0, 7), (9, 0), (9, 7)}
+
+
+@pytest.mark.parametrize('policy_class', [ProbabilityPolicy, OpeningPolicy])
+def test_guess_policy_cache_matches_fresh_values(policy_class):
+    config = ms.GameConfig(16, 16, 40, seed=6)
+    policy = policy_class()
+    ai = BasicAI(AlgorithmBeta(config), guess_policy=policy)
+    for pid in range(10):
+        ai.rng = config.rng(pid, 'ai')
+        ai.reset(config)
+        game = ms.Game(config, game_id=pid)
+        while not game.game_over:
+            x, y = ai.next()
+            assert (x, y) not in ai.exposed_squares and (x, y) not in ai.knowledge.flags
+            if not ai.safe_choices:
+                assert all(policy._values[i] == policy.evaluate(i) for i in ai.knowledge.candidates)
+            ai.update(game.select(x, y))
+
+
+def test_guess_policy_within_budget_still_guesses():
+    config = ms.GameConfig(30, 16, 99, seed=6)
+    ai = BasicAI(AlgorithmBeta(config), guess_policy=ProbabilityPolicy(budget=0.0))
+    for pid in range(5):
+        assert ms.run_game(config, ai, pid).num_moves > 0
+
+
+def test_pattern_cache_reuses_rotated_and_reflected_windows():
+    """ 1-2-1 along the top edge, then along the left, right and bottom edges."""
+    cache = PatternCache()
+    boards = [((3, 2), {(0, 1): 1, (1, 1): 2, (2, 1): 1}, (1, 1), {(0, 0), (2, 0)}, {(1, 0)}),
+              ((2, 3), {(1, 0): 1, (1, 1): 2, (1, 2): 1}, (1, 1), {(0, 0), (0, 2)}, {(0, 1)}),
+              ((2, 3), {(0, 0): 1, (0, 1): 2, (0, 2): 1}, (0, 1), {(1, 0), (1, 2)}, {(1, 1)}),
+              ((3, 2), {(0, 0): 1, (1, 0): 2, (2, 0): 1}, (1, 0), {(0, 1), (2, 1)}, {(1, 1)})]
+    for (width, height), exposed, center, mines, safe in boards:
+        knowledge = Knowledge(width, height)
+        knowledge.exposed_squares.update(exposed)
+        assert (sorted(safe), sorted(mines)) == \
+            tuple(sorted(positions) for positions in cache.deduce(knowledge.state, width, height, *center))
+    assert 1 == cache.misses
+    assert 3 == cache.hits
+    algo = AlgorithmBeta(ms.GameConfig(3, 2, 2), pattern_cache=cache)
+    algo.exposed_squares = {(0, 1): 1, (1, 1): 2, (2, 1): 1}
+    assert ({(0, 0), (2, 0)}, {(1, 0)}) == algo.update_flags()
+
+
+def test_pattern_cache_deductions_are_sound():
+    config = ms.GameConfig(16, 16, 40, seed=9)
+    ai = BasicAI(AlgorithmBeta(config, pattern_cache=PatternCache(maxsize=500)))
+    for pid in range(20):
+        ai.rng = config.rng(pid, 'ai')
+        ai.reset(config)
+        game = ms.Game(config, game_id=pid)
+        while not game.game_over:
+            ai.update(game.select(*ai.next()))
+            assert all(game.mines[x][y] for x, y in ai.knowledge.flags)
+            assert not any(game.mines[x][y] for x, y in ai.safe_choices)
+    assert len(ai.algo.pattern_cache) <= 500
+
+
+def test_pattern_cache_save_and_load(tmp_path):
+    config = ms.GameConfig(16, 16, 40, seed=9)
+    cache = PatternCache()
+    ai = BasicAI(AlgorithmBeta(config, pattern_cache=cache))
+    for pid in range(5):
+        ms.run_game(config, ai, pid)
+    path = str(tmp_path / 'patterns.json')
+    cache.save(path)
+    loaded = PatternCache(maxsize=len(cache) // 2)
+    loaded.load(path)
+    assert len(cache) // 2 == len(loaded)
+    assert list(cache._entries.items())[-len(loaded):] == list(loaded._entries.items())
+    (tmp_path / 'other.json').write_text('{"version": 0}')
+    with pytest.raises(ValueError):
+        loaded.load(str(tmp_path / 'other.json'))
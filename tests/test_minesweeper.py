@@ -1,3 +1,8 @@
+import asyncio
+import itertools
+import pickle
+import random
+
 import pytest
 
 import minesweeper as ms
@@ -206,3 +211,584 @@ def test_run_games():
     ai = ms.RandomAI()
     results = ms.run_games(config, 2, ai)
     assert 2 == len(results)
+
+
+def test_run_games_returns_results_in_pid_order():
+    config = ms.GameConfig()
+    results = ms.run_games(config, 7, ms.RandomAI(), threads=2, chunk_size=3)
+    assert list(range(7)) == [pid for pid, _ in results]
+    assert all(isinstance(result, ms.GameResult) and result.num_moves > 0 for _, result in results)
+
+
+def test_seeded_serial_and_parallel_runs_are_identical():
+    config = ms.GameConfig(seed=5)
+    serial = [(pid, result.victory, result.num_moves)
+              for pid, result in ((pid, ms.run_game(config, ms.RandomAI(), pid)) for pid in range(12))]
+    for threads, chunk_size in [(1, 12), (3, 1), (2, 5)]:
+        results = ms.run_games(config, 12, ms.RandomAI(), threads=threads, chunk_size=chunk_size)
+        assert serial == [(pid, result.victory, result.num_moves) for pid, result in results]
+
+
+def test_seeded_games_do_not_depend_on_global_random():
+    config = ms.GameConfig(16, 16, 40, seed='replay')
+    boards = []
+    for global_seed in (1, 2):
+        random.seed(global_seed)
+        game = ms.Game(config, game_id=7)
+        game.select(8, 8)
+        boards.append([list(column) for column in game.mines])
+    assert boards[0] == boards[1]
+    other = ms.Game(config, game_id=8)
+    other.select(8, 8)
+    assert boards[0] != [list(column) for column in other.mines]
+
+
+def test_worker_unpickles_the_ai_once_per_run():
+    config = ms.GameConfig(seed=5)
+    state = pickle.dumps((config, ms.RandomAI(), None))
+    first = ms.minesweeper._run_chunk('run-a', state, 0, 2)
+    ai = ms.minesweeper._worker_ai
+    second = ms.minesweeper._run_chunk('run-a', state, 2, 4)
+    assert ai is ms.minesweeper._worker_ai
+    ms.minesweeper._run_chunk('run-b', state, 0, 1)
+    assert ai is not ms.minesweeper._worker_ai
+    expected = [(pid, ms.run_game(config, ms.RandomAI(), pid)) for pid in range(4)]
+    assert [(pid, result.victory, result.num_moves) for pid, result in expected] == first + second
+
+
+def test_iter_games_yields_every_game():
+    results = list(ms.iter_games(ms.GameConfig(), ms.RandomAI(), 9, threads=2, chunk_size=2))
+    assert list(range(9)) == sorted(pid for pid, _ in results)
+
+
+def test_iter_games_close_stops_early():
+    games = ms.iter_games(ms.GameConfig(), ms.RandomAI(), 10000, threads=1, chunk_size=1)
+    first = [next(games) for _ in range(3)]
+    games.close()
+    assert 3 == len(first)
+
+
+def test_game_stats():
+    stats = ms.GameStats(bin_width=5)
+    assert (0.0, 1.0) == stats.confidence_interval()
+    for victory, num_moves in [(True, 12), (False, 3), (False, 4), (True, 20)]:
+        stats.add(ms.GameResult(victory, num_moves))
+    assert 4 == stats.num_games
+    assert 0.5 == stats.win_rate
+    assert 9.75 == stats.mean_moves
+    assert {0: 2, 10: 1, 20: 1} == stats.histogram
+    lower, upper = stats.confidence_interval()
+    assert lower == pytest.approx(0.15004, abs=1e-4)
+    assert upper == pytest.approx(0.84996, abs=1e-4)
+    assert not stats.converged(0.1, min_games=1)
+    assert stats.converged(0.4, min_games=1)
+    assert 3 == len(stats.histogram_lines())
+
+
+def test_evaluate_stops_early():
+    stats = ms.evaluate(ms.GameConfig(), ms.RandomAI(), 100000, precision=0.5, min_games=10,
+                        threads=1, chunk_size=5)
+    assert 10 == stats.num_games
+
+
+@pytest.mark.parametrize('board_type', ['array', 'numpy', 'bitboard'])
+def test_compact_board_matches_list_board(board_type):
+    if board_type == 'numpy':
+        pytest.importorskip('numpy')
+    mines = flip([
+        [True,  False, False, False, False],
+        [False, False, False, True,  False],
+        [False, False, False, True,  False],
+        [False, False, True,  False, False]
+    ])
+    expected = ms.Game(ms.GameConfig(5, 4, 4), mines)
+    game = ms.Game(ms.GameConfig(5, 4, 4, board_type=board_type), mines)
+    for x in range(5):
+        for y in range(4):
+            assert expected.mines[x][y] == game.mines[x][y]
+            assert expected.counts[x][y] == game.counts[x][y]
+    result = game.select(0, 3)
+    assert expected.select(0, 3).new_squares == result.new_squares
+    assert expected.state == game.state
+
+
+def test_array_board_grid_shares_flat_buffer():
+    grid = ms.board.make_grid('array', 3, 2, signed=True)
+    grid[1][0] = -1
+    grid[2][1] = 3
+    assert [0, 0, -1, 0, 0, 3] == list(grid.flat)
+    assert [[0, 0], [-1, 0], [0, 3]] == grid.tolist()
+
+
+def test_game_config_with_unknown_board_type():
+    with pytest.raises(ValueError):
+        ms.GameConfig(board_type='sparse')
+
+
+def reference_counts(mines, width, height):
+    counts = [[0 for y in range(height)] for x in range(width)]
+    for x, y in itertools.product(range(width), range(height)):
+        if mines[x][y]:
+            counts[x][y] = -1
+            continue
+        for dx, dy in itertools.product([-1, 0, 1], repeat=2):
+            if (dx or dy) and 0 <= x + dx < width and 0 <= y + dy < height:
+                counts[x][y] += mines[x + dx][y + dy]
+    return counts
+
+
+def random_mines(width, height, num_mines, seed):
+    rng = random.Random(seed)
+    locations = set(rng.sample(range(width * height), num_mines))
+    return [[x * height + y in locations for y in range(height)] for x in range(width)]
+
+
+@pytest.mark.parametrize('numpy', [True, False])
+@pytest.mark.parametrize('width,height,num_mines', [
+    (8, 8, 10), (16, 16, 40), (30, 16, 99), (400, 300, 24000)
+])
+def test_neighbor_counts_match_reference(monkeypatch, numpy, width, height, num_mines):
+    if numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(ms.board, 'np', None)
+    for seed in range(3):
+        mines = random_mines(width, height, num_mines, seed)
+        expected = reference_counts(mines, width, height)
+        assert expected == ms.board.neighbor_counts(mines, width, height)
+        game = ms.Game(ms.GameConfig(width, height, num_mines), mines)
+        assert game.double_check_mine_counts()
+
+
+@pytest.mark.parametrize('board_type', ['array', 'numpy'])
+def test_neighbor_counts_for_compact_boards(board_type):
+    if board_type == 'numpy':
+        pytest.importorskip('numpy')
+    mines = random_mines(30, 16, 99, 0)
+    game = ms.Game(ms.GameConfig(30, 16, 99, board_type=board_type), mines)
+    assert ms.board.grids_equal(reference_counts(mines, 30, 16), game.counts)
+    assert game.double_check_mine_counts()
+    game.counts[0][0] = 9
+    assert not game.double_check_mine_counts()
+
+
+@pytest.mark.parametrize('width,height', [(1, 1), (1, 5), (5, 4), (30, 16)])
+def test_neighbor_table_matches_bounds_checks(width, height):
+    table = ms.neighbors.neighbor_table(width, height)
+    for x, y in itertools.product(range(width), range(height)):
+        expected = {(x + dx, y + dy) for dx, dy in itertools.product([-1, 0, 1], repeat=2)
+                    if (dx or dy) and 0 <= x + dx < width and 0 <= y + dy < height}
+        assert expected == set(table.neighbors_xy(x, y))
+        assert len(expected) == len(table.neighbors(x * height + y))
+
+
+def test_neighbor_table_is_shared_between_games():
+    first = ms.Game(ms.GameConfig(16, 16, 40))
+    second = ms.Game(ms.GameConfig(16, 16, 40))
+    assert first._neighbors is second._neighbors
+
+
+@pytest.mark.parametrize('kwargs', [
+    dict(width=0), dict(height=-1), dict(num_mines=-1), dict(num_mines=64),
+    dict(num_mines=56, safe_zone='opening'), dict(safe_zone='corner'),
+])
+def test_game_config_validation(kwargs):
+    with pytest.raises(ValueError):
+        ms.GameConfig(**kwargs)
+
+
+def test_game_config_accepts_full_boards():
+    ms.GameConfig(8, 8, 63)
+    ms.GameConfig(8, 8, 55, safe_zone='opening')
+    ms.GameConfig(2, 1, 0, safe_zone='opening')
+
+
+@pytest.mark.parametrize('board_type', ['list', 'array', 'numpy', 'bitboard'])
+def test_place_mines_at_full_density(board_type):
+    if board_type == 'numpy':
+        pytest.importorskip('numpy')
+    game = ms.Game(ms.GameConfig(30, 16, 479, board_type=board_type))
+    result = game.select(7, 3)
+    assert ms.GameStatus.VICTORY == result.status
+    expected = [[(x, y) != (7, 3) for y in range(16)] for x in range(30)]
+    assert ms.board.grids_equal(expected, game.mines)
+
+
+@pytest.mark.parametrize('x,y', [(0, 0), (4, 9), (29, 15), (12, 0)])
+def test_first_move_with_opening_safe_zone(x, y):
+    for _ in range(20):
+        game = ms.Game(ms.GameConfig(30, 16, 99, safe_zone='opening'))
+        result = game.select(x, y)
+        assert 0 == game.counts[x][y]
+        assert len(result.new_squares) > 1
+        assert 99 == sum(sum(column) for column in game.mines)
+
+
+def reference_reveal(counts, exposed, width, height, x, y):
+    revealed = {(x, y)}
+    stack = [(x, y)] if counts[x][y] == 0 else []
+    while stack:
+        x, y = stack.pop()
+        for dx, dy in itertools.product([-1, 0, 1], repeat=2):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and not exposed[nx][ny] and (nx, ny) not in revealed:
+                revealed.add((nx, ny))
+                if counts[nx][ny] == 0:
+                    stack.append((nx, ny))
+    return revealed
+
+
+@pytest.mark.parametrize('index_openings', [False, True])
+@pytest.mark.parametrize('board_type', ['list', 'array', 'numpy', 'bitboard'])
+@pytest.mark.parametrize('width,height,num_mines', [(30, 16, 99), (60, 40, 100), (90, 70, 30)])
+def test_flood_fill_matches_reference(board_type, index_openings, width, height, num_mines):
+    if board_type == 'numpy':
+        pytest.importorskip('numpy')
+    rng = random.Random(width)
+    for seed in range(5):
+        mines = random_mines(width, height, num_mines, seed)
+        config = ms.GameConfig(width, height, num_mines, board_type=board_type, index_openings=index_openings)
+        game = ms.Game(config, mines)
+        counts = reference_counts(mines, width, height)
+        exposed = [[False] * height for _ in range(width)]
+        safe = [(x, y) for x in range(width) for y in range(height) if not mines[x][y]]
+        rng.shuffle(safe)
+        for x, y in safe:
+            if game.game_over:
+                break
+            if exposed[x][y]:
+                continue
+            expected = reference_reveal(counts, exposed, width, height, x, y)
+            result = game.select(x, y)
+            xs, ys, values = result.revealed
+            assert (x, y, counts[x][y]) == (xs[0], ys[0], values[0])
+            assert expected == set(zip(xs, ys))
+            assert len(expected) == len(xs)
+            assert {ms.Square(x, y, counts[x][y]) for x, y in expected} == result.new_squares
+            for x, y in expected:
+                exposed[x][y] = True
+        assert ms.GameStatus.VICTORY == game.status
+
+
+@pytest.mark.parametrize('safe_zone', ['square', 'opening'])
+@pytest.mark.parametrize('width,height,num_mines', [(8, 8, 10), (30, 16, 99), (1, 9, 3)])
+def test_bitboard_game_plays_like_list_game(safe_zone, width, height, num_mines):
+    for game_id in range(10):
+        expected = ms.Game(ms.GameConfig(width, height, num_mines, safe_zone=safe_zone, seed=5), game_id=game_id)
+        game = ms.Game(ms.GameConfig(width, height, num_mines, board_type='bitboard', safe_zone=safe_zone,
+                                     seed=5), game_id=game_id)
+        assert isinstance(game, ms.bitboard.BitboardGame)
+        rng = random.Random(game_id)
+        while not expected.game_over:
+            x, y = rng.choice([(x, y) for x in range(width) for y in range(height) if not expected.exposed[x][y]])
+            assert game.exposed[x][y] is False
+            first, second = expected.select(x, y), game.select(x, y)
+            assert first.status == second.status
+            assert first.new_squares == second.new_squares
+        assert expected.state == game.state
+        assert expected.mines == game.mines.tolist()
+        assert expected.counts == game.counts
+        assert expected.counts[width - 1][height - 1] == game.counts[width - 1][height - 1]
+        assert game.double_check_mine_counts()
+
+
+def test_index_openings_labels_each_zero_region():
+    mines = flip([
+        [False, False, False, True, False, False],
+        [False, False, False, True, False, False],
+        [True,  True,  True,  True, False, False],
+        [False, False, False, False, False, False],
+    ])
+    game = ms.Game(ms.GameConfig(6, 4, 6, index_openings=True), mines)
+    assert 2 == len(game._openings)
+    assert {0, 1, 4, 5, 8, 9} == set(game._openings[game._opening_index[0]])
+    assert -1 == game._opening_index[4 * 4]
+    assert 8 == len(game._openings[game._opening_index[5 * 4]])
+    result = game.select(5, 0)
+    assert 8 == len(result.new_squares)
+
+
+def test_state_view_is_updated_in_place(game4):
+    view = game4.state_view
+    assert ms.UNEXPOSED == view[0, 0]
+    game4.select(0, 0)
+    assert 0 == view[0, 0]
+    assert 3 == view[1, 1]
+    assert ms.UNEXPOSED == view[2, 2]
+    with pytest.raises(TypeError):
+        view[2, 2] = 1
+
+
+def test_snapshot_is_a_copy(game4):
+    game4.select(0, 0)
+    snapshot = game4.snapshot()
+    game4.select(2, 1)
+    assert ms.UNEXPOSED == snapshot[2, 1]
+    assert 2 == game4.state_view[2, 1]
+    assert [[0, 1, ms.UNEXPOSED], [1, 3, ms.UNEXPOSED], [ms.UNEXPOSED] * 3] == snapshot.tolist()
+
+
+def test_square_columns_behaves_like_a_set(game2):
+    result = game2.select(0, 2)
+    assert isinstance(result, ms.ColumnarMoveResult)
+    squares = result.new_squares
+    expected = {ms.Square(0, 2, 0), ms.Square(0, 1, 1), ms.Square(1, 1, 2), ms.Square(1, 2, 1)}
+    assert expected == squares
+    assert 4 == len(squares)
+    assert ms.Square(1, 1, 2) in squares
+    assert ms.Square(1, 1, 3) not in squares
+    assert (1, 1) not in squares
+    assert {ms.Square(0, 2, 0)} == squares - {ms.Square(0, 1, 1), ms.Square(1, 1, 2), ms.Square(1, 2, 1)}
+
+
+@pytest.mark.parametrize('obj', [
+    ms.Square(0, 0, 0), ms.GameConfig(), ms.GameResult(True, 1), ms.MoveResult(ms.GameStatus.PLAYING)
+])
+def test_value_objects_use_slots(obj):
+    assert not hasattr(obj, '__dict__')
+
+
+def test_instrument_hooks_receive_events(game2):
+    events = []
+
+    def hook(event, **fields):
+        events.append((event, fields))
+
+    ms.instrument.add_hook(hook)
+    try:
+        assert ms.instrument.enabled
+        game2.select(0, 2)
+    finally:
+        ms.instrument.remove_hook(hook)
+    assert not ms.instrument.enabled
+    assert [('select', 0, 2, 4, ms.GameStatus.PLAYING)] == [
+        (event, fields['x'], fields['y'], len(fields['revealed'].xs), fields['status']) for event, fields in events]
+
+
+def test_instrument_log_hook(game3, caplog):
+    hook = ms.instrument.LogHook()
+    ms.instrument.add_hook(hook)
+    try:
+        with caplog.at_level('DEBUG', logger='minesweeper.instrument'):
+            runner = ms.minesweeper.Runner(game3, ms.RandomAI())
+            runner.ai.reset(ms.GameConfig(3, 3, 1))
+            while not game3.game_over:
+                next(runner)
+    finally:
+        ms.instrument.remove_hook(hook)
+    assert 'Game over after' in caplog.text
+
+
+def test_corpus_round_trip(tmp_path):
+    path = str(tmp_path / 'boards.bin')
+    config = ms.GameConfig(30, 16, 99, safe_zone='opening', seed=4)
+    ms.write_corpus(path, config, 6)
+    assert 32 + 6 * (4 + 60) == (tmp_path / 'boards.bin').stat().st_size
+    with ms.Corpus(path) as corpus:
+        assert 6 == len(corpus)
+        assert (30, 16, 99, 'opening') == (corpus.config.width, corpus.config.height,
+                                           corpus.config.num_mines, corpus.config.safe_zone)
+        for index in range(6):
+            x, y = corpus.first_move(index)
+            expected = ms.Game(config, game_id=index)
+            expected.select(x, y)
+            game = corpus.game(index)
+            assert [list(column) for column in expected.mines] == [list(column) for column in game.mines]
+            assert expected.counts == game.counts
+            assert ms.GameStatus.PLAYING == game.select(x, y).status
+        with pytest.raises(IndexError):
+            corpus.first_move(6)
+
+
+def test_corpus_without_numpy(tmp_path, monkeypatch):
+    path = str(tmp_path / 'boards.bin')
+    config = ms.GameConfig(7, 5, 9, seed=1)
+    ms.write_corpus(path, config, 3)
+    with ms.Corpus(path) as corpus:
+        expected = [[list(column) for column in corpus.mines(index)] for index in range(3)]
+    monkeypatch.setattr(ms.corpus, 'np', None)
+    fallback = str(tmp_path / 'fallback.bin')
+    ms.write_corpus(fallback, config, 3)
+    assert (tmp_path / 'boards.bin').read_bytes() == (tmp_path / 'fallback.bin').read_bytes()
+    with ms.Corpus(fallback) as corpus:
+        assert expected == [corpus.mines(index) for index in range(3)]
+
+
+def test_corpus_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a corpus' * 4)
+    with pytest.raises(ValueError):
+        ms.Corpus(str(path))
+
+
+def test_run_games_on_corpus(tmp_path):
+    path = str(tmp_path / 'boards.bin')
+    config = ms.GameConfig(seed=9)
+    ms.write_corpus(path, config, 8)
+    with ms.Corpus(path) as corpus:
+        serial = [(pid, ms.run_game(config, ms.RandomAI(), pid, corpus=corpus)) for pid in range(8)]
+        parallel = ms.run_games(config, 8, ms.RandomAI(), threads=2, chunk_size=3, corpus=corpus)
+        assert [(pid, r.victory, r.num_moves) for pid, r in serial] == \
+            [(pid, r.victory, r.num_moves) for pid, r in parallel]
+        assert all(result.num_moves >= 1 for _, result in parallel)
+        with pytest.raises(ValueError):
+            ms.run_games(config, 9, ms.RandomAI(), corpus=corpus)
+        with pytest.raises(ValueError):
+            ms.run_games(ms.GameConfig(9, 9, 10), 2, ms.RandomAI(), corpus=corpus)
+
+
+@pytest.mark.parametrize('safe_zone', ['square', 'opening'])
+def test_batch_game_matches_game(safe_zone):
+    np = pytest.importorskip('numpy')
+    config = ms.GameConfig(8, 8, 3, safe_zone=safe_zone, seed=3)
+    num_games = 40
+    batch = ms.BatchGame(config, num_games)
+    games = [ms.Game(config, game_id=i) for i in range(num_games)]
+    rng = random.Random(1)
+    while not batch.game_over:
+        moves = [rng.choice([(x, y) for x in range(8) for y in range(8) if not game.exposed[x][y]])
+                 if not game.game_over else (0, 0) for game in games]
+        batch.select(np.array([x for x, _ in moves]), np.array([y for _, y in moves]))
+        for i, (game, (x, y)) in enumerate(zip(games, moves)):
+            if not game.game_over:
+                game.select(x, y)
+                if game.status != ms.GameStatus.DEFEAT:
+                    assert game.exposed == batch.exposed[i].tolist()
+            assert game.status.value == batch.status[i]
+    expected = [(game.result.victory, game.result.num_moves) for game in games]
+    assert expected == [(result.victory, result.num_moves) for result in batch.results()]
+    assert any(victory for victory, _ in expected)
+
+
+def test_batch_game_rejects_bad_moves():
+    np = pytest.importorskip('numpy')
+    mines = np.zeros((2, 4, 4), dtype=bool)
+    mines[:, 3, 0] = True
+    batch = ms.BatchGame(ms.GameConfig(4, 4, 1), 2, mines=mines)
+    with pytest.raises(ValueError):
+        batch.select(np.array([0, 4]), np.array([0, 0]))
+    with pytest.raises(ValueError):
+        batch.select(np.array([0]), np.array([0]))
+    result = batch.select(np.array([0, 3]), np.array([0, 0]))
+    assert [ms.GameStatus.VICTORY.value, ms.GameStatus.DEFEAT.value] == result.status.tolist()
+    assert (result.revealed[0] == ~mines[0]).all()
+    assert not result.revealed[1].any()
+
+
+def test_run_batch():
+    pytest.importorskip('numpy')
+    results = ms.run_batch(ms.GameConfig(seed=2), ms.RandomBatchAI(), 50)
+    assert 50 == len(results)
+    assert all(result.num_moves >= 1 for result in results)
+
+
+@pytest.mark.parametrize('safe_zone', ['square', 'opening'])
+def test_batch_game_unseeded_placement(safe_zone):
+    np = pytest.importorskip('numpy')
+    config = ms.GameConfig(5, 4, 10, safe_zone=safe_zone)
+    batch = ms.BatchGame(config, 300)
+    xs, ys = np.full(300, 2), np.arange(300) % 4
+    batch.select(xs, ys)
+    assert (batch.mines.sum(axis=(1, 2)) == 10).all()
+    for i in range(300):
+        zone = ms.Game(config)._safe_zone(2, i % 4)
+        assert not batch.mines[i].reshape(-1)[zone].any()
+        assert batch.counts[i].tolist() == [list(c) for c in
+                                            ms.Game(config, batch.mines[i].tolist()).counts]
+
+
+class AsyncRandomAI(ms.AsyncAI):
+    """RandomAI behind an awaited delay, recording how many games run at once"""
+    active = 0
+    most_active = 0
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.ai = ms.RandomAI()
+
+    async def reset(self, config):
+        self.ai.rng = self.rng
+        self.ai.reset(config)
+
+    async def next(self):
+        AsyncRandomAI.active += 1
+        AsyncRandomAI.most_active = max(AsyncRandomAI.most_active, AsyncRandomAI.active)
+        await asyncio.sleep(self.delay)
+        AsyncRandomAI.active -= 1
+        return self.ai.next()
+
+    async def update(self, result):
+        self.ai.update(result)
+
+
+def run_async(coroutine):
+    # asyncio.run needs Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_run_games_async_matches_run_game():
+    config = ms.GameConfig(seed=6)
+    AsyncRandomAI.most_active = 0
+    results = run_async(ms.run_games_async(config, 30, lambda: AsyncRandomAI(0.001), concurrency=8))
+    expected = [(pid, ms.run_game(config, ms.RandomAI(), pid)) for pid in range(30)]
+    assert [(pid, r.victory, r.num_moves) for pid, r in expected] == \
+        [(pid, r.victory, r.num_moves) for pid, r in results]
+    assert 8 == AsyncRandomAI.most_active
+
+
+def test_async_runner_times_out():
+    config = ms.GameConfig()
+    game = ms.Game(config)
+    ai = AsyncRandomAI(delay=10)
+
+    async def play():
+        await ai.reset(config)
+        runner = ms.AsyncRunner(game, ai, move_timeout=0.01)
+        async for _ in runner:
+            pass
+        return runner
+
+    runner = run_async(play())
+    assert runner.timed_out
+    assert ms.GameStatus.QUIT == game.status
+    assert not game.result.victory
+
+
+def test_candidate_pool_matches_set():
+    from minesweeper.pool import CandidatePool
+    rng = random.Random(5)
+    candidates = CandidatePool(60)
+    expected = set(range(60))
+    for index in rng.sample(range(60), 45) + [3, 3, 59]:
+        candidates.discard(index)
+        expected.discard(index)
+        assert len(expected) == len(candidates)
+        assert expected == set(candidates)
+        assert all((i in candidates) == (i in expected) for i in range(60))
+    assert all(candidates.choice(rng) in expected for _ in range(100))
+    for index in [3, 7, 3]:
+        candidates.add(index)
+        expected.add(index)
+        assert expected == set(candidates)
+    candidates.reset()
+    assert set(range(60)) == set(candidates)
+    empty = CandidatePool(0)
+    with pytest.raises(IndexError):
+        empty.choice(rng)
+
+
+def test_random_ai_never_picks_exposed_squares():
+    config = ms.GameConfig(10, 10, 5, seed=1)
+    ai = ms.RandomAI()
+    for pid in range(20):
+        ai.rng = config.rng(pid, 'ai')
+        ai.reset(config)
+        game = ms.Game(config, game_id=pid)
+        while not game.game_over:
+            x, y = ai.next()
+            assert not game.exposed[x][y]
+            ai.update(game.select(x, y))